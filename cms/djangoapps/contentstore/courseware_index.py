@@ -1,6 +1,8 @@
 """ Code to allow module store to interface with courseware index """
 from __future__ import absolute_import
 
+import hashlib
+import json
 import logging
 import re
 from abc import ABCMeta, abstractmethod
@@ -14,6 +16,7 @@ from search.search_engine_base import SearchEngine
 from six import add_metaclass
 
 from contentstore.course_group_config import GroupConfiguration
+from contentstore.models import IndexedDocumentDigest
 from course_modes.models import CourseMode
 from eventtracking import tracker
 from openedx.core.lib.courses import course_image_url
@@ -132,6 +135,12 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        The digests of the indexed documents are stored, so that only the
+        documents which changed since the course or library was last indexed
+        are sent to the index, and the documents of the items which were
+        removed since then are removed from it.  A full reindex sends all the
+        documents, and removes any other document of the course or library.
+
         Returns:
         Number of items that have been added to the index
         """
@@ -159,6 +168,15 @@ class SearchIndexerBase(object):
         # instead of per item index API call.
         items_index = []
 
+        # digests maps the ids of the items' index dictionaries to their
+        # digests; previous_digests holds those of the last indexing.
+        full_reindex = triggered_at is None
+        previous_digests = {}
+        digests = {}
+        # undigested_items holds the ids of the items which would have been
+        # skipped, but whose digests weren't stored yet.
+        undigested_items = set()
+
         def get_item_location(item):
             """
             Gets the version agnostic item location
@@ -227,7 +245,15 @@ class SearchIndexerBase(object):
                 if None in children_groups_usage:
                     item_content_groups = None
 
-            if skip_index or not item_index_dictionary:
+            if skip_index and item_index_dictionary:
+                if item_id in previous_digests:
+                    # The item wasn't changed, so neither was its index dictionary
+                    digests[item_id] = previous_digests[item_id]
+                    return
+                # The item was indexed before digests were stored, so it is
+                # indexed again to store its digest.
+                undigested_items.add(item_id)
+            elif skip_index or not item_index_dictionary:
                 return
 
             item_index = {}
@@ -240,8 +266,10 @@ class SearchIndexerBase(object):
                     item_index['start_date'] = item.start
                 item_index['content_groups'] = item_content_groups if item_content_groups else None
                 item_index.update(cls.supplemental_fields(item))
-                items_index.append(item_index)
-                indexed_count["count"] += 1
+                digests[item_id] = cls._index_digest(item_index)
+                if full_reindex or previous_digests.get(item_id) != digests[item_id]:
+                    items_index.append(item_index)
+                    indexed_count["count"] += 1
                 return item_content_groups
             except Exception as err:  # pylint: disable=broad-except
                 # broad exception so that index operation does not fail on one item of many
@@ -249,6 +277,7 @@ class SearchIndexerBase(object):
                 error_list.append(_('Could not index item: {}').format(item.location))
 
         try:
+            previous_digests.update(IndexedDocumentDigest.get_digests(structure_key))
             with modulestore.branch_setting(ModuleStoreEnum.RevisionOption.published_only):
                 structure = cls._fetch_top_level(modulestore, structure_key)
                 groups_usage_info = cls.fetch_group_usage(modulestore, structure)
@@ -259,8 +288,17 @@ class SearchIndexerBase(object):
                 # Now index the content
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                if items_index:
+                    searcher.index(cls.DOCUMENT_TYPE, items_index)
+                if full_reindex or not previous_digests or undigested_items:
+                    # The stored digests don't cover all the indexed items, so
+                    # the removed items are searched for in the index.
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                else:
+                    deleted_items = [item_id for item_id in previous_digests if item_id not in indexed_items]
+                    if deleted_items:
+                        searcher.remove(cls.DOCUMENT_TYPE, deleted_items)
+                IndexedDocumentDigest.update_digests(structure_key, previous_digests, digests)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -275,6 +313,13 @@ class SearchIndexerBase(object):
 
         return indexed_count["count"]
 
+    @classmethod
+    def _index_digest(cls, item_index):
+        """
+        Returns the digest of the given index dictionary.
+        """
+        return hashlib.sha1(json.dumps(item_index, sort_keys=True, default=unicode)).hexdigest()
+
     @classmethod
     def _do_reindex(cls, modulestore, structure_key):
         """
@@ -3,6 +3,7 @@ Models for contentstore
 """
 
 from config_models.models import ConfigurationModel
+from django.db import IntegrityError, models, transaction
 from django.db.models.fields import TextField
 
 
@@ -21,3 +22,67 @@ class VideoUploadConfig(ConfigurationModel):
 
 class PushNotificationConfig(ConfigurationModel):
     """Configuration for mobile push notifications."""
+
+
+class IndexedDocumentDigest(models.Model):
+    """
+    Digest of a document sent to the courseware or library search index, so
+    that the documents of unchanged blocks aren't sent again when their
+    course or library is reindexed.
+    """
+    # Number of documents whose digests are deleted or created in one query.
+    BATCH_SIZE = 500
+
+    structure_key = models.CharField(max_length=255, db_index=True)
+    document_id = models.CharField(max_length=255)
+    digest = models.CharField(max_length=40)
+
+    class Meta(object):
+        app_label = 'contentstore'
+        unique_together = (('structure_key', 'document_id'),)
+
+    @classmethod
+    def get_digests(cls, structure_key):
+        """
+        Returns a dict mapping the ids of the indexed documents of the given
+        course or library to their digests.
+        """
+        return dict(
+            cls.objects.filter(structure_key=unicode(structure_key)).values_list('document_id', 'digest')
+        )
+
+    @classmethod
+    def update_digests(cls, structure_key, previous_digests, digests):
+        """
+        Replaces the given previous digests of the documents of the given
+        course or library with the given digests, writing only those that
+        changed.
+        """
+        structure_key = unicode(structure_key)
+        outdated_ids = [
+            document_id for document_id, digest in previous_digests.iteritems()
+            if digests.get(document_id) != digest
+        ]
+        new_digests = [
+            cls(structure_key=structure_key, document_id=document_id, digest=digest)
+            for document_id, digest in digests.iteritems()
+            if previous_digests.get(document_id) != digest
+        ]
+        with transaction.atomic():
+            for index in xrange(0, len(outdated_ids), cls.BATCH_SIZE):
+                cls.objects.filter(
+                    structure_key=structure_key,
+                    document_id__in=outdated_ids[index:index + cls.BATCH_SIZE],
+                ).delete()
+            try:
+                with transaction.atomic():
+                    cls.objects.bulk_create(new_digests, batch_size=cls.BATCH_SIZE)
+            except IntegrityError:
+                # The course or library was indexed concurrently, and some of
+                # its digests were stored first; they're replaced one by one.
+                for new_digest in new_digests:
+                    cls.objects.update_or_create(
+                        structure_key=structure_key,
+                        document_id=new_digest.document_id,
+                        defaults={'digest': new_digest.digest},
+                    )
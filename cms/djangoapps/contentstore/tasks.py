@@ -9,7 +9,7 @@ import os
 import shutil
 import tarfile
 from datetime import datetime
-from tempfile import NamedTemporaryFile, mkdtemp
+from tempfile import NamedTemporaryFile
 
 from celery.task import task
 from celery.utils.log import get_task_logger
@@ -45,12 +45,16 @@ from xmodule.exceptions import SerializationError
 from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundError
+from xmodule.modulestore.tar_export_fs import TarExportFS
 from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
 from xmodule.modulestore.xml_importer import import_course_from_xml, import_library_from_xml
 
 LOGGER = get_task_logger(__name__)
 FILE_READ_CHUNK = 1024  # bytes
 FULL_COURSE_REINDEX_THRESHOLD = 1
+# Name of the artifact of an import task's status recording how many of the
+# course's static files have been imported.
+STATIC_CONTENT_PROGRESS_ARTIFACT = u'Static Content Progress'
 
 
 def clone_instance(instance, field_values):
@@ -272,20 +276,21 @@ def create_export_tarball(course_module, course_key, context, status=None):
     """
     name = course_module.url_name
     export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-    root_dir = path(mkdtemp())
 
     try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
-        else:
-            export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
-
-        if status:
-            status.set_state(u'Compressing')
-            status.increment_completed_steps()
         LOGGER.debug(u'tar file being generated at %s', export_file.name)
+        # Stream the exported files straight into the tarball, rather than
+        # exporting the whole course to disk before compressing it.
         with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+            root_fs = TarExportFS(tar_file)
+            if isinstance(course_key, LibraryLocator):
+                export_library_to_xml(modulestore(), contentstore(), course_key, None, name, root_fs=root_fs)
+            else:
+                export_course_to_xml(modulestore(), contentstore(), course_module.id, None, name, root_fs=root_fs)
+
+            if status:
+                status.set_state(u'Compressing')
+                status.increment_completed_steps()
 
     except SerializationError as exc:
         LOGGER.exception(u'There was an error exporting %s', course_key)
@@ -318,9 +323,6 @@ def create_export_tarball(course_module, course_key, context, status=None):
         if status:
             status.fail(json.dumps({'raw_error_msg': context['raw_err_msg']}))
         raise
-    finally:
-        if os.path.exists(root_dir / name):
-            shutil.rmtree(root_dir / name)
 
     return export_file
 
@@ -499,6 +501,20 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
         self.status.set_state(u'Updating')
         self.status.increment_completed_steps()
 
+        def report_static_content_progress(imported, total):
+            """
+            Record the progress of the static content import in an artifact of
+            the task status.  The task state is left as is, since it's checked
+            once the import is done.
+            """
+            LOGGER.info(
+                u'Course import %s: Imported %d of %d static files', courselike_key, imported, total
+            )
+            UserTaskArtifact.objects.update_or_create(
+                status=self.status, name=STATIC_CONTENT_PROGRESS_ARTIFACT,
+                defaults={u'text': json.dumps({u'imported': imported, u'total': total})}
+            )
+
         with dog_stats_api.timer(
             u'courselike_import.time',
             tags=[u"courselike:{}".format(courselike_key)]
@@ -508,7 +524,8 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
                 settings.GITHUB_REPO_ROOT, [dirpath],
                 load_error_modules=False,
                 static_content_store=contentstore(),
-                target_id=courselike_key
+                target_id=courselike_key,
+                progress_callback=report_static_content_progress
             )
 
         new_location = courselike_items[0].location
@@ -11,6 +11,7 @@ import ddt
 import pytest
 from dateutil.tz import tzutc
 from django.conf import settings
+from django.test import TestCase
 from lazy.lazy import lazy
 from mock import patch
 from pytz import UTC
@@ -22,6 +23,7 @@ from contentstore.courseware_index import (
     LibrarySearchIndexer,
     SearchIndexingError
 )
+from contentstore.models import IndexedDocumentDigest
 from contentstore.signals.handlers import listen_for_course_publish, listen_for_library_update
 from contentstore.tests.utils import CourseTestCase
 from contentstore.utils import reverse_course_url, reverse_usage_url
@@ -433,14 +435,85 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         self.publish_item(store, vertical2.location)
         # index based on time, will include an index of the origin sequential
         # because it is in a common subtree but not of the original vertical
-        # because the original sequential's subtree is too old
+        # because the original sequential's subtree is too old; only the new
+        # items are sent though, since the chapter and the original sequential
+        # didn't change
         new_indexed_count = self.index_recent_changes(store, before_time)
-        self.assertEqual(new_indexed_count, 5)
+        self.assertEqual(new_indexed_count, 3)
 
         # full index again
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_digest_based_index(self, store):
+        """ Make sure that incremental indexing only sends changed documents, and removes deleted ones """
+        self.publish_item(store, self.vertical.location)
+        indexed_count = self.reindex_course(store)
+        self.assertEqual(indexed_count, 4)
+
+        # nothing changed, so nothing is sent again
+        indexed_count = self.index_recent_changes(store, datetime.now(UTC))
+        self.assertEqual(indexed_count, 0)
+        response = self.search()
+        self.assertEqual(response["total"], 4)
+
+        # changing the html unit only sends its document again
+        before_time = datetime.now(UTC)
+        self.html_unit.display_name = "Updated Html Content"
+        self.update_item(store, self.html_unit)
+        self.publish_item(store, self.vertical.location)
+        indexed_count = self.index_recent_changes(store, before_time)
+        self.assertEqual(indexed_count, 1)
+
+        # the documents of deleted items are removed without a new document being sent
+        before_time = datetime.now(UTC)
+        self.delete_item(store, self.html_unit.location)
+        self.publish_item(store, self.vertical.location)
+        indexed_count = self.index_recent_changes(store, before_time)
+        self.assertEqual(indexed_count, 0)
+        response = self.search()
+        self.assertEqual(response["total"], 3)
+
+        # but a full reindex sends every document
+        indexed_count = self.reindex_course(store)
+        self.assertEqual(indexed_count, 3)
+
+    def _test_index_without_stored_digests(self, store):
+        """ Make sure that incremental indexing removes deleted items which were indexed without digests """
+        self.publish_item(store, self.vertical.location)
+        sequential2 = ItemFactory.create(
+            parent_location=self.chapter.location,
+            category='sequential',
+            display_name='Section 2',
+            modulestore=store,
+            publish_item=True,
+            start=datetime(2015, 3, 1, tzinfo=UTC),
+        )
+        vertical2 = ItemFactory.create(
+            parent_location=sequential2.location,
+            category='vertical',
+            display_name='Subsection 2',
+            modulestore=store,
+            publish_item=True,
+        )
+        indexed_count = self.reindex_course(store)
+        self.assertEqual(indexed_count, 6)
+
+        # only the chapter's digest is stored, as if the others were indexed before digests were
+        IndexedDocumentDigest.objects.exclude(document_id__endswith=self.chapter.location.block_id).delete()
+
+        before_time = datetime.now(UTC)
+        self.delete_item(store, vertical2.location)
+        self.publish_item(store, sequential2.location)
+        self.index_recent_changes(store, before_time)
+        response = self.search()
+        self.assertEqual(response["total"], 5)
+
+        # the digests of the skipped items are stored again
+        self.assertTrue(
+            IndexedDocumentDigest.objects.filter(document_id__endswith=self.vertical.location.block_id).exists()
+        )
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -572,6 +645,14 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_time_based_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_time_based_index)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_digest_based_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_digest_based_index)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_index_without_stored_digests(self, store_type):
+        self._perform_test_using_store(store_type, self._test_index_without_stored_digests)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
@@ -1453,3 +1534,17 @@ class GroupConfigurationSearchSplit(GroupConfigurationSearchMongo):
     Tests indexing of content groups on course modules using split modulestore.
     """
     MODULESTORE = TEST_DATA_SPLIT_MODULESTORE
+
+
+class TestIndexedDocumentDigest(TestCase):
+    """
+    Tests for the IndexedDocumentDigest model.
+    """
+    def test_concurrent_update(self):
+        IndexedDocumentDigest.update_digests('course', {}, {'block': 'digest1'})
+        # Another indexing which read the digests before they were stored
+        IndexedDocumentDigest.update_digests('course', {}, {'block': 'digest2', 'other_block': 'digest3'})
+        # The digests of the documents it sent are stored.
+        self.assertEqual(
+            IndexedDocumentDigest.get_digests('course'), {'block': 'digest2', 'other_block': 'digest3'}
+        )
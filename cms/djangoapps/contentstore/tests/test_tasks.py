@@ -5,6 +5,7 @@ from __future__ import absolute_import, division, print_function
 
 import copy
 import json
+import tarfile
 from uuid import uuid4
 
 import mock
@@ -16,7 +17,7 @@ from organizations.models import OrganizationCourse
 from organizations.tests.factories import OrganizationFactory
 from user_tasks.models import UserTaskArtifact, UserTaskStatus
 
-from contentstore.tasks import export_olx, rerun_course
+from contentstore.tasks import create_export_tarball, export_olx, rerun_course
 from contentstore.tests.test_libraries import LibraryTestCase
 from contentstore.tests.utils import CourseTestCase
 from course_action_state.models import CourseRerunState
@@ -62,6 +63,19 @@ class ExportCourseTestCase(CourseTestCase):
         result = export_olx.delay(self.user.id, key, u'en')
         self._assert_failed(result, json.dumps({u'raw_error_msg': u'Boom!'}))
 
+    def test_tarball_contents(self):
+        """
+        Verify that the course is exported straight into the tarball
+        """
+        tarball = create_export_tarball(self.course, self.course.id, {})
+        with tarfile.open(tarball.name) as tar_file:
+            names = tar_file.getnames()
+            course_xml = tar_file.extractfile(u'{}/course.xml'.format(self.course.url_name)).read()
+        self.assertIn(self.course.url_name, names)
+        self.assertIn(u'{}/policies/assets.json'.format(self.course.url_name), names)
+        self.assertIn(u'{}/assets/assets.xml'.format(self.course.url_name), names)
+        self.assertIn(u'url_name="{}"'.format(self.course.url_name), course_xml)
+
     def test_invalid_user_id(self):
         """
         Verify that attempts to export a course as an invalid user fail
@@ -27,7 +27,14 @@ from user_tasks.conf import settings as user_tasks_settings
 from user_tasks.models import UserTaskArtifact, UserTaskStatus
 
 from contentstore.storage import course_import_export_storage
-from contentstore.tasks import CourseExportTask, CourseImportTask, create_export_tarball, export_olx, import_olx
+from contentstore.tasks import (
+    STATIC_CONTENT_PROGRESS_ARTIFACT,
+    CourseExportTask,
+    CourseImportTask,
+    create_export_tarball,
+    export_olx,
+    import_olx
+)
 from contentstore.utils import reverse_course_url, reverse_library_url
 from edxmako.shortcuts import render_to_response
 from student.auth import has_course_author_access
@@ -241,6 +248,9 @@ def import_status_handler(request, course_key_string, filename=None):
         3 : Updating
         4 : Import successful
 
+    While the import is updating the course, the number of its static files
+    which have been imported and their total number are also returned, as
+    "StaticContent".
     """
     course_key = CourseKey.from_string(course_key_string)
     if not has_course_author_access(request.user, course_key):
@@ -267,7 +277,12 @@ def import_status_handler(request, course_key_string, filename=None):
     else:
         status = min(task_status.completed_steps + 1, 3)
 
-    return JsonResponse({"ImportStatus": status})
+    response = {"ImportStatus": status}
+    if status == 3:
+        progress = UserTaskArtifact.objects.filter(status=task_status, name=STATIC_CONTENT_PROGRESS_ARTIFACT).first()
+        if progress is not None:
+            response["StaticContent"] = json.loads(progress.text)
+    return JsonResponse(response)
 
 
 def send_tarball(tarball):
@@ -17,7 +17,9 @@ from django.test.utils import override_settings
 from milestones.tests.utils import MilestonesTestCaseMixin
 from opaque_keys.edx.locator import LibraryLocator
 from path import Path as path
+from user_tasks.models import UserTaskArtifact, UserTaskStatus
 
+from contentstore.tasks import STATIC_CONTENT_PROGRESS_ARTIFACT, CourseImportTask
 from contentstore.tests.test_libraries import LibraryTestCase
 from contentstore.tests.utils import CourseTestCase
 from contentstore.utils import reverse_course_url
@@ -59,6 +61,9 @@ class ImportEntranceExamTestCase(CourseTestCase, MilestonesTestCaseMixin):
         embedded_exam_dir = os.path.join(entrance_exam_dir, "grandparent", "parent")
         os.makedirs(os.path.join(embedded_exam_dir, "course"))
         os.makedirs(os.path.join(embedded_exam_dir, "chapter"))
+        os.makedirs(os.path.join(embedded_exam_dir, "static"))
+        with open(os.path.join(embedded_exam_dir, "static", "handout.txt"), "w+") as f:
+            f.write('Entrance exam handout')
         with open(os.path.join(embedded_exam_dir, "course.xml"), "w+") as f:
             f.write('<course url_name="2013_Spring" org="EDx" course="0.00x"/>')
 
@@ -93,6 +98,31 @@ class ImportEntranceExamTestCase(CourseTestCase, MilestonesTestCaseMixin):
         self.assertEquals(course.entrance_exam_enabled, True)
         self.assertEquals(course.entrance_exam_minimum_score_pct, 0.7)
 
+    def test_import_entrance_exam_with_static_files(self):
+        """
+        Check that the entrance exam of a course with static files is set up
+        once the course is imported.
+        """
+        with open(self.entrance_exam_tar) as gtar:
+            args = {"name": self.entrance_exam_tar, "course-data": [gtar]}
+            resp = self.client.post(self.url, args)
+        self.assertEquals(resp.status_code, 200)
+
+        self.assertIsNotNone(contentstore().find(
+            self.course.id.make_asset_key('asset', 'handout.txt'), throw_on_not_found=False
+        ))
+        course = self.store.get_course(self.course.id)
+        entrance_exam_chapter = self.store.get_items(
+            course.id, qualifiers={'category': 'chapter'}, settings={'is_entrance_exam': True}
+        )[0]
+        self.assertEqual(course.entrance_exam_id, unicode(entrance_exam_chapter.location))
+        content_milestones = milestones_helpers.get_course_content_milestones(
+            unicode(course.id),
+            course.entrance_exam_id,
+            milestones_helpers.get_milestone_relationship_types()['FULFILLS']
+        )
+        self.assertTrue(len(content_milestones))
+
     def test_import_delete_pre_exiting_entrance_exam(self):
         """
         Check that pre existed entrance exam content should be overwrite with the imported course.
@@ -204,6 +234,28 @@ class ImportTestCase(CourseTestCase):
 
         self.assertEquals(resp.status_code, 200)
 
+    def test_import_status_static_content_progress(self):
+        """
+        Check that the progress of the static content import is returned
+        along with the status while the course is being updated.
+        """
+        filename = os.path.split(self.good_tar)[1]
+        args = {u'course_key_string': unicode(self.course.id), u'archive_name': filename}
+        status = UserTaskStatus.objects.create(
+            user=self.user, task_id=str(uuid4()), task_class='contentstore.tasks.import_olx',
+            name=CourseImportTask.generate_name(args), total_steps=3, completed_steps=2, state=u'Updating'
+        )
+        UserTaskArtifact.objects.create(
+            status=status, name=STATIC_CONTENT_PROGRESS_ARTIFACT, text=json.dumps({'imported': 50, 'total': 120})
+        )
+        resp_status = self.client.get(
+            reverse_course_url('import_status_handler', self.course.id, kwargs={'filename': filename})
+        )
+        self.assertEqual(
+            json.loads(resp_status.content),
+            {'ImportStatus': 3, 'StaticContent': {'imported': 50, 'total': 120}}
+        )
+
     def test_import_in_existing_course(self):
         """
         Check that course is imported successfully in existing course and users have their access roles
@@ -144,6 +144,15 @@ ALLOWED_HOSTS = [
 LOG_DIR = ENV_TOKENS['LOG_DIR']
 
 CACHES = ENV_TOKENS['CACHES']
+COURSE_STRUCTURE_PROCESS_CACHE_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_PROCESS_CACHE_SIZE', COURSE_STRUCTURE_PROCESS_CACHE_SIZE
+)
+COURSE_OVERVIEW_CACHE_SETTINGS.update(ENV_TOKENS.get('COURSE_OVERVIEW_CACHE_SETTINGS', {}))
+CAPA_PROBLEM_TEMPLATE_CACHE_SETTINGS.update(ENV_TOKENS.get('CAPA_PROBLEM_TEMPLATE_CACHE_SETTINGS', {}))
+CONTENTSERVER_MEMORY_CACHE_SIZE = ENV_TOKENS.get('CONTENTSERVER_MEMORY_CACHE_SIZE', CONTENTSERVER_MEMORY_CACHE_SIZE)
+CONTENTSERVER_MEMORY_CACHE_TTL = ENV_TOKENS.get('CONTENTSERVER_MEMORY_CACHE_TTL', CONTENTSERVER_MEMORY_CACHE_TTL)
+CONTENTSERVER_SPOOL_DIR = ENV_TOKENS.get('CONTENTSERVER_SPOOL_DIR', CONTENTSERVER_SPOOL_DIR)
+CONTENTSERVER_SPOOL_MAX_SIZE = ENV_TOKENS.get('CONTENTSERVER_SPOOL_MAX_SIZE', CONTENTSERVER_SPOOL_MAX_SIZE)
 # Cache used for location mapping -- called many times with the same key/value
 # in a given request.
 if 'loc_cache' not in CACHES:
@@ -517,6 +517,44 @@ MODULESTORE = {
     }
 }
 
+# Maximum total size, in bytes, of the pickled split modulestore course
+# structures kept in each process's in-process cache, in front of the
+# 'course_structure_cache' django cache.  0 disables the in-process cache.
+COURSE_STRUCTURE_PROCESS_CACHE_SIZE = 64 * 1024 * 1024
+
+# Caching of CourseOverviews in front of the database: the number of
+# overviews kept in each process's in-process cache and for how many seconds,
+# for how many seconds they're kept in the default django cache, and for how
+# many seconds the regeneration of an outdated overview is considered to be
+# in progress.  A size or timeout of 0 disables the corresponding cache.
+COURSE_OVERVIEW_CACHE_SETTINGS = dict(
+    PROCESS_CACHE_SIZE=1000,
+    PROCESS_CACHE_TIMEOUT=60,
+    CACHE_TIMEOUT=60 * 60,
+    REGENERATION_LOCK_TIMEOUT=5 * 60,
+)
+
+# The number of parsed capa problems, with the results of their scripts, kept
+# in memory to be shared by the learners who get the same variant of a
+# problem, and for how many seconds.  A size of 0 disables the cache.
+CAPA_PROBLEM_TEMPLATE_CACHE_SETTINGS = dict(
+    SIZE=1000,
+    TIMEOUT=60,
+)
+
+############################ Contentserver ####################################
+
+# Maximum total size, in bytes, of the small unlocked course assets kept in
+# each process's memory, and the number of seconds they may be served from
+# there before being fetched again.  A size of 0 disables the in-memory cache.
+CONTENTSERVER_MEMORY_CACHE_SIZE = 32 * 1024 * 1024
+CONTENTSERVER_MEMORY_CACHE_TTL = 60
+
+# Directory to which course assets too large for the cache are spooled, and
+# the maximum total size, in bytes, of the spooled assets.  None disables spooling.
+CONTENTSERVER_SPOOL_DIR = None
+CONTENTSERVER_SPOOL_MAX_SIZE = 1024 * 1024 * 1024
+
 # Modulestore-level field override providers. These field override providers don't
 # require student context.
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ()
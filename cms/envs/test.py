@@ -186,6 +186,18 @@ CACHES = {
     },
 }
 
+# Don't keep course structures in memory across tests
+COURSE_STRUCTURE_PROCESS_CACHE_SIZE = 0
+
+# Don't keep course overviews in memory across tests
+COURSE_OVERVIEW_CACHE_SETTINGS['PROCESS_CACHE_SIZE'] = 0
+
+# Don't share capa problems across tests
+CAPA_PROBLEM_TEMPLATE_CACHE_SETTINGS['SIZE'] = 0
+
+# Don't keep course assets in memory across tests
+CONTENTSERVER_MEMORY_CACHE_SIZE = 0
+
 # hide ratelimit warnings while running tests
 filterwarnings('ignore', message='No request passed to the backend, unable to rate-limit')
 
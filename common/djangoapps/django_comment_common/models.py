@@ -10,6 +10,7 @@ from django.dispatch import receiver
 from django.utils.translation import ugettext_noop
 
 from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, NoneToEmptyManager
+from request_cache import clear_cache, get_cache
 from student.models import CourseEnrollment
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
@@ -151,6 +152,9 @@ def all_permissions_for_user_in_course(user, course_id):  # pylint: disable=inva
 class ForumsConfig(ConfigurationModel):
     """Config for the connection to the cs_comments_service forums backend."""
 
+    # Name of the request cache which holds the current config for the rest of the request.
+    REQUEST_CACHE_NAME = 'django_comment_common.forums_config'
+
     connection_timeout = models.FloatField(
         default=5.0,
         help_text="Seconds to wait when trying to connect to the comment service.",
@@ -161,6 +165,20 @@ class ForumsConfig(ConfigurationModel):
         """The API key used to authenticate to the comments service."""
         return getattr(settings, "COMMENTS_SERVICE_KEY", None)
 
+    @classmethod
+    def current_for_request(cls):
+        """
+        Returns the current config, which is only loaded once per request.
+        """
+        request_cache = get_cache(cls.REQUEST_CACHE_NAME)
+        if 'current' not in request_cache:
+            request_cache['current'] = cls.current()
+        return request_cache['current']
+
+    def save(self, *args, **kwargs):
+        super(ForumsConfig, self).save(*args, **kwargs)
+        clear_cache(self.REQUEST_CACHE_NAME)
+
     def __unicode__(self):
         """Simple representation so the admin screen looks less ugly."""
         return u"ForumsConfig: timeout={}".format(self.connection_timeout)
@@ -58,7 +58,8 @@ from certificates.api import get_certificate_url, has_html_certificates_enabled
 from certificates.models import (  # pylint: disable=import-error
     CertificateStatuses,
     GeneratedCertificate,
-    certificate_status_for_student
+    certificate_status_for_student,
+    certificate_statuses_for_student
 )
 from course_modes.models import CourseMode
 from courseware.access import has_access
@@ -222,7 +223,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course_overview, course_mode):
+def cert_info(user, course_overview, course_mode, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -231,6 +232,8 @@ def cert_info(user, course_overview, course_mode):
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        cert_status (dict): The user's certificate status in the course, as returned
+            by certificate_status_for_student, if it was already retrieved.
 
     Returns:
         dict: Empty dict if certificates are disabled or hidden, or a dictionary with keys:
@@ -245,13 +248,10 @@ def cert_info(user, course_overview, course_mode):
     """
     if not course_overview.may_certify():
         return {}
-    # Note: this should be rewritten to use the certificates API
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id),
-        course_mode
-    )
+    if cert_status is None:
+        # Note: this should be rewritten to use the certificates API
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    return _cert_info(user, course_overview, cert_status, course_mode)
 
 
 def reverification_info(statuses):
@@ -728,6 +728,9 @@ def dashboard(request):
         staff_access = True
         errored_courses = modulestore().get_errored_courses()
 
+    # Access is still checked course by course.  The user's roles are loaded
+    # once, by the RoleCache, and the other checks, other than prerequisites,
+    # only read the course overview.
     show_courseware_links_for = frozenset(
         enrollment.course_id for enrollment in course_enrollments
         if has_access(request.user, 'load', enrollment.course_overview)
@@ -765,17 +768,19 @@ def dashboard(request):
     # If a course is not included in this dictionary,
     # there is no verification messaging to display.
     verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
+
+    # Retrieve the certificates for all of the enrollments in a single query
+    certificate_statuses = certificate_statuses_for_student(user, enrolled_course_ids)
     cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
+        enrollment.course_id: cert_info(
+            request.user, enrollment.course_overview, enrollment.mode,
+            cert_status=certificate_statuses[enrollment.course_id]
+        )
         for enrollment in course_enrollments
     }
 
     # only show email settings for Mongo course and when bulk email is turned on
-    show_email_settings_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments if (
-            BulkEmailFlag.feature_enabled(enrollment.course_id)
-        )
-    )
+    show_email_settings_for = BulkEmailFlag.courses_with_feature_enabled(enrolled_course_ids)
 
     # Verification Attempts
     # Used to generate the "you must reverify for course x" banner
@@ -786,21 +791,30 @@ def dashboard(request):
     statuses = ["approved", "denied", "pending", "must_reverify"]
     reverifications = reverification_info(statuses)
 
+    # Retrieve the registration codes redeemed for all of the enrollments in a single query
+    redeemed_registration_codes_by_course = defaultdict(list)
+    redeemed_registration_codes = CourseRegistrationCode.objects.filter(
+        course_id__in=enrolled_course_ids,
+        registrationcoderedemption__redeemed_by=request.user
+    ).select_related('invoice_item__invoice')
+    for redeemed_registration_code in redeemed_registration_codes:
+        redeemed_registration_codes_by_course[redeemed_registration_code.course_id].append(redeemed_registration_code)
+
     block_courses = frozenset(
         enrollment.course_id for enrollment in course_enrollments
         if is_course_blocked(
             request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
+            redeemed_registration_codes_by_course[enrollment.course_id],
             enrollment.course_id
         )
     )
 
     enrolled_courses_either_paid = frozenset(
         enrollment.course_id for enrollment in course_enrollments
-        if enrollment.is_paid_course()
+        if enrollment.is_paid_course(modes_dict={
+            slug: mode for slug, mode in course_modes_by_course[enrollment.course_id].iteritems()
+            if slug not in CourseMode.CREDIT_MODES
+        })
     )
 
     # If there are *any* denied reverifications that have not been toggled off,
@@ -810,7 +824,9 @@ def dashboard(request):
     # Populate the Order History for the side-bar.
     order_history_list = order_history(user, course_org_filter=course_org_filter, org_filter_out_set=org_filter_out_set)
 
-    # get list of courses having pre-requisites yet to be completed
+    # get list of courses having pre-requisites yet to be completed.  The
+    # milestones app can't fetch the fulfillment of many courses at once, so
+    # only the courses having pre-requisites are looked up, one at a time.
     courses_having_prerequisites = frozenset(
         enrollment.course_id for enrollment in course_enrollments
         if enrollment.course_overview.pre_requisite_courses
@@ -0,0 +1,175 @@
+"""
+Event tracker backend that sends events to another backend asynchronously.
+
+Events are put on a bounded in-process queue, from which a background
+thread sends them in batches to the wrapped backend's `send_batch`. This
+keeps the latency of the wrapped backend out of the request that emits
+the event. Example configuration::
+
+  TRACKING_BACKENDS = {
+      'logger': {
+          'ENGINE': 'track.backends.asynchronous.AsyncBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.logger.LoggerBackend',
+                  'OPTIONS': {
+                      'name': 'tracking',
+                  },
+              },
+              'max_queue_size': 10000,
+              'flush_size': 100,
+              'flush_interval': 1.0,
+          }
+      }
+  }
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import threading
+import time
+from Queue import Empty, Full, Queue
+
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+
+class AsyncBackend(BaseBackend):
+    """Event tracker backend that sends events in batches from a background thread"""
+
+    def __init__(self, backend, max_queue_size=10000, flush_size=100, flush_interval=1.0, **kwargs):
+        """
+        Configure the wrapped backend and the queue of events.
+
+        :Parameters:
+
+          - `backend`: the configuration of the wrapped backend, as a dict
+            with its 'ENGINE' and 'OPTIONS', like those of TRACKING_BACKENDS.
+          - `max_queue_size`: the number of events which may be waiting to
+            be sent. Events sent while the queue is full are dropped.
+          - `flush_size`: the maximum number of events sent in a batch.
+          - `flush_interval`: the maximum number of seconds to wait for a
+            batch to fill up before sending it.
+
+        """
+        super(AsyncBackend, self).__init__(**kwargs)
+
+        # Imported here since the tracker instantiates this backend when
+        # it is first imported.
+        from track.tracker import _instantiate_backend_from_name
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+
+        self.max_queue_size = max_queue_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        self.dropped_count = 0
+        self.failed_count = 0
+
+        self.queue = None
+        self._pid = None
+        self._worker = None
+        self._stopping = False
+        self._lock = threading.Lock()
+        # Guards the counts, which are incremented from every thread that
+        # sends events and from the background thread.
+        self._count_lock = threading.Lock()
+
+        atexit.register(self.shutdown)
+
+    def send(self, event):
+        """Queue the event to be sent by the background thread"""
+        self._ensure_worker()
+        try:
+            self.queue.put_nowait(event)
+        except Full:
+            with self._count_lock:
+                self.dropped_count += 1
+            dog_stats_api.increment('track.send.async.dropped')
+
+    def send_batch(self, events):
+        for event in events:
+            self.send(event)
+
+    def flush(self):
+        """Send all the queued events from the calling thread"""
+        if self.queue is None:
+            return
+
+        while True:
+            events = self._get_batch(block=False)
+            if not events:
+                break
+            self._send_batch(events)
+
+    def shutdown(self):
+        """Stop the background thread, and send all the remaining events"""
+        self._stopping = True
+        if self._worker is not None and self._pid == os.getpid():
+            self._worker.join(self.flush_interval + 1)
+        self.flush()
+
+    def _ensure_worker(self):
+        """
+        Start the background thread, and its queue, in the current process.
+
+        Web server workers are often forked from a process which has already
+        loaded the backends, and threads don't survive the fork.
+        """
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self.queue = Queue(maxsize=self.max_queue_size)
+                self._worker = threading.Thread(target=self._run, name='track-async-backend')
+                self._worker.daemon = True
+                self._worker.start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        """Send the queued events, batch by batch, until shut down"""
+        while not self._stopping:
+            events = self._get_batch(block=True)
+            if events:
+                self._send_batch(events)
+
+    def _get_batch(self, block):
+        """
+        Return up to `flush_size` queued events. When `block` is True, wait
+        up to `flush_interval` seconds for them to be queued.
+        """
+        events = []
+        deadline = time.time() + self.flush_interval
+        while len(events) < self.flush_size:
+            try:
+                if block:
+                    timeout = deadline - time.time()
+                    if timeout <= 0:
+                        break
+                    events.append(self.queue.get(timeout=timeout))
+                else:
+                    events.append(self.queue.get_nowait())
+            except Empty:
+                break
+        return events
+
+    def _send_batch(self, events):
+        """Send the events to the wrapped backend"""
+        dog_stats_api.histogram('track.send.async.batch_size', len(events))
+        try:
+            with dog_stats_api.timer('track.send.async.batch'):
+                self.backend.send_batch(events)
+        except Exception:  # pylint: disable=broad-except
+            with self._count_lock:
+                self.failed_count += len(events)
+            dog_stats_api.increment('track.send.async.failed', len(events))
+            log.exception('Error sending a batch of %d events to the %s tracking backend',
+                          len(events), self.backend.__class__.__name__)
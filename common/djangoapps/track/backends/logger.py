@@ -48,3 +48,16 @@ class LoggerBackend(BaseBackend):
         event_str = event_str[:settings.TRACK_MAX_EVENT]
 
         self.event_logger.info(event_str)
+
+    def send_batch(self, events):
+        """
+        Log the events one by one, since each line of the log is expected to
+        hold a single event.  An event which can't be serialized is skipped,
+        rather than losing the events after it.
+        """
+        for event in events:
+            try:
+                self.send(event)
+            except UnicodeDecodeError:
+                # Already logged by send.
+                pass
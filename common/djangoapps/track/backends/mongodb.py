@@ -96,3 +96,14 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_batch(self, events):
+        """Insert all the events in to the Mongo collection at once"""
+        try:
+            # Unlike `insert_many`, `insert` can leave the events unchanged
+            # rather than adding their `_id`, which matters since the same
+            # events are also given to the other backends.
+            self.collection.insert(events, manipulate=False)
+        except (PyMongoError, BSONError):
+            msg = 'Error inserting to MongoDB event tracker backend'
+            log.exception(msg)
@@ -0,0 +1,81 @@
+"""Tests for the asynchronous event tracker backend."""
+from __future__ import absolute_import
+
+import time
+
+from django.test import TestCase
+from mock import patch
+
+from track.backends import BaseBackend
+from track.backends.asynchronous import AsyncBackend
+
+
+class InMemoryBackend(BaseBackend):
+    """Event tracker backend that keeps the batches of events it is sent"""
+    fail = False
+
+    def __init__(self, **kwargs):
+        super(InMemoryBackend, self).__init__(**kwargs)
+        self.batches = []
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        if self.fail:
+            raise Exception('Cannot send events')
+        self.batches.append(events)
+
+
+class TestAsyncBackend(TestCase):
+    def create_backend(self, **options):
+        """Return an AsyncBackend wrapping an InMemoryBackend, shut down at the end of the test"""
+        backend = AsyncBackend(
+            backend={'ENGINE': 'track.backends.tests.test_asynchronous.InMemoryBackend'},
+            **options
+        )
+        self.addCleanup(backend.shutdown)
+        return backend
+
+    def test_events_sent_by_worker(self):
+        backend = self.create_backend(flush_interval=0.01)
+        events = [{'test': i} for i in range(3)]
+        for event in events:
+            backend.send(event)
+
+        for __ in range(500):
+            if sum(len(batch) for batch in backend.backend.batches) == len(events):
+                break
+            time.sleep(0.01)
+
+        self.assertEqual([event for batch in backend.backend.batches for event in batch], events)
+
+    @patch.object(AsyncBackend, '_run')
+    def test_flush_in_batches(self, _mock_run):
+        backend = self.create_backend(flush_size=2)
+        events = [{'test': i} for i in range(5)]
+        backend.send_batch(events)
+        self.assertEqual(backend.backend.batches, [])
+
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [events[0:2], events[2:4], events[4:5]])
+
+    @patch.object(AsyncBackend, '_run')
+    def test_full_queue_drops_events(self, _mock_run):
+        backend = self.create_backend(max_queue_size=2)
+        events = [{'test': i} for i in range(3)]
+        backend.send_batch(events)
+        self.assertEqual(backend.dropped_count, 1)
+
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [events[0:2]])
+
+    @patch.object(AsyncBackend, '_run')
+    def test_failed_batch(self, _mock_run):
+        backend = self.create_backend()
+        backend.backend.fail = True
+        backend.send_batch([{'test': 1}, {'test': 2}])
+
+        backend.flush()
+        self.assertEqual(backend.failed_count, 2)
+        self.assertEqual(backend.backend.batches, [])
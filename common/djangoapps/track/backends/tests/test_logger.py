@@ -49,6 +49,14 @@ class TestLoggerBackend(TestCase):
         self.assertEqual(saved_events[0], unpacked_event)
         self.assertEqual(saved_events[1], unpacked_event)
 
+    def test_send_batch_skips_unserializable_events(self):
+        self.handler.reset()
+
+        self.backend.send_batch([{'test': 1}, {'test': '\xff'}, {'test': 3}])
+
+        saved_events = [json.loads(e) for e in self.handler.messages['info']]
+        self.assertEqual(saved_events, [{'test': 1}, {'test': 3}])
+
 
 class MockLoggingHandler(logging.Handler):
     """
@@ -345,6 +345,29 @@ def get_course_content_milestones(course_id, content_id, relationship, user_id=N
     if user_id is None:
         return milestones_api.get_course_content_milestones(course_id, content_id, relationship)
 
+    return [
+        m for m in _get_user_course_content_milestones(course_id, relationship, user_id)
+        if m['content_id'] == unicode(content_id)
+    ]
+
+
+def get_pending_course_content_ids(course_id, relationship, user_id):
+    """
+    Client API operation adapter/wrapper
+    Returns the ids of the course content the user has unfulfilled
+    milestones of the given relationship for
+    """
+    if not settings.FEATURES.get('MILESTONES_APP'):
+        return set()
+
+    return {m['content_id'] for m in _get_user_course_content_milestones(course_id, relationship, user_id)}
+
+
+def _get_user_course_content_milestones(course_id, relationship, user_id):
+    """
+    Returns the course content milestones the user has yet to fulfill,
+    using the request cache to store all of a user's milestones
+    """
     request_cache_dict = request_cache.get_cache(REQUEST_CACHE_NAME)
     if user_id not in request_cache_dict:
         request_cache_dict[user_id] = {}
@@ -356,7 +379,7 @@ def get_course_content_milestones(course_id, content_id, relationship, user_id=N
             user={"id": user_id}
         )
 
-    return [m for m in request_cache_dict[user_id][relationship] if m['content_id'] == unicode(content_id)]
+    return request_cache_dict[user_id][relationship]
 
 
 def remove_course_content_user_milestones(course_key, content_key, user, relationship):
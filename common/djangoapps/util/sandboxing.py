@@ -1,6 +1,11 @@
 import re
+import threading
 
+from capa.safe_exec.cache import SafeExecCache
 from django.conf import settings
+from django.core.cache import caches
+
+from openedx.core.lib.cache_utils import ProcessLRUCache
 
 # We'll make assets named this be importable by Python code in the sandbox.
 PYTHON_LIB_ZIP = "python_lib.zip"
@@ -39,3 +44,37 @@ def get_python_lib_zip(contentstore, course_id):
         return zip_lib.data
     else:
         return None
+
+
+_PROCESS_CACHE = None
+_PROCESS_CACHE_LOCK = threading.Lock()
+
+
+def _get_safe_exec_process_cache(cache_settings):
+    """
+    Returns the in-process cache of safe_exec results, shared by all
+    courses, or None if it's disabled.
+    """
+    global _PROCESS_CACHE  # pylint: disable=global-statement
+    size = cache_settings.get('PROCESS_CACHE_SIZE', 0)
+    if size <= 0:
+        return None
+    with _PROCESS_CACHE_LOCK:
+        if _PROCESS_CACHE is None:
+            _PROCESS_CACHE = ProcessLRUCache(max_size=size, timeout=cache_settings.get('TIMEOUT'))
+    return _PROCESS_CACHE
+
+
+def get_safe_exec_cache(course_id):
+    """
+    Return the cache of the results of the python scripts of the course's
+    capa problems, configured by the SAFE_EXEC_CACHE_SETTINGS.
+    """
+    cache_settings = getattr(settings, 'SAFE_EXEC_CACHE_SETTINGS', {})
+    return SafeExecCache(
+        shared_cache=caches[cache_settings.get('CACHE_NAME', 'default')],
+        process_cache=_get_safe_exec_process_cache(cache_settings),
+        timeout=cache_settings.get('TIMEOUT'),
+        max_result_size=cache_settings.get('MAX_RESULT_SIZE'),
+        metric_tags=[u'course_id:{}'.format(course_id)],
+    )
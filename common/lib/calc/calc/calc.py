@@ -7,6 +7,8 @@ Uses pyparsing to parse. Main function as of now is evaluator().
 import math
 import numbers
 import operator
+import threading
+from collections import OrderedDict
 
 import numpy
 import scipy.constants
@@ -87,6 +89,18 @@ SUFFIXES = {
 }
 
 
+# The functions which may be applied to all the samples of a variable at once,
+# when evaluating an expression over many samples in `evaluate_samples`.
+# `fact` and `arccot` only accept single numbers.
+VECTORIZED_FUNCTIONS = frozenset(
+    func for func in DEFAULT_FUNCTIONS.itervalues()
+    if func not in (math.factorial, functions.arccot)
+)
+
+# Number of compiled expressions kept by `compile_expression`.
+COMPILED_EXPRESSION_CACHE_SIZE = 1024
+
+
 class UndefinedVariable(Exception):
     """
     Indicate when a student inputs a variable which was not expected.
@@ -214,6 +228,74 @@ def eval_product(parse_result):
     return prod
 
 
+# The following evaluation actions replace those above which only accept
+# numbers, when evaluating samples as numpy arrays.
+
+def _operands(parse_result):
+    """
+    Return the numbers or arrays in the list, ignoring the operators.
+    """
+    return [k for k in parse_result if not isinstance(k, basestring)]
+
+
+def eval_array_atom(parse_result):
+    """
+    Return the value or array wrapped by the atom.
+    """
+    return _operands(parse_result)[0]
+
+
+def eval_array_power(parse_result):
+    """
+    Exponentiate the numbers or arrays, right to left.
+    """
+    return reduce(lambda a, b: b ** a, reversed(_operands(parse_result)))
+
+
+def eval_array_parallel(parse_result):
+    """
+    Compute the parallel resistors operator over numbers or arrays.
+
+    A zero among the inputs raises a `FloatingPointError`, so that the
+    samples get evaluated one by one instead.
+    """
+    if len(parse_result) == 1:
+        return parse_result[0]
+    return 1. / sum(1. / e for e in _operands(parse_result))
+
+
+def eval_array_sum(parse_result):
+    """
+    Add the numbers or arrays, keeping in mind their sign.
+    """
+    total = 0.0
+    current_op = operator.add
+    for token in parse_result:
+        if not isinstance(token, basestring):
+            total = current_op(total, token)
+        elif token == '-':
+            current_op = operator.sub
+        else:
+            current_op = operator.add
+    return total
+
+
+def eval_array_product(parse_result):
+    """
+    Multiply the numbers or arrays.
+    """
+    prod = 1.0
+    current_op = operator.mul
+    for token in parse_result:
+        if not isinstance(token, basestring):
+            prod = current_op(prod, token)
+        elif token == '/':
+            current_op = operator.truediv
+        else:
+            current_op = operator.mul
+    return prod
+
+
 def add_defaults(variables, functions, case_sensitive):
     """
     Create dictionaries with both the default and user-defined variables.
@@ -238,38 +320,192 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
      python numbers.
     -Unary functions are passed as a dictionary from string to function.
     """
-    # No need to go further.
-    if math_expr.strip() == "":
-        return float('nan')
+    return compile_expression(math_expr, case_sensitive).evaluate(variables, functions)
 
-    # Parse the tree.
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+_compiled_expressions = OrderedDict()
+_compiled_expressions_lock = threading.Lock()
 
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
-
-    evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
-        'atom': eval_atom,
-        'power': eval_power,
-        'parallel': eval_parallel,
-        'product': eval_product,
-        'sum': eval_sum
-    }
-
-    return math_interpreter.reduce_tree(evaluate_actions)
+def compile_expression(math_expr, case_sensitive=False):
+    """
+    Return the `CompiledExpression` for a string of math.
+
+    Keep the most recently used `COMPILED_EXPRESSION_CACHE_SIZE` compiled
+    expressions, so that an expression is only parsed once no matter how
+    many times it is evaluated.
+    """
+    key = (math_expr, case_sensitive)
+    with _compiled_expressions_lock:
+        compiled = _compiled_expressions.pop(key, None)
+        if compiled is not None:
+            # Re-insert it as the most recently used.
+            _compiled_expressions[key] = compiled
+            return compiled
+
+    compiled = CompiledExpression(math_expr, case_sensitive)
+
+    with _compiled_expressions_lock:
+        _compiled_expressions[key] = compiled
+        while len(_compiled_expressions) > COMPILED_EXPRESSION_CACHE_SIZE:
+            _compiled_expressions.popitem(last=False)
+    return compiled
+
+
+class CompiledExpression(object):
+    """
+    A math expression which has been parsed once, and may then be evaluated
+    with any variables and functions.
+
+    The parse tree is kept as nested `(node_name, children)` tuples, with its
+    numbers already converted to floats and the other terminals as strings.
+    """
+    def __init__(self, math_expr, case_sensitive=False):
+        """
+        Parse the given math expression string.
+        """
+        self.math_expr = math_expr
+        self.case_sensitive = case_sensitive
+        self.tree = None
+        self._parser = ParseAugmenter(math_expr, case_sensitive)
+
+        # Blank expressions evaluate to NaN.
+        if math_expr.strip() == "":
+            return
+
+        self._parser.parse_algebra()
+        self.tree = _compile_node(self._parser.tree)
+
+    def evaluate(self, variables, functions):
+        """
+        Evaluate the expression with the given variables and functions, as
+        `evaluator` does.
+        """
+        if self.tree is None:
+            return float('nan')
+
+        all_variables, all_functions = self._get_defaults(variables, functions)
+        return _reduce_node(self.tree, self._evaluate_actions(all_variables, all_functions))
+
+    def evaluate_samples(self, samples, functions):
+        """
+        Evaluate the expression once for each dictionary of variables in
+        `samples`, and return the list of results.
+
+        When every sample defines the same variables, and only functions of
+        `VECTORIZED_FUNCTIONS` are used, evaluate all samples at once over
+        numpy arrays. Otherwise, or if any floating point error occurs,
+        evaluate the samples one by one, so that both the results and the
+        errors raised are the same as those of `evaluate`.
+        """
+        if self.tree is None:
+            return [float('nan')] * len(samples)
+
+        if samples:
+            results = self._evaluate_vectorized(samples, functions)
+            if results is not None:
+                return results
+
+        return [self.evaluate(variables, functions) for variables in samples]
+
+    def _evaluate_vectorized(self, samples, functions):
+        """
+        Return the results of evaluating all samples at once, or None if
+        they can't be evaluated as arrays.
+        """
+        variable_names = set(samples[0])
+        if any(set(variables) != variable_names for variables in samples):
+            return None
+
+        columns = {}
+        for name in variable_names:
+            column = [variables[name] for variables in samples]
+            if not all(isinstance(value, numbers.Number) for value in column):
+                return None
+            columns[name] = numpy.array(column)
+
+        all_variables, all_functions = self._get_defaults(columns, functions)
+        casify = self._casify
+        if any(all_functions[casify(name)] not in VECTORIZED_FUNCTIONS for name in self._parser.functions_used):
+            return None
+
+        actions = self._evaluate_actions(all_variables, all_functions)
+        actions.update({
+            'atom': eval_array_atom,
+            'power': eval_array_power,
+            'parallel': eval_array_parallel,
+            'product': eval_array_product,
+            'sum': eval_array_sum,
+        })
+        try:
+            with numpy.errstate(divide='raise', over='raise', invalid='raise', under='ignore'):
+                result = _reduce_node(self.tree, actions)
+        except (ArithmeticError, ValueError, TypeError):
+            return None
+
+        if isinstance(result, numpy.ndarray) and result.shape == (len(samples),):
+            return result.tolist()
+        elif isinstance(result, numbers.Number):
+            # The expression doesn't depend on the sampled variables.
+            return [result] * len(samples)
+        return None
+
+    def _casify(self, name):
+        """
+        Return the name under which a variable or function is looked up.
+        """
+        return name if self.case_sensitive else name.lower()
+
+    def _get_defaults(self, variables, functions):
+        """
+        Return the variables and functions available to the expression,
+        having checked that all of those it uses are defined.
+        """
+        all_variables, all_functions = add_defaults(variables, functions, self.case_sensitive)
+        self._parser.check_variables(all_variables, all_functions)
+        return all_variables, all_functions
+
+    def _evaluate_actions(self, all_variables, all_functions):
+        """
+        Return the evaluation actions, by node name, for the given variables
+        and functions.
+        """
+        casify = self._casify
+        return {
+            'variable': lambda x: all_variables[casify(x[0])],
+            'function': lambda x: all_functions[casify(x[0])](x[1]),
+            'atom': eval_atom,
+            'power': eval_power,
+            'parallel': eval_parallel,
+            'product': eval_product,
+            'sum': eval_sum
+        }
+
+
+def _compile_node(node):
+    """
+    Convert a `ParseResults` node of a parse tree to nested tuples, and its
+    numbers to floats.
+    """
+    if not isinstance(node, ParseResults):
+        return node
+
+    node_name = node.getName()
+    if node_name == 'number':
+        return eval_number(node)
+    return (node_name, tuple(_compile_node(child) for child in node))
+
+
+def _reduce_node(node, handle_actions):
+    """
+    Return the result of a compiled node, calling the `handle_actions` of
+    each node on the results of its children.
+    """
+    if not isinstance(node, tuple):
+        return node
+
+    node_name, children = node
+    return handle_actions[node_name]([_reduce_node(child, handle_actions) for child in children])
 
 
 class ParseAugmenter(object):
@@ -559,3 +559,48 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class CompiledExpressionTest(unittest.TestCase):
+    """
+    Run tests for calc.compile_expression and CompiledExpression
+    """
+
+    def test_compiled_expressions_are_cached(self):
+        """
+        The same expression should only be parsed once
+        """
+        compiled = calc.compile_expression('x^2 + 1')
+        self.assertIs(calc.compile_expression('x^2 + 1'), compiled)
+        self.assertIsNot(calc.compile_expression('x^2 + 1', case_sensitive=True), compiled)
+        self.assertEqual(compiled.evaluate({'x': 3.0}, {}), 10.0)
+        self.assertEqual(compiled.evaluate({'x': 4.0}, {}), 17.0)
+
+    def test_evaluate_samples(self):
+        """
+        Evaluating over samples should give the results of evaluating each one
+        """
+        samples = [{'x': x, 'y': x / 2.0} for x in (0.5, 1.0, 2.5, 3.0)]
+        for expression in ['x^2 + 2*x*y', 'sin(x) / cosh(y)', 'x || y', '-x^y^2', 'x*i + sqrt(y)', '5k', '']:
+            compiled = calc.compile_expression(expression)
+            expected = [calc.evaluator(variables, {}, expression) for variables in samples]
+            results = compiled.evaluate_samples(samples, {})
+            self.assertEqual(len(results), len(samples))
+            for result, expected_result in zip(results, expected):
+                if numpy.isnan(expected_result):
+                    self.assertTrue(numpy.isnan(result))
+                else:
+                    self.assertAlmostEqual(result, expected_result)
+
+    def test_evaluate_samples_falls_back(self):
+        """
+        Samples which can't be evaluated at once should give the same results
+        and errors as when evaluated one by one
+        """
+        samples = [{'x': 1.0}, {'x': 0.0}, {'x': 3.0}]
+        self.assertTrue(numpy.isnan(calc.compile_expression('x || 2').evaluate_samples(samples, {})[1]))
+        self.assertEqual(calc.compile_expression('fact(x)').evaluate_samples(samples, {}), [1, 1, 6])
+        with self.assertRaises(ZeroDivisionError):
+            calc.compile_expression('1/x').evaluate_samples(samples, {})
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'y'):
+            calc.compile_expression('x+y').evaluate_samples(samples, {})
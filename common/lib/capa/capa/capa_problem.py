@@ -128,7 +128,7 @@ class LoncapaProblem(object):
     Main class for capa Problems.
     """
     def __init__(self, problem_text, id, capa_system, capa_module,  # pylint: disable=redefined-builtin
-                 state=None, seed=None, minimal_init=False):
+                 state=None, seed=None, minimal_init=False, template_cache=None, template_id=None):
         """
         Initializes capa Problem.
 
@@ -147,6 +147,10 @@ class LoncapaProblem(object):
                 - `done` (bool) indicates whether or not this problem is considered done
                 - `input_state` (dict) maps input_id to a dictionary that holds the state for that input
             seed (int): random number generator seed.
+            template_cache (ProblemTemplateCache): optional cache of the parsed tree and
+                script context of problems, shared by problems with the same definition and seed.
+            template_id (string): identifier of the problem in the template_cache, which must be
+                unique across courses, e.g. its usage key.  Defaults to id.
 
         """
 
@@ -176,19 +180,33 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
+        template_key = None
+        if template_cache is not None and not minimal_init:
+            template_key = template_cache.get_key(
+                template_id or id, problem_text, self.seed, self.capa_system.anonymous_student_id
+            )
+        template = template_cache.get(template_key) if template_key is not None else None
 
-        self.make_xml_compatible(self.tree)
+        if template is not None:
+            self.tree, self.context = template
+            self.context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+        else:
+            # parse problem XML file into an element tree
+            self.tree = etree.XML(problem_text)
 
-        # handle any <include file="foo"> tags
-        self._process_includes()
+            self.make_xml_compatible(self.tree)
 
-        # construct script processor context (eg for customresponse problems)
-        if minimal_init:
-            self.context = {}
-        else:
-            self.context = self._extract_context(self.tree)
+            # handle any <include file="foo"> tags
+            self._process_includes()
+
+            # construct script processor context (eg for customresponse problems)
+            if minimal_init:
+                self.context = {}
+            else:
+                self.context = self._extract_context(self.tree)
+
+            if template_key is not None:
+                template_cache.set(template_key, self.tree, self.context)
 
         # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
         # transformations.  This also creates the dict (self.responders) of Response
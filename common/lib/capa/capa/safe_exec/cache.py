@@ -0,0 +1,91 @@
+"""
+A cache of the results of safe_exec.
+
+Results are looked up in an in-process LRU cache, shared by all threads of
+the process, and then in a shared cache, such as a django cache, shared by
+all processes.  Hits and misses are counted per tier, tagged with the
+caller's metric tags, such as the course id.
+"""
+import json
+
+from dogapi import dog_stats_api
+
+
+class SafeExecCache(object):
+    """
+    A cache to pass to safe_exec, combining an in-process cache and a shared
+    cache with .get(key) and .set(key, value, timeout) methods.
+
+    Results are stored in the in-process cache as JSON, which they are
+    guaranteed to be serializable to, so that each caller gets its own copy.
+    Either tier may be None.  Results whose JSON is larger than
+    max_result_size bytes aren't cached, so that a few large results don't
+    evict many small ones, nor exceed the item size limit of memcached.
+    """
+    def __init__(self, shared_cache=None, process_cache=None, timeout=None, max_result_size=None, metric_tags=None):
+        """
+        Arguments:
+            shared_cache - The cache shared by all processes.
+            process_cache (ProcessLRUCache) - The cache of this process.
+            timeout (int) - For how many seconds results are kept in the
+                shared cache, or None for the shared cache's default.
+            max_result_size (int) - The size, in bytes, of the largest result
+                to cache, or None for no limit.
+            metric_tags (list) - The tags of the metrics of this cache, and of
+                the executions whose results are cached in it.
+        """
+        self.shared_cache = shared_cache
+        self.process_cache = process_cache
+        self.timeout = timeout
+        self.max_result_size = max_result_size
+        self.metric_tags = metric_tags or []
+
+    def __nonzero__(self):
+        return self.shared_cache is not None or self.process_cache is not None
+
+    def _increment(self, result, tier=None):
+        """
+        Counts a lookup with the given result, in the given tier.
+        """
+        tags = self.metric_tags + [u'result:{}'.format(result)]
+        if tier:
+            tags.append(u'tier:{}'.format(tier))
+        dog_stats_api.increment('capa.safe_exec.cache', tags=tags)
+
+    def get(self, key):
+        """
+        Returns the result cached for the given key, or None.
+        """
+        if self.process_cache is not None:
+            result_json = self.process_cache.get(key)
+            if result_json is not None:
+                self._increment('hit', 'process')
+                return json.loads(result_json)
+
+        if self.shared_cache is not None:
+            result = self.shared_cache.get(key)
+            if result is not None:
+                self._increment('hit', 'shared')
+                if self.process_cache is not None:
+                    self.process_cache.set(key, json.dumps(result))
+                return result
+
+        self._increment('miss')
+        return None
+
+    def set(self, key, result):
+        """
+        Caches the given result for the given key, unless it's too large.
+        """
+        result_json = json.dumps(result)
+        if self.max_result_size is not None and len(result_json) > self.max_result_size:
+            self._increment('too_large')
+            return
+
+        if self.process_cache is not None:
+            self.process_cache.set(key, result_json)
+        if self.shared_cache is not None:
+            if self.timeout is None:
+                self.shared_cache.set(key, result)
+            else:
+                self.shared_cache.set(key, result, self.timeout)
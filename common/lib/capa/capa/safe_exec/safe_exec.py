@@ -7,6 +7,7 @@ from . import lazymod
 from dogapi import dog_stats_api
 
 import hashlib
+import time
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -49,6 +50,11 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# Globals which differ between learners.  Unless the code refers to them,
+# they're left out of the cache key and of the cached results, so that the
+# results are shared between learners.
+LEARNER_GLOBALS = ["anonymous_student_id"]
+
 
 def update_hash(hasher, obj):
     """
@@ -102,7 +108,8 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    the random seed, and the Python path and extra files.  If it has a `metric_tags` list, the time taken by executions
+    which weren't cached is recorded with those tags.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -112,10 +119,19 @@ def safe_exec(
     """
     # Check the cache for a previous result.
     if cache:
+        unused_learner_globals = [name for name in LEARNER_GLOBALS if name not in code]
         safe_globals = json_safe(globals_dict)
+        for name in unused_learner_globals:
+            safe_globals.pop(name, None)
         md5er = hashlib.md5()
         md5er.update(repr(code))
         update_hash(md5er, safe_globals)
+        # The course's python_lib.zip changes what the code imports, so the
+        # files and path given to the sandbox are part of the key too.
+        update_hash(md5er, python_path or [])
+        for filename, contents in extra_files or []:
+            update_hash(md5er, filename)
+            md5er.update(contents)
         key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
         cached = cache.get(key)
         if cached is not None:
@@ -137,6 +153,7 @@ def safe_exec(
         exec_fn = codejail_safe_exec
 
     # Run the code!  Results are side effects in globals_dict.
+    start_time = time.time()
     try:
         exec_fn(
             code_prolog + LAZY_IMPORTS + code, globals_dict,
@@ -150,7 +167,14 @@ def safe_exec(
     # Put the result back in the cache.  This is complicated by the fact that
     # the globals dict might not be entirely serializable.
     if cache:
+        dog_stats_api.histogram(
+            'capa.safe_exec.uncached_time',
+            time.time() - start_time,
+            tags=getattr(cache, 'metric_tags', None),
+        )
         cleaned_results = json_safe(globals_dict)
+        for name in unused_learner_globals:
+            cleaned_results.pop(name, None)
         cache.set(key, (emsg, cleaned_results))
 
     # If an exception happened, raise it now.
@@ -6,12 +6,17 @@ import os.path
 import random
 import textwrap
 import unittest
+import zipfile
+from cStringIO import StringIO
 
+from mock import patch
 from nose.plugins.skip import SkipTest
 
 from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec.cache import SafeExecCache
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
+from openedx.core.lib.cache_utils import ProcessLRUCache
 
 
 class TestSafeExec(unittest.TestCase):
@@ -176,6 +181,109 @@ class TestSafeExecCaching(unittest.TestCase):
             except UnicodeEncodeError:
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
+    def test_learner_globals_not_cached_when_unused(self):
+        cache = {}
+        g = {'anonymous_student_id': 'student1'}
+        safe_exec("a = 17", g, cache=DictCache(cache))
+        self.assertEqual(g['anonymous_student_id'], 'student1')
+        self.assertEqual(cache.values()[0], (None, {'a': 17}))
+
+        # Another learner gets the cached result.
+        cache[cache.keys()[0]] = (None, {'a': 42})
+        g = {'anonymous_student_id': 'student2'}
+        safe_exec("a = 17", g, cache=DictCache(cache))
+        self.assertEqual(g, {'a': 42, 'anonymous_student_id': 'student2'})
+
+    def test_learner_globals_cached_when_used(self):
+        cache = {}
+        safe_exec("a = anonymous_student_id", {'anonymous_student_id': 'student1'}, cache=DictCache(cache))
+        g = {'anonymous_student_id': 'student2'}
+        safe_exec("a = anonymous_student_id", g, cache=DictCache(cache))
+        self.assertEqual(g['a'], 'student2')
+        self.assertEqual(len(cache), 2)
+
+    def test_python_lib_in_key(self):
+        cache = {}
+        code = "import constant; a = constant.THE_CONST"
+        for the_const in [17, 42]:
+            zipped_lib = StringIO()
+            with zipfile.ZipFile(zipped_lib, "w") as zipped:
+                zipped.writestr("constant.py", "THE_CONST = {}\n".format(the_const))
+            g = {}
+            safe_exec(
+                code, g, cache=DictCache(cache), python_path=["python_lib.zip"],
+                extra_files=[("python_lib.zip", zipped_lib.getvalue())],
+            )
+            # A course with another python_lib.zip doesn't get the cached result.
+            self.assertEqual(g['a'], the_const)
+        self.assertEqual(len(cache), 2)
+
+
+class TestSafeExecCache(unittest.TestCase):
+    """Test the two-tier SafeExecCache."""
+
+    def setUp(self):
+        super(TestSafeExecCache, self).setUp()
+        self.shared = {}
+        self.process_cache = ProcessLRUCache(max_size=2, timeout=60)
+        self.cache = SafeExecCache(
+            shared_cache=DictCache(self.shared),
+            process_cache=self.process_cache,
+            max_result_size=100,
+            metric_tags=['course_id:test'],
+        )
+
+    def test_cache_miss_then_hit(self):
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.cache)
+        self.assertEqual(g['a'], 3)
+        self.assertEqual(self.shared.values()[0], (None, {'a': 3}))
+
+        # The process tier is used first.
+        self.shared[self.shared.keys()[0]] = (None, {'a': 17})
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.cache)
+        self.assertEqual(g['a'], 3)
+
+        # Then the shared tier.
+        self.process_cache.clear()
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.cache)
+        self.assertEqual(g['a'], 17)
+
+    def test_results_are_copied(self):
+        self.cache.set('key', (None, {'a': [1]}))
+        self.cache.get('key')[1]['a'].append(2)
+        self.assertEqual(self.process_cache.get('key'), '[null, {"a": [1]}]')
+
+    def test_process_cache_size(self):
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, (None, {}))
+        self.assertIsNone(self.process_cache.get('a'))
+        self.assertIsNotNone(self.process_cache.get('b'))
+        self.assertIsNotNone(self.process_cache.get('c'))
+
+    def test_large_results_not_cached(self):
+        self.cache.set('key', (None, {'a': 'x' * 100}))
+        self.assertIsNone(self.process_cache.get('key'))
+        self.assertEqual(self.shared, {})
+
+    @patch('capa.safe_exec.cache.dog_stats_api')
+    def test_metrics(self, mock_dog_stats_api):
+        self.cache.get('key')
+        self.cache.set('key', (None, {}))
+        self.cache.get('key')
+        self.process_cache.clear()
+        self.cache.get('key')
+        self.assertEqual(
+            [call_args[1]['tags'] for call_args in mock_dog_stats_api.increment.call_args_list],
+            [
+                ['course_id:test', 'result:miss'],
+                ['course_id:test', 'result:hit', 'tier:process'],
+                ['course_id:test', 'result:hit', 'tier:shared'],
+            ]
+        )
+
 
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
@@ -0,0 +1,67 @@
+"""
+An in-process cache of the templates of capa problems.
+
+A template is the parsed XML tree of a problem and the context produced by
+executing its scripts.  Both only depend on the problem's definition and
+seed, so LoncapaProblems built for different learners from the same
+definition and seed can share a template, instead of re-parsing the
+problem and re-executing its scripts.
+"""
+import hashlib
+from copy import deepcopy
+
+from openedx.core.lib.cache_utils import ProcessLRUCache
+
+
+class ProblemTemplateCache(ProcessLRUCache):
+    """
+    An LRU cache of problem templates, shared by all threads of the process.
+
+    At most max_size templates are kept, each for at most timeout seconds,
+    since templates also depend on resources outside of the problem's
+    definition, such as the course's python_lib.zip.  Templates are copied
+    in and out of the cache, since LoncapaProblems modify their tree and
+    context.
+    """
+    def __init__(self, max_size, timeout):
+        super(ProblemTemplateCache, self).__init__(max_size=max_size, timeout=timeout)
+
+    @staticmethod
+    def get_key(problem_id, problem_text, seed, anonymous_student_id):
+        """
+        Returns the cache key of the template of the given problem, or None
+        if the problem's template can't be cached.
+
+        The anonymous_student_id is only part of the key if the problem
+        refers to it, since it is otherwise the same for all learners.
+        """
+        if '<include' in problem_text:
+            # Included files aren't part of the problem's definition.
+            return None
+
+        if 'anonymous_student_id' not in problem_text:
+            anonymous_student_id = None
+
+        key_hash = hashlib.sha1(u'{problem_id}|{seed!r}|{anonymous_student_id}|'.format(
+            problem_id=problem_id,
+            seed=seed,
+            anonymous_student_id=anonymous_student_id,
+        ).encode('utf-8'))
+        if isinstance(problem_text, unicode):
+            problem_text = problem_text.encode('utf-8')
+        key_hash.update(problem_text)
+        return key_hash.hexdigest()
+
+    def get(self, key):
+        """
+        Returns a copy of the (tree, context) template cached for the given
+        key, or None.
+        """
+        template = super(ProblemTemplateCache, self).get(key)
+        return deepcopy(template) if template is not None else None
+
+    def set(self, key, tree, context):  # pylint: disable=arguments-differ
+        """
+        Caches a copy of the given template for the given key.
+        """
+        super(ProblemTemplateCache, self).set(key, deepcopy((tree, context)))
@@ -5,8 +5,12 @@ import ddt
 import textwrap
 from lxml import etree
 import unittest
+from mock import patch
 
-from capa.tests.helpers import new_loncapa_problem
+from capa.capa_problem import LoncapaProblem
+from capa.safe_exec import safe_exec
+from capa.template_cache import ProblemTemplateCache
+from capa.tests.helpers import mock_capa_module, new_loncapa_problem, test_capa_system
 
 
 @ddt.ddt
@@ -590,3 +594,72 @@ class CAPAMultiInputProblemTest(unittest.TestCase):
             description_element = multi_inputs_group.xpath('//p[@id="{}"]'.format(description_id))
             self.assertEqual(len(description_element), 1)
             self.assertEqual(description_element[0].text, descriptions[index])
+
+
+class ProblemTemplateCacheTest(unittest.TestCase):
+    """ TestCase for sharing the templates of CAPA problems """
+    XML = textwrap.dedent("""
+        <problem>
+            <script type="loncapa/python">
+        {code}
+            </script>
+            <stringresponse answer="$answer">
+                <textline/>
+            </stringresponse>
+        </problem>
+    """)
+
+    def setUp(self):
+        super(ProblemTemplateCacheTest, self).setUp()
+        self.template_cache = ProblemTemplateCache(max_size=10, timeout=60)
+        patcher = patch('capa.capa_problem.safe_exec', wraps=safe_exec)
+        self.mock_safe_exec = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def new_problem(self, code, seed=1, anonymous_student_id='student', template_id=None):
+        """
+        Returns a problem with the given script, built using the template cache.
+        """
+        capa_system = test_capa_system()
+        capa_system.anonymous_student_id = anonymous_student_id
+        return LoncapaProblem(
+            self.XML.format(code=code), id='1', seed=seed, capa_system=capa_system,
+            capa_module=mock_capa_module(), template_cache=self.template_cache, template_id=template_id,
+        )
+
+    def test_shared_template(self):
+        code = 'answer = str(random.randint(0, 10 ** 9))'
+        problem = self.new_problem(code)
+        other_problem = self.new_problem(code, anonymous_student_id='other_student')
+        self.assertEqual(self.mock_safe_exec.call_count, 1)
+
+        self.assertEqual(problem.context['answer'], other_problem.context['answer'])
+        self.assertEqual(other_problem.context['anonymous_student_id'], 'other_student')
+        self.assertEqual(etree.tostring(problem.tree), etree.tostring(other_problem.tree))
+        self.assertIsNot(problem.tree, other_problem.tree)
+        self.assertIsNot(problem.context, other_problem.context)
+
+        self.new_problem(code, seed=2)
+        self.assertEqual(self.mock_safe_exec.call_count, 2)
+
+    def test_template_id(self):
+        code = 'answer = str(random.randint(0, 10 ** 9))'
+        self.new_problem(code, template_id='i4x://org/course/problem/1')
+        self.new_problem(code, template_id='block-v1:org+course+run+type@problem+block@1')
+        self.new_problem(code, template_id='i4x://org/course/problem/1')
+        self.assertEqual(self.mock_safe_exec.call_count, 2)
+
+    def test_student_specific_template(self):
+        code = 'answer = anonymous_student_id'
+        problem = self.new_problem(code)
+        other_problem = self.new_problem(code, anonymous_student_id='other_student')
+        self.assertEqual(self.mock_safe_exec.call_count, 2)
+        self.assertEqual(problem.context['answer'], 'student')
+        self.assertEqual(other_problem.context['answer'], 'other_student')
+
+    def test_cache_size(self):
+        self.template_cache.max_size = 1
+        self.new_problem('answer = "1"', seed=1)
+        self.new_problem('answer = "1"', seed=2)
+        self.new_problem('answer = "1"', seed=1)
+        self.assertEqual(self.mock_safe_exec.call_count, 3)
@@ -22,6 +22,7 @@ from pytz import utc
 from capa.capa_problem import LoncapaProblem, LoncapaSystem
 from capa.inputtypes import Status
 from capa.responsetypes import StudentInputError, ResponseError, LoncapaProblemError
+from capa.template_cache import ProblemTemplateCache
 from capa.util import convert_files_to_filenames, get_inner_html_from_xpath
 from xblock.fields import Boolean, Dict, Float, Integer, Scope, String, XMLString
 from xblock.scorable import ScorableXBlockMixin, Score
@@ -46,6 +47,17 @@ MAX_RANDOMIZATION_BINS = 1000
 
 FEATURES = getattr(settings, 'FEATURES', {})
 
+# The parsed trees and script contexts of problems, shared by the learners
+# who get the same variant of a problem.
+_PROBLEM_TEMPLATE_CACHE_SETTINGS = getattr(settings, 'CAPA_PROBLEM_TEMPLATE_CACHE_SETTINGS', {})
+if _PROBLEM_TEMPLATE_CACHE_SETTINGS.get('SIZE', 0) > 0:
+    PROBLEM_TEMPLATE_CACHE = ProblemTemplateCache(
+        max_size=_PROBLEM_TEMPLATE_CACHE_SETTINGS['SIZE'],
+        timeout=_PROBLEM_TEMPLATE_CACHE_SETTINGS.get('TIMEOUT', 60),
+    )
+else:
+    PROBLEM_TEMPLATE_CACHE = None
+
 
 def randomization_bin(seed, problem_id):
     """
@@ -348,6 +360,10 @@ class CapaMixin(ScorableXBlockMixin, CapaFields):
             seed=self.seed,
             capa_system=capa_system,
             capa_module=self,  # njp
+            template_cache=PROBLEM_TEMPLATE_CACHE,
+            # The html_id of old Mongo locations omits the run, so it isn't
+            # unique across courses.
+            template_id=unicode(self.location),
         )
 
     def get_state_for_lcp(self):
@@ -6,7 +6,9 @@ import json
 import pymongo
 import gridfs
 from gridfs.errors import NoFile
+from gridfs.grid_file import DEFAULT_CHUNK_SIZE
 from fs.osfs import OSFS
+from fs.path import pathjoin
 from bson.son import SON
 
 from mongodb_proxy import autoretry_read
@@ -94,7 +96,11 @@ class MongoContentStore(ContentStore):
                               import_path=content.import_path,
                               # getattr b/c caching may mean some pickled instances don't have attr
                               locked=getattr(content, 'locked', False)) as fp:
-            if hasattr(content.data, '__iter__'):
+            if isinstance(content, StaticContentStream):
+                # Write streamed content a GridFS chunk at a time, rather than loading it into memory.
+                for chunk in content.stream_data(chunk_size=DEFAULT_CHUNK_SIZE):
+                    fp.write(chunk)
+            elif hasattr(content.data, '__iter__'):
                 for chunk in content.data:
                     fp.write(chunk)
             else:
@@ -152,25 +158,37 @@ class MongoContentStore(ContentStore):
             else:
                 return None
 
-    def export(self, location, output_directory):
-        content = self.find(location)
+    def export(self, location, output_directory, export_fs=None):
+        """
+        Export the asset to output_directory, streaming its content from
+        GridFS one chunk at a time.
+
+        If export_fs is given, output_directory is a path within that FS
+        instead of a directory on disk.
+        """
+        if export_fs is None:
+            export_fs = OSFS('/')
+            output_directory = os.path.abspath(output_directory)
+
+        content = self.find(location, as_stream=True)
 
         filename = content.name
         if content.import_path is not None:
-            output_directory = output_directory + '/' + os.path.dirname(content.import_path)
+            output_directory = pathjoin(output_directory, os.path.dirname(content.import_path))
 
-        if not os.path.exists(output_directory):
-            os.makedirs(output_directory)
+        export_fs.makedir(output_directory, recursive=True, allow_recreate=True)
 
         # Escape invalid char from filename.
         export_name = escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
 
-        disk_fs = OSFS(output_directory)
-
-        with disk_fs.open(export_name, 'wb') as asset_file:
-            asset_file.write(content.data)
+        try:
+            with export_fs.open(pathjoin(output_directory, export_name), 'wb') as asset_file:
+                for chunk in content.stream_data(chunk_size=DEFAULT_CHUNK_SIZE):
+                    asset_file.write(chunk)
+        finally:
+            content.close()
 
-    def export_all_for_course(self, course_key, output_directory, assets_policy_file):
+    def export_all_for_course(self, course_key, output_directory, assets_policy_file, export_fs=None):
         """
         Export all of this course's assets to the output_directory. Export all of the assets'
         attributes to the policy file.
@@ -180,7 +198,14 @@ class MongoContentStore(ContentStore):
             output_directory: the directory under which to put all the asset files
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
+            export_fs: an optional FS, within which output_directory and assets_policy_file
+                are located, to export to instead of the disk.
         """
+        if export_fs is None:
+            export_fs = OSFS('/')
+            output_directory = os.path.abspath(output_directory)
+            assets_policy_file = os.path.abspath(assets_policy_file)
+
         policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
@@ -193,12 +218,12 @@ class MongoContentStore(ContentStore):
             #
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
+            self.export(asset['asset_key'], output_directory, export_fs=export_fs)
             for attr, value in asset.iteritems():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].name, {})[attr] = value
 
-        with open(assets_policy_file, 'w') as f:
+        with export_fs.open(assets_policy_file, 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
 
     def get_all_content_thumbnails_for_course(self, course_key):
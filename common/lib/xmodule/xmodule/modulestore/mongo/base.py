@@ -71,6 +71,14 @@ BLOCK_TYPES_WITH_CHILDREN = list(set(
     name for name, class_ in XBlock.load_classes() if getattr(class_, 'has_children', False)
 ))
 
+# Version of the format of the metadata inheritance entries stored in the
+# metadata_inheritance_cache_subsystem. Increment whenever the format changes.
+METADATA_INHERITANCE_CACHE_VERSION = 2
+
+# Number of seconds after which the lock taken to update a metadata
+# inheritance entry incrementally expires, should its holder die.
+METADATA_INHERITANCE_LOCK_TIMEOUT = 10
+
 # Allow us to call _from_deprecated_(son|string) throughout the file
 # pylint: disable=protected-access
 
@@ -685,6 +693,8 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
     def _compute_metadata_inheritance_tree(self, course_id):
         '''
         Find all inheritable fields from all xblocks in the course which may define inheritable data
+
+        Returns the metadata inheritance entry of the course; see `_get_metadata_inheritance_entry`.
         '''
         # get all collections in the course, this query should not return any leaf nodes
         course_id = self.fill_in_run(course_id)
@@ -710,7 +720,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
         # it's ok to keep these as deprecated strings b/c the overall cache is indexed by course_key and this
         # is a dictionary relative to that course
-        results_by_url = {}
+        containers = {}
         root = None
 
         # now go through the results and order them by the location url
@@ -719,58 +729,70 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             location = as_published(Location._from_deprecated_son(result['_id'], course_id.run))
 
             location_url = unicode(location)
-            if location_url in results_by_url:
+            children = result.get('definition', {}).get('children', [])
+            if location_url in containers:
                 # found either draft or live to complement the other revision
                 # FIXME this is wrong. If the child was moved in draft from one parent to the other, it will
                 # show up under both in this logic: https://openedx.atlassian.net/browse/TNL-1075
-                existing_children = results_by_url[location_url].get('definition', {}).get('children', [])
-                additional_children = result.get('definition', {}).get('children', [])
-                total_children = existing_children + additional_children
+                metadata, existing_children = containers[location_url]
                 # use set to get rid of duplicates. We don't care about order; so, it shouldn't matter.
-                results_by_url[location_url].setdefault('definition', {})['children'] = set(total_children)
+                containers[location_url] = (metadata, list(set(existing_children + children)))
             else:
-                results_by_url[location_url] = result
+                containers[location_url] = (result.get('metadata', {}), children)
             if location.category == 'course':
                 root = location_url
 
         # now traverse the tree and compute down the inherited metadata
         metadata_to_inherit = {}
+        if root is not None:
+            self._inherit_cached_metadata(containers, metadata_to_inherit, root, copy.deepcopy(containers[root][0]))
 
-        def _compute_inherited_metadata(url):
-            """
-            Helper method for computing inherited metadata for a specific location url
-            """
-            my_metadata = results_by_url[url].get('metadata', {})
-
-            # go through all the children and recurse, but only if we have
-            # in the result set. Remember results will not contain leaf nodes
-            for child in results_by_url[url].get('definition', {}).get('children', []):
-                if child in results_by_url:
-                    new_child_metadata = copy.deepcopy(my_metadata)
-                    new_child_metadata.update(results_by_url[child].get('metadata', {}))
-                    results_by_url[child]['metadata'] = new_child_metadata
-                    metadata_to_inherit[child] = new_child_metadata
-                    _compute_inherited_metadata(child)
-                else:
-                    # this is likely a leaf node, so let's record what metadata we need to inherit
-                    metadata_to_inherit[child] = my_metadata.copy()
-                # WARNING: 'parent' is not part of inherited metadata, but
-                # we're piggybacking on this recursive traversal to grab
-                # and cache the child's parent, as a performance optimization.
-                # The 'parent' key will be popped out of the dictionary during
-                # CachingDescriptorSystem.load_item
-                metadata_to_inherit[child].setdefault('parent', {})[self.get_branch_setting()] = url
+        return {
+            'stamp': uuid4().hex,
+            'root': root,
+            'containers': containers,
+            'tree': metadata_to_inherit,
+        }
 
-        if root is not None:
-            _compute_inherited_metadata(root)
+    def _inherit_cached_metadata(self, containers, metadata_to_inherit, url, my_metadata):
+        """
+        Helper method for computing inherited metadata for the descendants of a specific location url,
+        given its own metadata merged with what it inherits.
+        """
+        # go through all the children and recurse, but only if we have
+        # in the result set. Remember results will not contain leaf nodes
+        for child in containers[url][1]:
+            if child in containers:
+                new_child_metadata = copy.deepcopy(my_metadata)
+                new_child_metadata.update(containers[child][0])
+                metadata_to_inherit[child] = new_child_metadata
+                self._inherit_cached_metadata(containers, metadata_to_inherit, child, new_child_metadata)
+            else:
+                # this is likely a leaf node, so let's record what metadata we need to inherit
+                metadata_to_inherit[child] = my_metadata.copy()
+            # WARNING: 'parent' is not part of inherited metadata, but
+            # we're piggybacking on this recursive traversal to grab
+            # and cache the child's parent, as a performance optimization.
+            # The 'parent' key will be popped out of the dictionary during
+            # CachingDescriptorSystem.load_item
+            metadata_to_inherit[child]['parent'] = {self.get_branch_setting(): url}
 
-        return metadata_to_inherit
+    def _metadata_inheritance_cache_key(self, course_id):
+        """
+        Returns the key of the course's metadata inheritance entry in the metadata_inheritance_cache_subsystem.
+        """
+        return u'{}.v{}'.format(course_id, METADATA_INHERITANCE_CACHE_VERSION)
 
-    def _get_cached_metadata_inheritance_tree(self, course_id, force_refresh=False):
+    def _get_metadata_inheritance_entry(self, course_id, force_refresh=False):
         '''
-        Compute the metadata inheritance for the course.
+        Returns the metadata inheritance entry of the course, a dict of:
+            stamp: a random version stamp, replaced whenever the entry changes
+            root: the location url of the course
+            containers: a map of the location url of each block which may have children to
+                a tuple of its own inheritable metadata and its children's location urls
+            tree: a map of the location url of each descendant of the course to the metadata it inherits
         '''
-        tree = {}
+        entry = None
 
         course_id = self.fill_in_run(course_id)
         if not force_refresh:
@@ -780,45 +802,148 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
             # then look in any caching subsystem (e.g. memcached)
             if self.metadata_inheritance_cache_subsystem is not None:
-                tree = self.metadata_inheritance_cache_subsystem.get(unicode(course_id), {})
+                entry = self.metadata_inheritance_cache_subsystem.get(self._metadata_inheritance_cache_key(course_id))
             else:
                 logging.warning(
                     'Running MongoModuleStore without a metadata_inheritance_cache_subsystem. This is \
                     OK in localdev and testing environment. Not OK in production.'
                 )
 
-        if not tree:
+        if not entry:
             # if not in subsystem, or we are on force refresh, then we have to compute
-            tree = self._compute_metadata_inheritance_tree(course_id)
+            entry = self._compute_metadata_inheritance_tree(course_id)
+            self._set_metadata_inheritance_entry(course_id, entry)
+        else:
+            self._set_metadata_inheritance_entry(course_id, entry, request_cache_only=True)
 
-            # now write out computed tree to caching subsystem (e.g. memcached), if available
-            if self.metadata_inheritance_cache_subsystem is not None:
-                self.metadata_inheritance_cache_subsystem.set(unicode(course_id), tree)
+        return entry
+
+    def _set_metadata_inheritance_entry(self, course_id, entry, request_cache_only=False):
+        """
+        Writes out the metadata inheritance entry of the course to the caching subsystem (e.g. memcached),
+        unless request_cache_only is set, and to the request cache, if they are available.
+        """
+        if self.metadata_inheritance_cache_subsystem is not None and not request_cache_only:
+            self.metadata_inheritance_cache_subsystem.set(self._metadata_inheritance_cache_key(course_id), entry)
 
-        # now populate a request_cache, if available. NOTE, we are outside of the
-        # scope of the above if: statement so that after a memcache hit, it'll get
-        # put into the request_cache
+        # now populate a request_cache, if available. NOTE, this is also done
+        # after a memcache hit, so that it'll get put into the request_cache
         if self.request_cache is not None:
             # we can't assume the 'metadatat_inheritance' part of the request cache dict has been
             # defined
             if 'metadata_inheritance' not in self.request_cache.data:
                 self.request_cache.data['metadata_inheritance'] = {}
-            self.request_cache.data['metadata_inheritance'][unicode(course_id)] = tree
+            self.request_cache.data['metadata_inheritance'][unicode(course_id)] = entry
 
+    def _get_cached_metadata_inheritance_tree(self, course_id, force_refresh=False):
+        '''
+        Compute the metadata inheritance for the course.
+        '''
+        return self._get_metadata_inheritance_entry(course_id, force_refresh)['tree']
+
+    def _update_cached_metadata_inheritance_tree(self, course_id, xblock):
+        """
+        Update the cached metadata inheritance entry of the course for the changes to the given
+        xblock's inheritable metadata and children, recomputing only the inherited metadata of
+        the xblock's subtree.
+
+        Returns the updated tree, or None if the entry can't be updated incrementally.
+        """
+        course_id = self.fill_in_run(course_id)
+        if xblock.location.block_type not in BLOCK_TYPES_WITH_CHILDREN:
+            # only blocks which may have children pass metadata on, so the tree is unchanged
+            return self._get_cached_metadata_inheritance_tree(course_id)
+
+        cache_key = self._metadata_inheritance_cache_key(course_id)
+        entry = None
+        if self.request_cache is not None:
+            entry = self.request_cache.data.get('metadata_inheritance', {}).get(unicode(course_id))
+        if entry is None and self.metadata_inheritance_cache_subsystem is not None:
+            entry = self.metadata_inheritance_cache_subsystem.get(cache_key)
+        if not entry:
+            return None
+
+        url = unicode(as_published(xblock.location))
+        metadata = self._serialize_scope(xblock, Scope.settings)
+        metadata = {
+            field_name: value for field_name, value in metadata.iteritems()
+            if field_name in InheritanceMixin.fields
+        }
+        children = self._serialize_scope(xblock, Scope.children).get('children', [])
+
+        containers = entry['containers']
+        tree = entry['tree']
+        if url in containers:
+            # The tree holds the children of both the draft and the published versions, so
+            # removing children may not remove them from the tree; recompute all of it then
+            existing_children = containers[url][1]
+            if set(existing_children) - set(children):
+                return None
+            children = existing_children + [child for child in children if child not in existing_children]
+
+        if url == entry['root']:
+            inherited_metadata = {}
+        elif url in tree:
+            parent_url = tree[url].get('parent', {}).get(self.get_branch_setting())
+            if parent_url == entry['root']:
+                inherited_metadata = containers[parent_url][0]
+            elif parent_url in tree:
+                inherited_metadata = tree[parent_url]
+            else:
+                return None
+        else:
+            inherited_metadata = None
+
+        containers[url] = (metadata, children)
+        if inherited_metadata is not None:
+            # recompute the inherited metadata of the xblock's subtree
+            my_metadata = copy.deepcopy(inherited_metadata)
+            my_metadata.pop('parent', None)
+            my_metadata.update(metadata)
+            self._inherit_cached_metadata(containers, tree, url, my_metadata)
+            if url in tree:
+                tree[url] = dict(my_metadata, parent=tree[url]['parent'])
+
+        if self.metadata_inheritance_cache_subsystem is None:
+            entry['stamp'] = uuid4().hex
+            self._set_metadata_inheritance_entry(course_id, entry)
+            return tree
+
+        # Don't overwrite changes which other processes made to the entry since it was read.  The
+        # entry is checked and written under a lock, so that concurrent updates can't both pass
+        # the check; the processes which don't get the lock recompute the whole tree instead.
+        lock_key = cache_key + '.lock'
+        if not self.metadata_inheritance_cache_subsystem.add(lock_key, True, METADATA_INHERITANCE_LOCK_TIMEOUT):
+            return None
+        try:
+            cached_entry = self.metadata_inheritance_cache_subsystem.get(cache_key)
+            if not cached_entry or cached_entry['stamp'] != entry['stamp']:
+                return None
+            entry['stamp'] = uuid4().hex
+            self._set_metadata_inheritance_entry(course_id, entry)
+        finally:
+            self.metadata_inheritance_cache_subsystem.delete(lock_key)
         return tree
 
-    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None):
+    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None, updated_xblock=None):
         """
         Refresh the cached metadata inheritance tree for the org/course combination
         for location
 
         If given a runtime, it replaces the cached_metadata in that runtime. NOTE: failure to provide
         a runtime may mean that some objects report old values for inherited data.
+
+        If given the xblock which was updated, only the inherited metadata of its subtree is recomputed
+        where possible.
         """
         course_id = course_id.for_branch(None)
         if not self._is_in_bulk_operation(course_id):
-            # below is done for side effects when runtime is None
-            cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
+            cached_metadata = None
+            if updated_xblock is not None:
+                cached_metadata = self._update_cached_metadata_inheritance_tree(course_id, updated_xblock)
+            if cached_metadata is None:
+                # below is done for side effects when runtime is None
+                cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
             if runtime:
                 runtime.cached_metadata = cached_metadata
 
@@ -1553,7 +1678,9 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             xblock._edit_info = payload['edit_info']
 
             # recompute (and update) the metadata inheritance tree which is cached
-            self.refresh_cached_metadata_inheritance_tree(xblock.scope_ids.usage_id.course_key, xblock.runtime)
+            self.refresh_cached_metadata_inheritance_tree(
+                xblock.scope_ids.usage_id.course_key, xblock.runtime, updated_xblock=xblock
+            )
             # fire signal that we've written to DB
         except ItemNotFoundError:
             if not allow_not_found:
@@ -15,6 +15,7 @@ from time import time
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
@@ -25,6 +26,7 @@ import logging
 
 from contracts import check, new_contract
 from mongodb_proxy import autoretry_read
+from openedx.core.lib.cache_utils import ProcessLRUCache
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
@@ -163,6 +165,132 @@ class QueryTimer(object):
 TIMER = QueryTimer(__name__, 0.01)
 
 
+class LazyBlockMap(dict):
+    """
+    A map of BlockKey to BlockData for the blocks of a structure, which
+    is filled with the blocks as they are stored in mongo and only
+    converts a block to BlockData, validating it, when it is first read.
+
+    Requests that only read a few blocks of a large structure thereby
+    avoid paying for the conversion of all of them.
+    """
+    def __getitem__(self, key):
+        return self._block_data(key, dict.__getitem__(self, key))
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def pop(self, key, *args):
+        if key in self:
+            return self._block_data(key, dict.pop(self, key))
+        return dict.pop(self, key, *args)
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        return key, self._block_data(key, value)
+
+    def iteritems(self):
+        for key, value in dict.iteritems(self):
+            yield key, self._block_data(key, value)
+
+    def itervalues(self):
+        for __, value in self.iteritems():
+            yield value
+
+    def items(self):
+        return list(self.iteritems())
+
+    def values(self):
+        return list(self.itervalues())
+
+    def copy(self):
+        return self.__class__(self)
+
+    def __eq__(self, other):
+        self._load_all()
+        if isinstance(other, LazyBlockMap):
+            other._load_all()  # pylint: disable=protected-access
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __reduce__(self):
+        # Keep the blocks which haven't been read yet in their mongo format
+        # when pickling or copying.
+        return (self.__class__, (), None, None, dict.iteritems(self))
+
+    def iter_children(self):
+        """
+        Yields a (block_key, children) pair for every block, with children
+        being a list of BlockKey, without converting the blocks which
+        haven't been read yet to BlockData.
+        """
+        for block_key, value in dict.iteritems(self):
+            if isinstance(value, BlockData):
+                yield block_key, value.fields.get('children', [])
+            else:
+                yield block_key, [BlockKey(*child) for child in value['fields'].get('children', [])]
+
+    def _load_all(self):
+        """
+        Converts all blocks which haven't been read yet to BlockData.
+        """
+        for __ in self.iteritems():
+            pass
+
+    def _block_data(self, key, value):
+        """
+        Returns the BlockData for the given block, converting it from its
+        mongo format and replacing it in the map if it hasn't been read yet.
+        """
+        if not isinstance(value, BlockData):
+            value = block_from_mongo(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+
+def iter_block_children(blocks):
+    """
+    Yields a (block_key, children) pair for every block in the given
+    map of BlockKey to BlockData, which may be a LazyBlockMap.
+    """
+    if isinstance(blocks, LazyBlockMap):
+        return blocks.iter_children()
+    return (
+        (block_key, block.fields.get('children', []))
+        for block_key, block in blocks.iteritems()
+    )
+
+
+def block_from_mongo(block):
+    """
+    Converts a block as stored in a structure in mongo to BlockData.
+    Converts 'fields.children' from [[block_type, block_id]] to [BlockKey].
+
+    The given block is left unchanged, so that it can be safely shared
+    between copies of a LazyBlockMap.
+    """
+    block = dict(block)
+    block.pop('block_id', None)
+    if 'children' in block['fields']:
+        check('list(list[2])', block['fields']['children'])
+        block['fields'] = dict(
+            block['fields'],
+            children=[BlockKey(*child) for child in block['fields']['children']],
+        )
+    return BlockData(**block)
+
+
 def structure_from_mongo(structure, course_context=None):
     """
     Converts the 'blocks' key from a list [block_data] to a map
@@ -171,6 +299,9 @@ def structure_from_mongo(structure, course_context=None):
     Converts 'blocks.*.fields.children' from [[block_type, block_id]] to [BlockKey].
     N.B. Does not convert any other ReferenceFields (because we don't know which fields they are at this level).
 
+    The blocks are converted lazily, when they are first read from the
+    resulting LazyBlockMap.
+
     Arguments:
         structure: The document structure to convert
         course_context (CourseKey): For metrics gathering, the CourseKey
@@ -181,17 +312,12 @@ def structure_from_mongo(structure, course_context=None):
 
         check('seq[2]', structure['root'])
         check('list(dict)', structure['blocks'])
-        for block in structure['blocks']:
-            if 'children' in block['fields']:
-                check('list(list[2])', block['fields']['children'])
 
         structure['root'] = BlockKey(*structure['root'])
-        new_blocks = {}
-        for block in structure['blocks']:
-            if 'children' in block['fields']:
-                block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
-            new_blocks[BlockKey(block['block_type'], block.pop('block_id'))] = BlockData(**block)
-        structure['blocks'] = new_blocks
+        structure['blocks'] = LazyBlockMap(
+            (BlockKey(block['block_type'], block['block_id']), block)
+            for block in structure['blocks']
+        )
 
         return structure
 
@@ -225,21 +351,53 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class ProcessStructureCache(ProcessLRUCache):
+    """
+    A bounded, thread-safe, in-process LRU cache of pickled course structures,
+    keyed by structure id.
+
+    Since structures are immutable, the cached data never needs to be
+    invalidated.  Pickled (but uncompressed) data is kept rather than the
+    structures themselves, so that every caller still gets its own copy of a
+    structure to modify, while skipping the round trip to the cache backend
+    and the decompression of its data.
+
+    The total size of the cached data is kept under ``max_size`` bytes by
+    evicting the least recently used structures.
+    """
+    def __init__(self, max_size=0):
+        super(ProcessStructureCache, self).__init__(max_size=max_size, get_size=len)
+
+
+# The in-process structure cache shared by all threads of this process.
+PROCESS_STRUCTURE_CACHE = ProcessStructureCache()
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    When the COURSE_STRUCTURE_PROCESS_CACHE_SIZE setting is non-zero, the
+    pickled structures are also kept in an in-process LRU cache of up to
+    that many bytes, in front of the django cache.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
     def __init__(self):
         self.cache = None
+        self.process_cache = None
         if DJANGO_AVAILABLE:
             try:
                 self.cache = get_cache('course_structure_cache')
             except InvalidCacheBackendError:
                 pass
+            else:
+                process_cache_size = getattr(settings, 'COURSE_STRUCTURE_PROCESS_CACHE_SIZE', 0)
+                if process_cache_size:
+                    self.process_cache = PROCESS_STRUCTURE_CACHE
+                    self.process_cache.max_size = process_cache_size
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
@@ -247,6 +405,13 @@ class CourseStructureCache(object):
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            if self.process_cache is not None:
+                pickled_data = self.process_cache.get(key)
+                tagger.tag(from_process_cache=str(pickled_data is not None).lower())
+                if pickled_data is not None:
+                    tagger.measure('uncompressed_size', len(pickled_data))
+                    return pickle.loads(pickled_data)
+
             compressed_pickled_data = self.cache.get(key)
             tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
@@ -259,6 +424,7 @@ class CourseStructureCache(object):
 
             pickled_data = zlib.decompress(compressed_pickled_data)
             tagger.measure('uncompressed_size', len(pickled_data))
+            self._set_in_process_cache(key, pickled_data, tagger)
 
             return pickle.loads(pickled_data)
 
@@ -277,6 +443,16 @@ class CourseStructureCache(object):
 
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
+            self._set_in_process_cache(key, pickled_data, tagger)
+
+    def _set_in_process_cache(self, key, pickled_data, tagger):
+        """
+        Add the pickled data to the in-process cache, if enabled, and
+        record the resulting evictions and size of the cache.
+        """
+        if self.process_cache is not None:
+            tagger.measure('process_cache_evictions', self.process_cache.set(key, pickled_data))
+            tagger.measure('process_cache_size', self.process_cache.size)
 
 
 class MongoConnection(object):
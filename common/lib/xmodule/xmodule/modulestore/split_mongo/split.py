@@ -86,6 +86,7 @@ from .caching_descriptor_system import CachingDescriptorSystem
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.error_module import ErrorDescriptor
 from collections import defaultdict
@@ -824,8 +825,33 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 del self.request_cache.data.setdefault('course_cache', {})[course_version_guid]
             except KeyError:
                 pass
+            self.request_cache.data.setdefault('structure_indexes', {}).pop(course_version_guid, None)
         else:
             self.request_cache.data['course_cache'] = {}
+            self.request_cache.data['structure_indexes'] = {}
+
+    def _get_structure_index(self, course_entry):
+        """
+        Returns the :class:`StructureIndex` of the given course's structure.
+
+        The index is kept in the request cache, unless the structure is a new
+        version which is still being modified in the active bulk operation.
+        """
+        structure = course_entry.structure
+        bulk_write_record = self._get_bulk_ops_record(course_entry.course_key)
+        is_unsaved = (
+            bulk_write_record.active and
+            structure['_id'] in bulk_write_record.structures and
+            structure['_id'] not in bulk_write_record.structures_in_db
+        )
+        if self.request_cache is None or is_unsaved:
+            return StructureIndex(structure)
+
+        structure_indexes = self.request_cache.data.setdefault('structure_indexes', {})
+        structure_index = structure_indexes.get(structure['_id'])
+        if structure_index is None:
+            structure_index = structure_indexes[structure['_id']] = StructureIndex(structure)
+        return structure_index
 
     def _lookup_course(self, course_key, head_validation=True):
         """
@@ -1227,20 +1253,25 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
 
-        # No need of these caches unless include_orphans is set to False
-        path_cache = None
-        parents_cache = None
-
-        if not include_orphans:
-            path_cache = {}
-            parents_cache = self.build_block_key_to_parents_mapping(course.structure)
+        # No need of the index unless include_orphans is set to False or the
+        # blocks can be looked up by their type
+        structure_index = None
+        block_type = qualifiers.get('block_type')
+        blocks = course.structure['blocks']
+        if isinstance(block_type, six.string_types):
+            structure_index = self._get_structure_index(course)
+            candidate_ids = structure_index.get_block_keys(block_type)
+        else:
+            candidate_ids = blocks.iterkeys()
+        if not include_orphans and structure_index is None:
+            structure_index = self._get_structure_index(course)
 
-        for block_id, value in course.structure['blocks'].iteritems():
-            if _block_matches_all(value):
+        for block_id in candidate_ids:
+            if _block_matches_all(blocks[block_id]):
                 if not include_orphans:
                     if (  # pylint: disable=bad-continuation
                         block_id.type in DETACHED_XBLOCK_TYPES or
-                        self.has_path_to_root(block_id, course, path_cache, parents_cache)
+                        structure_index.has_path_to_root(block_id)
                     ):
                         items.append(block_id)
                 else:
@@ -1275,19 +1306,19 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         :param course: actual db json of course from structures
         :param path_cache: a dictionary that records which modules have a path to the root so that we don't have to
         double count modules if we're computing this for a list of modules in a course.
-        :param parents_cache: a dictionary containing mapping of block_key to list of its parents. Optionally, this
-        should be built for course structure to make this method faster.
+        :param parents_cache: a dictionary containing mapping of block_key to list of its parents. If not given,
+        the structure's cached :class:`StructureIndex` is used instead.
 
         :return Bool: whether or not component has path to the root
         """
 
+        if parents_cache is None:
+            return self._get_structure_index(course).has_path_to_root(block_key)
+
         if path_cache and block_key in path_cache:
             return path_cache[block_key]
 
-        if parents_cache is None:
-            xblock_parents = self._get_parents_from_structure(block_key, course.structure)
-        else:
-            xblock_parents = parents_cache[block_key]
+        xblock_parents = parents_cache[block_key]
 
         if len(xblock_parents) == 0 and block_key.type in ["course", "library"]:
             # Found, xblock has the path to the root
@@ -1319,14 +1350,15 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        structure_index = self._get_structure_index(course)
+        all_parent_ids = structure_index.get_parents(BlockKey.from_usage_key(locator))
 
         # Check and verify the found parent_ids are not orphans; Remove parent which has no valid path
         # to the course root
         parent_ids = [
             valid_parent
             for valid_parent in all_parent_ids
-            if self.has_path_to_root(valid_parent, course)
+            if structure_index.has_path_to_root(valid_parent)
         ]
 
         if len(parent_ids) == 0:
@@ -1350,16 +1382,11 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         detached_categories = [name for name, __ in XBlock.load_tagged_classes("detached")]
         course = self._lookup_course(course_key)
-        items = set(course.structure['blocks'].keys())
-        items.remove(course.structure['root'])
-        blocks = course.structure['blocks']
-        for block_id, block_data in blocks.iteritems():
-            items.difference_update(BlockKey(*child) for child in block_data.fields.get('children', []))
-            if block_data.block_type in detached_categories:
-                items.discard(block_id)
+        root = course.structure['root']
         return [
             course_key.make_usage_key(block_type=block_id.type, block_id=block_id.id)
-            for block_id in items
+            for block_id in self._get_structure_index(course).get_unparented()
+            if block_id != root and block_id.type not in detached_categories
         ]
 
     def get_course_index_info(self, course_key):
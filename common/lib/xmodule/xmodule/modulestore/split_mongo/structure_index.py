@@ -0,0 +1,78 @@
+"""
+Secondary indexes over the blocks of a split modulestore structure.
+"""
+from collections import defaultdict
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import iter_block_children
+
+
+# Types of the blocks which are the roots of course and library structures
+ROOT_BLOCK_TYPES = ('course', 'library')
+
+
+class StructureIndex(object):
+    """
+    Maps a structure's block types to their block keys and its blocks to their
+    parents, and records which blocks have a path to the structure's root.
+
+    The index is built in a single pass over the structure, and is never
+    updated afterwards, so it must only be kept for as long as the structure
+    it was built from is not modified. Structure versions which have been
+    saved are never modified.
+    """
+    __slots__ = ('_keys_by_type', '_parents', '_reachable', '_unparented')
+
+    def __init__(self, structure):
+        keys_by_type = defaultdict(list)
+        parents = defaultdict(list)
+        children_map = {}
+        for block_key, children in iter_block_children(structure['blocks']):
+            keys_by_type[block_key.type].append(block_key)
+            children = [BlockKey(*child) for child in children]
+            children_map[block_key] = children
+            for child_key in children:
+                parents[child_key].append(block_key)
+
+        self._keys_by_type = {block_type: tuple(keys) for block_type, keys in keys_by_type.iteritems()}
+        self._parents = {block_key: tuple(parent_keys) for block_key, parent_keys in parents.iteritems()}
+        self._unparented = frozenset(block_key for block_key in children_map if block_key not in self._parents)
+
+        # Walk down from the root blocks, which have no parents, to find all
+        # of the blocks which have a path to a root
+        reachable = set()
+        stack = [
+            block_key for block_key in self._unparented
+            if block_key.type in ROOT_BLOCK_TYPES
+        ]
+        while stack:
+            block_key = stack.pop()
+            if block_key not in reachable:
+                reachable.add(block_key)
+                stack.extend(children_map.get(block_key, ()))
+        self._reachable = frozenset(reachable)
+
+    def get_block_keys(self, block_type):
+        """
+        Returns the keys of the blocks of the given type.
+        """
+        return self._keys_by_type.get(block_type, ())
+
+    def get_parents(self, block_key):
+        """
+        Returns the keys of the blocks which have the given block as a child.
+        """
+        return self._parents.get(block_key, ())
+
+    def get_unparented(self):
+        """
+        Returns the keys of the blocks which are no block's child, including the root.
+        """
+        return self._unparented
+
+    def has_path_to_root(self, block_key):
+        """
+        Returns whether the given block is a course or library block without
+        parents, or is a descendant of one.
+        """
+        return block_key in self._reachable
@@ -0,0 +1,165 @@
+"""
+A write-only filesystem which streams the files written to it into a tar
+archive, so that courses can be exported without a copy on disk.
+"""
+import tarfile
+import time
+from tempfile import SpooledTemporaryFile
+
+from fs.base import FS, synchronize
+from fs.errors import ParentDirectoryMissingError, UnsupportedError
+from fs.memoryfs import MemoryFS
+from fs.path import iteratepath, normpath, pathsplit, relpath
+
+
+# Files up to this size are buffered in memory before being added to the
+# archive, larger ones are buffered in a temporary file.
+SPOOLED_FILE_MAX_SIZE = 1024 * 1024
+
+
+class _TarMemberFile(object):
+    """
+    A file which buffers the data written to it, and adds it to the archive
+    of its TarExportFS when closed.
+    """
+    def __init__(self, export_fs, path):
+        self._export_fs = export_fs
+        self._path = path
+        self._file = SpooledTemporaryFile(max_size=SPOOLED_FILE_MAX_SIZE)
+        self.closed = False
+
+    def write(self, data):
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
+        self._file.write(data)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def tell(self):
+        return self._file.tell()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._export_fs.add_file(self._path, self._file)
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TarExportFS(FS):
+    """
+    A write-only FS which adds the directories and files created in it to
+    a tarfile.TarFile opened for writing.
+
+    Files are added to the archive when they are closed, so that only the
+    files being written are buffered, rather than the whole export.  The
+    archive isn't closed with the FS.
+    """
+    _meta = {
+        'thread_safe': True,
+        'virtual': False,
+        'read_only': False,
+        'unicode_paths': True,
+        'case_insensitive_paths': False,
+        'network': False,
+    }
+
+    def __init__(self, tar_file):
+        """
+        Arguments:
+            tar_file (tarfile.TarFile) - The archive to add the exported
+                directories and files to.
+        """
+        super(TarExportFS, self).__init__(thread_synchronize=True)
+        self.tar_file = tar_file
+        # Keeps track of the created directories and files.
+        self._path_fs = MemoryFS()
+
+    def __str__(self):
+        return "<TarExportFS: %s>" % self.tar_file.name
+
+    def __unicode__(self):
+        return u"<TarExportFS: %s>" % self.tar_file.name
+
+    def desc(self, path):
+        return "%s in tar file %s" % (path, self.tar_file.name)
+
+    @synchronize
+    def open(self, path, mode='r', **kwargs):
+        if 'w' not in mode:
+            raise UnsupportedError('open file for reading', path=path)
+
+        path = normpath(relpath(path))
+        dirname, __ = pathsplit(path)
+        if dirname and not self._path_fs.isdir(dirname):
+            raise ParentDirectoryMissingError(path)
+
+        self._path_fs.open(path, 'w').close()
+        return _TarMemberFile(self, path)
+
+    @synchronize
+    def add_file(self, path, data_file):
+        """
+        Adds the data written to data_file to the archive as the file at
+        the given path.
+        """
+        tar_info = self._make_tar_info(path)
+        tar_info.size = data_file.tell()
+        data_file.seek(0)
+        self.tar_file.addfile(tar_info, data_file)
+
+    @synchronize
+    def makedir(self, path, recursive=False, allow_recreate=False):
+        path = normpath(relpath(path))
+        parts = iteratepath(path)
+        new_dirs = [
+            dirname for dirname in ('/'.join(parts[:index]) for index in range(1, len(parts) + 1))
+            if not self._path_fs.isdir(dirname)
+        ]
+        self._path_fs.makedir(path, recursive=recursive, allow_recreate=allow_recreate)
+
+        for dirname in new_dirs:
+            tar_info = self._make_tar_info(dirname)
+            tar_info.type = tarfile.DIRTYPE
+            tar_info.mode = 0755
+            self.tar_file.addfile(tar_info)
+
+    def isdir(self, path):
+        return self._path_fs.isdir(path)
+
+    def isfile(self, path):
+        return self._path_fs.isfile(path)
+
+    def exists(self, path):
+        return self._path_fs.exists(path)
+
+    def listdir(self, path="/", wildcard=None, full=False, absolute=False, dirs_only=False, files_only=False):
+        return self._path_fs.listdir(path, wildcard, full, absolute, dirs_only, files_only)
+
+    def getinfo(self, path):
+        return self._path_fs.getinfo(path)
+
+    @staticmethod
+    def _make_tar_info(path):
+        """
+        Returns a TarInfo for the member at the given path.
+        """
+        if isinstance(path, unicode):
+            path = path.encode('utf-8')
+        tar_info = tarfile.TarInfo(path)
+        tar_info.mtime = time.time()
+        tar_info.mode = 0644
+        return tar_info
@@ -42,7 +42,7 @@ from git.test.lib.asserts import assert_not_none
 from xmodule.x_module import XModuleMixin
 from xmodule.modulestore.mongo.base import as_draft
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
-from xmodule.modulestore.tests.utils import LocationMixin, mock_tab_from_json
+from xmodule.modulestore.tests.utils import LocationMixin, MemoryCache, mock_tab_from_json
 from xmodule.modulestore.edit_info import EditInfoMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.inheritance import InheritanceMixin
@@ -707,6 +707,58 @@ class TestMongoModuleStore(TestMongoModuleStoreBase):
         # Clean up the data so we don't break other tests which apparently expect a particular state
         self.draft_store.delete_course(course.id, self.dummy_user)
 
+    def test_incremental_metadata_inheritance_tree_update(self):
+        """
+        Test that updating a block only recomputes the inherited metadata of its subtree
+        """
+        self.draft_store.metadata_inheritance_cache_subsystem = MemoryCache()
+        self.addCleanup(setattr, self.draft_store, 'metadata_inheritance_cache_subsystem', None)
+
+        course = self.draft_store.create_course("TestX", "InheritanceTest", "1234_A1", self.dummy_user)
+        chapter = self.draft_store.create_child(self.dummy_user, course.location, "chapter")
+        sequential = self.draft_store.create_child(self.dummy_user, chapter.location, "sequential")
+        html = self.draft_store.create_child(self.dummy_user, sequential.location, "html")
+        self.addCleanup(self.draft_store.delete_course, course.id, self.dummy_user)
+
+        due = datetime(2020, 1, 1, tzinfo=UTC)
+        sequential = self.draft_store.get_item(sequential.location)
+        sequential.due = due
+        with patch.object(
+            self.draft_store, '_compute_metadata_inheritance_tree',
+            wraps=self.draft_store._compute_metadata_inheritance_tree,  # pylint: disable=protected-access
+        ) as compute_tree:
+            self.draft_store.update_item(sequential, self.dummy_user)
+            self.draft_store.update_item(self.draft_store.get_item(html.location), self.dummy_user)
+        self.assertFalse(compute_tree.called)
+
+        self.assertEqual(self.draft_store.get_item(html.location).due, due)
+        self.assertIsNone(self.draft_store.get_item(chapter.location).due)
+
+    def test_locked_metadata_inheritance_tree_update(self):
+        """
+        Test that the whole tree is recomputed while another process updates it
+        """
+        cache = MemoryCache()
+        self.draft_store.metadata_inheritance_cache_subsystem = cache
+        self.addCleanup(setattr, self.draft_store, 'metadata_inheritance_cache_subsystem', None)
+
+        course = self.draft_store.create_course("TestX", "InheritanceLockTest", "1234_A1", self.dummy_user)
+        chapter = self.draft_store.create_child(self.dummy_user, course.location, "chapter")
+        self.addCleanup(self.draft_store.delete_course, course.id, self.dummy_user)
+
+        lock_key = self.draft_store._metadata_inheritance_cache_key(course.id) + '.lock'  # pylint: disable=protected-access
+        cache.add(lock_key, True)
+        chapter = self.draft_store.get_item(chapter.location)
+        chapter.due = datetime(2020, 1, 1, tzinfo=UTC)
+        with patch.object(
+            self.draft_store, '_compute_metadata_inheritance_tree',
+            wraps=self.draft_store._compute_metadata_inheritance_tree,  # pylint: disable=protected-access
+        ) as compute_tree:
+            self.draft_store.update_item(chapter, self.dummy_user)
+        self.assertTrue(compute_tree.called)
+        # the lock is left to its holder
+        self.assertIn(lock_key, cache.data)
+
     def test_make_course_usage_key(self):
         """Test that we get back the appropriate usage key for the root of a course key."""
         course_key = CourseLocator(org="edX", course="101", run="2015")
@@ -20,6 +20,7 @@ from django.conf import settings
 if not settings.configured:
     settings.configure()
 from django.core.cache import caches, InvalidCacheBackendError
+from django.test.utils import override_settings
 
 from openedx.core.lib import tempdir
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
@@ -38,6 +39,7 @@ from xmodule.fields import Date, Timedelta
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import PROCESS_STRUCTURE_CACHE, ProcessStructureCache
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from xmodule.modulestore.tests.utils import mock_tab_from_json
@@ -993,6 +995,45 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @override_settings(COURSE_STRUCTURE_PROCESS_CACHE_SIZE=1024 * 1024)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_process_cache(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        PROCESS_STRUCTURE_CACHE.clear()
+        self.addCleanup(PROCESS_STRUCTURE_CACHE.clear)
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # the structure is still served from the process cache once it
+        # has been evicted from the django cache
+        self.cache.clear()
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+        self.assertEqual(cached_structure, not_cached_structure)
+
+        # each caller gets its own copy of the structure
+        cached_structure['blocks'].clear()
+        with check_mongo_calls(0):
+            self.assertEqual(self._get_structure(self.new_course), not_cached_structure)
+
+    def test_process_cache_eviction(self):
+        process_cache = ProcessStructureCache(max_size=10)
+        self.assertEqual(process_cache.set('a', 'aaaa'), 0)
+        self.assertEqual(process_cache.set('b', 'bbbb'), 0)
+
+        # getting 'a' makes 'b' the least recently used structure
+        self.assertEqual(process_cache.get('a'), 'aaaa')
+        self.assertEqual(process_cache.set('c', 'cccc'), 1)
+        self.assertIsNone(process_cache.get('b'))
+        self.assertEqual(process_cache.get('a'), 'aaaa')
+        self.assertEqual(process_cache.size, 8)
+
+        # data larger than the cache itself is never cached
+        self.assertEqual(process_cache.set('d', 'd' * 11), 0)
+        self.assertIsNone(process_cache.get('d'))
+        self.assertEqual(process_cache.size, 8)
+
     def test_dummy_cache(self):
         with check_mongo_calls(1):
             not_cached_structure = self._get_structure(self.new_course)
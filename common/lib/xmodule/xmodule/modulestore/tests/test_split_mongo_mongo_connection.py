@@ -1,7 +1,13 @@
 """ Test the behavior of split_mongo/MongoConnection """
+import copy
+import cPickle as pickle
 import unittest
 from mock import patch
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    LazyBlockMap, MongoConnection, iter_block_children, structure_from_mongo
+)
 from xmodule.exceptions import HeartbeatFailure
 
 
@@ -17,3 +23,60 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with self.assertRaises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+class TestStructureFromMongo(unittest.TestCase):
+    """ Test that the blocks of structures loaded from mongo are converted lazily """
+    def setUp(self):
+        super(TestStructureFromMongo, self).setUp()
+        self.structure = structure_from_mongo({
+            'root': ['course', 'course'],
+            'blocks': [
+                {
+                    'block_type': 'course',
+                    'block_id': 'course',
+                    'fields': {'children': [['chapter', 'chapter']]},
+                    'definition': 'course_definition',
+                },
+                {
+                    'block_type': 'chapter',
+                    'block_id': 'chapter',
+                    'fields': {'display_name': 'Chapter'},
+                    'definition': 'chapter_definition',
+                },
+            ],
+        })
+        self.blocks = self.structure['blocks']
+        self.course_key = BlockKey('course', 'course')
+        self.chapter_key = BlockKey('chapter', 'chapter')
+
+    def assert_loaded(self, block_key, loaded):
+        """ Assert whether the given block has been converted to BlockData """
+        self.assertEqual(isinstance(dict.__getitem__(self.blocks, block_key), BlockData), loaded)
+
+    def test_blocks_converted_on_access(self):
+        self.assertIsInstance(self.blocks, LazyBlockMap)
+        self.assertEqual(self.structure['root'], self.course_key)
+        self.assertEqual(set(self.blocks), {self.course_key, self.chapter_key})
+        self.assert_loaded(self.course_key, False)
+
+        course = self.blocks[self.course_key]
+        self.assertIsInstance(course, BlockData)
+        self.assertEqual(course.fields['children'], [self.chapter_key])
+        self.assertEqual(course.definition, 'course_definition')
+        self.assertIs(self.blocks.get(self.course_key), course)
+        self.assert_loaded(self.chapter_key, False)
+
+        self.assertEqual(
+            dict(iter_block_children(self.blocks)),
+            {self.course_key: [self.chapter_key], self.chapter_key: []},
+        )
+        self.assert_loaded(self.chapter_key, False)
+
+    def test_copies(self):
+        self.blocks[self.course_key].fields['display_name'] = 'Course'
+        for blocks in (copy.deepcopy(self.blocks), pickle.loads(pickle.dumps(self.blocks, pickle.HIGHEST_PROTOCOL))):
+            self.assertIsInstance(blocks, LazyBlockMap)
+            self.assertEqual(blocks[self.course_key].fields['display_name'], 'Course')
+            self.assertEqual(blocks, self.blocks)
+            self.assertIsNot(blocks[self.chapter_key], self.blocks[self.chapter_key])
@@ -0,0 +1,56 @@
+""" Test the secondary indexes of split_mongo structures """
+import unittest
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import structure_from_mongo
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex
+
+
+def _block(block_type, block_id, children=()):
+    """ Returns a block as stored in a structure in mongo """
+    return {
+        'block_type': block_type,
+        'block_id': block_id,
+        'fields': {'children': [list(child) for child in children]},
+        'definition': '{}_definition'.format(block_id),
+    }
+
+
+class TestStructureIndex(unittest.TestCase):
+    """ Test the StructureIndex of a structure """
+    def setUp(self):
+        super(TestStructureIndex, self).setUp()
+        self.course = BlockKey('course', 'course')
+        self.chapter = BlockKey('chapter', 'chapter')
+        self.shared = BlockKey('html', 'shared')
+        self.orphan_chapter = BlockKey('chapter', 'orphan')
+        self.orphan_child = BlockKey('html', 'orphan_child')
+        self.missing = BlockKey('html', 'missing')
+        structure = structure_from_mongo({
+            'root': list(self.course),
+            'blocks': [
+                _block('course', 'course', [self.chapter]),
+                _block('chapter', 'chapter', [self.shared, self.missing]),
+                _block('html', 'shared'),
+                _block('chapter', 'orphan', [self.shared, self.orphan_child]),
+                _block('html', 'orphan_child'),
+            ],
+        })
+        self.index = StructureIndex(structure)
+
+    def test_block_keys_by_type(self):
+        self.assertEqual(set(self.index.get_block_keys('chapter')), {self.chapter, self.orphan_chapter})
+        self.assertEqual(self.index.get_block_keys('course'), (self.course,))
+        self.assertEqual(self.index.get_block_keys('problem'), ())
+
+    def test_parents(self):
+        self.assertEqual(self.index.get_parents(self.chapter), (self.course,))
+        self.assertEqual(set(self.index.get_parents(self.shared)), {self.chapter, self.orphan_chapter})
+        self.assertEqual(self.index.get_parents(self.course), ())
+        self.assertEqual(self.index.get_unparented(), {self.course, self.orphan_chapter})
+
+    def test_has_path_to_root(self):
+        for block_key in (self.course, self.chapter, self.shared, self.missing):
+            self.assertTrue(self.index.has_path_to_root(block_key))
+        for block_key in (self.orphan_chapter, self.orphan_child):
+            self.assertFalse(self.index.has_path_to_root(block_key))
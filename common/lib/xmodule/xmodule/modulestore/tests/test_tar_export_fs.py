@@ -0,0 +1,72 @@
+"""
+Tests for tar_export_fs.py
+"""
+import tarfile
+import unittest
+from tempfile import TemporaryFile
+
+from fs.errors import ParentDirectoryMissingError, UnsupportedError
+
+from xmodule.modulestore.tar_export_fs import TarExportFS
+
+
+class TestTarExportFS(unittest.TestCase):
+    """
+    Tests for TarExportFS
+    """
+    def setUp(self):
+        super(TestTarExportFS, self).setUp()
+        self.archive = TemporaryFile()
+        self.addCleanup(self.archive.close)
+        self.tar_file = tarfile.open(fileobj=self.archive, mode='w:gz')
+        self.export_fs = TarExportFS(self.tar_file)
+
+    def read_members(self):
+        """
+        Closes the archive and returns a dict mapping the names of its
+        members to their content, or None for directories.
+        """
+        self.tar_file.close()
+        self.archive.seek(0)
+        with tarfile.open(fileobj=self.archive, mode='r:gz') as tar_file:
+            return {
+                member.name: tar_file.extractfile(member).read() if member.isfile() else None
+                for member in tar_file.getmembers()
+            }
+
+    def test_export(self):
+        course_fs = self.export_fs.makeopendir('course')
+        with course_fs.open('course.xml', 'w') as course_xml:
+            course_xml.write('<course/>')
+        course_fs.makedir('static/images', recursive=True, allow_recreate=True)
+        with course_fs.open('static/images/image.jpg', 'wb') as image:
+            image.write(b'a' * 100)
+            image.write(b'b' * 100)
+        with course_fs.open(u'static/t\xe9st.txt', 'w') as text:
+            text.write(u't\xe9st')
+
+        self.assertTrue(course_fs.isfile('course.xml'))
+        self.assertTrue(course_fs.isdir('static/images'))
+        self.assertEqual(sorted(course_fs.listdir('static')), [u'images', u't\xe9st.txt'])
+        self.assertEqual(self.read_members(), {
+            'course': None,
+            'course/course.xml': '<course/>',
+            'course/static': None,
+            'course/static/images': None,
+            'course/static/images/image.jpg': b'a' * 100 + b'b' * 100,
+            u'course/static/t\xe9st.txt'.encode('utf-8'): u't\xe9st'.encode('utf-8'),
+        })
+
+    def test_directories_added_once(self):
+        self.export_fs.makedir('policies')
+        self.export_fs.makeopendir('policies')
+        self.export_fs.makedir('policies/course', allow_recreate=True)
+        self.assertEqual(self.read_members(), {'policies': None, 'policies/course': None})
+
+    def test_missing_parent_directory(self):
+        with self.assertRaises(ParentDirectoryMissingError):
+            self.export_fs.open('static/image.jpg', 'wb')
+
+    def test_read_unsupported(self):
+        with self.assertRaises(UnsupportedError):
+            self.export_fs.open('course.xml', 'r')
@@ -216,6 +216,23 @@ class MemoryCache(object):
         """
         self.data[key] = value
 
+    def add(self, key, value, timeout=None):  # pylint: disable=unused-argument
+        """
+        Set a key in the cache, unless it's already set.
+
+        Returns whether the key was set.
+        """
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    def delete(self, key):
+        """
+        Remove a key from the cache.
+        """
+        self.data.pop(key, None)
+
 
 class MongoContentstoreBuilder(object):
     """
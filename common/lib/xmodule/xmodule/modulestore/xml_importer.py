@@ -20,8 +20,10 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, a)   |  (a, a) | (x, a) | (x, x) | (x, y) | (a, x)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
+import hashlib
 import logging
 from abc import abstractmethod
+from multiprocessing.pool import ThreadPool
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
@@ -36,7 +38,7 @@ from xblock.runtime import KvsFieldData, DictKeyValueStore
 from xmodule.x_module import XModuleDescriptor, XModuleMixin
 from opaque_keys.edx.keys import UsageKey
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
-from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.content import StaticContent, StaticContentStream
 from .inheritance import own_metadata
 from xmodule.errortracker import make_error_tracker
 from .store_utilities import rewrite_nonportable_content_links
@@ -55,10 +57,110 @@ from xmodule.util.misc import escape_invalid_characters
 log = logging.getLogger(__name__)
 
 
+# Static files larger than this are streamed into the content store
+# instead of being read into memory.
+STATIC_CONTENT_STREAM_THRESHOLD = 1024 * 1024
+
+# The number of threads which generate thumbnails and save static files.
+STATIC_CONTENT_IMPORT_WORKERS = 4
+
+# The number of imported static files between progress reports.
+STATIC_CONTENT_PROGRESS_INTERVAL = 50
+
+
+def _get_stored_assets(static_content_store, target_id):
+    """
+    Returns a dict mapping the asset keys of the static content already
+    stored for target_id to their content store attributes.
+    """
+    assets, __ = static_content_store.get_all_content_for_course(target_id)
+    return {asset['asset_key']: asset for asset in assets}
+
+
+def _file_digest(content_path):
+    """
+    Returns the md5 hex digest of the given file, as computed by GridFS.
+    """
+    digest = hashlib.md5()
+    with open(content_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(STATIC_CONTENT_STREAM_THRESHOLD), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_unchanged_asset(stored_asset, content_path, displayname, mime_type, import_path, locked):
+    """
+    Returns whether the stored asset has the same attributes and content
+    as the static file to import.
+    """
+    return (
+        stored_asset is not None and
+        stored_asset.get('displayname') == displayname and
+        stored_asset.get('contentType') == mime_type and
+        stored_asset.get('import_path') == import_path and
+        stored_asset.get('locked', False) == locked and
+        stored_asset.get('md5') == _file_digest(content_path)
+    )
+
+
+def _import_static_file(static_content_store, stored_asset, content_path, asset_key, displayname, mime_type,
+                        import_path, locked):
+    """
+    Saves a static file, and its thumbnail, into the content store,
+    unless the stored asset is identical.
+
+    Returns True if the file was saved, False if it was skipped.
+    """
+    if _is_unchanged_asset(stored_asset, content_path, displayname, mime_type, import_path, locked):
+        log.debug('skipping unchanged static content %s...', content_path)
+        return False
+
+    with open(content_path, 'rb') as f:
+        length = os.fstat(f.fileno()).st_size
+        if length > STATIC_CONTENT_STREAM_THRESHOLD:
+            content = StaticContentStream(
+                asset_key, displayname, mime_type, f,
+                import_path=import_path, length=length, locked=locked
+            )
+            tempfile_path = content_path
+        else:
+            content = StaticContent(
+                asset_key, displayname, mime_type, f.read(),
+                import_path=import_path, locked=locked
+            )
+            tempfile_path = None
+
+        # first let's save a thumbnail so we can get back a thumbnail location
+        thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(
+            content, tempfile_path=tempfile_path
+        )
+
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
+
+        # then commit the content
+        try:
+            static_content_store.save(content)
+        except Exception as err:
+            log.exception(u'Error importing {0}, error={1}'.format(
+                import_path, err
+            ))
+    return True
+
+
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
-
+        target_id, subpath='static', verbose=False, progress_callback=None):
+    """
+    Imports the static files of course_data_path/subpath into the content
+    store, and returns a dict mapping their paths to their asset keys.
+
+    Files are saved, and their thumbnails generated, by a pool of
+    STATIC_CONTENT_IMPORT_WORKERS threads.  Files whose content and
+    attributes match those of the stored asset are skipped.  If given,
+    progress_callback is called with the number of processed files and the
+    total number of files every STATIC_CONTENT_PROGRESS_INTERVAL files.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -66,7 +168,7 @@ def import_static_content(
     try:
         with open(course_data_path / 'policies/assets.json') as f:
             policy = json.load(f)
-    except (IOError, ValueError) as err:
+    except (IOError, ValueError):
         # xml backed courses won't have this file, only exported courses;
         # so, its absence is not really an exception.
         policy = {}
@@ -77,6 +179,7 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
+    content_paths = []
     for dirname, _, filenames in os.walk(static_dir):
         for filename in filenames:
 
@@ -87,20 +190,21 @@ def import_static_content(
                     log.debug('skipping static content %s...', content_path)
                 continue
 
+            if filename.startswith('._') and not os.access(content_path, os.R_OK):
+                # OS X "companion files". See
+                # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                continue
+
+            content_paths.append((content_path, filename))
+
+    stored_assets = _get_stored_assets(static_content_store, target_id)
+    pool = ThreadPool(STATIC_CONTENT_IMPORT_WORKERS)
+    try:
+        results = []
+        for content_path, filename in content_paths:
             if verbose:
                 log.debug('importing static content %s...', content_path)
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
-                    continue
-                # Not a 'hidden file', then re-raise exception
-                raise
-
             # strip away leading path from the name
             fullname_with_subpath = content_path.replace(static_dir, '')
             if fullname_with_subpath.startswith('/'):
@@ -120,29 +224,31 @@ def import_static_content(
             # Check extracted contentType in list of all valid mimetypes
             if not mime_type or mime_type not in mimetypes_list:
                 mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
-
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
-
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
+            results.append(pool.apply_async(_import_static_file, (
+                static_content_store, stored_assets.get(asset_key), content_path, asset_key, displayname,
+                mime_type, fullname_with_subpath, locked,
+            )))
 
             # store the remapping information which will be needed
             # to subsitute in the module data
             remap_dict[fullname_with_subpath] = asset_key
 
+        skipped = 0
+        for index, result in enumerate(results, 1):
+            # Re-raises any error, e.g. an unreadable file, of the worker.
+            if not result.get():
+                skipped += 1
+            if progress_callback and (index % STATIC_CONTENT_PROGRESS_INTERVAL == 0 or index == len(results)):
+                progress_callback(index, len(results))
+    finally:
+        pool.terminate()
+        pool.join()
+
+    log.info(
+        u'Imported %d static files from %s, skipped %d unchanged files',
+        len(results) - skipped, static_dir, skipped,
+    )
     return remap_dict
 
 
@@ -178,6 +284,9 @@ class ImportManager(object):
             Otherwise, it throws an InvalidLocationError if the courselike does not exist.
 
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
+
+        progress_callback: if given, called with the number of imported static files and the total number
+            of static files, as the static files are imported (see import_static_content)
     """
     store_class = XMLModuleStore
 
@@ -187,7 +296,7 @@ class ImportManager(object):
             load_error_modules=True, static_content_store=None,
             target_id=None, verbose=False,
             do_import_static=True, create_if_not_present=False,
-            raise_on_failure=False
+            raise_on_failure=False, progress_callback=None
     ):
         self.store = store
         self.user_id = user_id
@@ -200,6 +309,7 @@ class ImportManager(object):
         self.do_import_static = do_import_static
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.progress_callback = progress_callback
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -228,7 +338,8 @@ class ImportManager(object):
             # first pass to find everything in /static/
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath='static', verbose=self.verbose
+                dest_id, subpath='static', verbose=self.verbose,
+                progress_callback=self.progress_callback
             )
 
         elif self.verbose and not self.do_import_static:
@@ -251,7 +362,8 @@ class ImportManager(object):
         if os.path.exists(data_path / simport):
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath=simport, verbose=self.verbose
+                dest_id, subpath=simport, verbose=self.verbose,
+                progress_callback=self.progress_callback
             )
 
     def import_asset_metadata(self, data_dir, course_id):
@@ -1,8 +1,10 @@
 """
 Tests that check that we ignore the appropriate files when importing courses.
 """
+import hashlib
 import unittest
-from mock import Mock
+from mock import Mock, patch
+from xmodule.contentstore.content import StaticContentStream
 from xmodule.modulestore.xml_importer import import_static_content
 from opaque_keys.edx.locator import CourseLocator
 from xmodule.tests import DATA_DIR
@@ -15,6 +17,7 @@ class IgnoredFilesTestCase(unittest.TestCase):
         course_id = CourseLocator("edX", "tilde", "Fall_2012")
         content_store = Mock()
         content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store.get_all_content_for_course.return_value = ([], 0)
         import_static_content(course_dir, content_store, course_id)
         saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
         name_val = {sc.name: sc.data for sc in saved_static_content}
@@ -30,6 +33,7 @@ class IgnoredFilesTestCase(unittest.TestCase):
         course_id = CourseLocator("edX", "dot-underscore", "2014_Fall")
         content_store = Mock()
         content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store.get_all_content_for_course.return_value = ([], 0)
         import_static_content(course_dir, content_store, course_id)
         saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
         name_val = {sc.name: sc.data for sc in saved_static_content}
@@ -39,3 +43,58 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+
+class ImportStaticContentTestCase(unittest.TestCase):
+    "Tests for the import of static content"
+    def setUp(self):
+        super(ImportStaticContentTestCase, self).setUp()
+        self.course_dir = DATA_DIR / "tilde"
+        self.course_id = CourseLocator("edX", "tilde", "Fall_2012")
+        self.content_store = Mock()
+        self.content_store.generate_thumbnail.return_value = (None, None)
+        self.content_store.get_all_content_for_course.return_value = ([], 0)
+
+    def saved_names(self):
+        """
+        Returns the names of the saved static contents.
+        """
+        return [call[0][0].name for call in self.content_store.save.call_args_list]
+
+    def test_skip_unchanged_assets(self):
+        with open(self.course_dir / "static" / "example.txt", 'rb') as f:
+            digest = hashlib.md5(f.read()).hexdigest()
+        stored_asset = {
+            'asset_key': self.course_id.make_asset_key('asset', 'example.txt'),
+            'displayname': 'example.txt',
+            'contentType': 'text/plain',
+            'import_path': 'example.txt',
+            'md5': digest,
+        }
+        self.content_store.get_all_content_for_course.return_value = ([stored_asset], 1)
+        import_static_content(self.course_dir, self.content_store, self.course_id)
+        self.assertNotIn("example.txt", self.saved_names())
+
+        stored_asset['md5'] = 'changed'
+        import_static_content(self.course_dir, self.content_store, self.course_id)
+        self.assertIn("example.txt", self.saved_names())
+
+    @patch('xmodule.modulestore.xml_importer.STATIC_CONTENT_STREAM_THRESHOLD', 1)
+    def test_stream_large_files(self):
+        import_static_content(self.course_dir, self.content_store, self.course_id)
+        saved_static_content = [call[0][0] for call in self.content_store.save.call_args_list]
+        self.assertTrue(saved_static_content)
+        for static_content in saved_static_content:
+            self.assertIsInstance(static_content, StaticContentStream)
+        for call in self.content_store.generate_thumbnail.call_args_list:
+            self.assertIsNotNone(call[1]['tempfile_path'])
+
+    @patch('xmodule.modulestore.xml_importer.STATIC_CONTENT_PROGRESS_INTERVAL', 1)
+    def test_progress_callback(self):
+        progress_callback = Mock()
+        import_static_content(self.course_dir, self.content_store, self.course_id, progress_callback=progress_callback)
+        total = len(self.content_store.save.call_args_list)
+        self.assertEqual(
+            [call[0] for call in progress_callback.call_args_list],
+            [(index, total) for index in range(1, total + 1)],
+        )
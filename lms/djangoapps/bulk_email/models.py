@@ -2,6 +2,8 @@
 Models for bulk email
 """
 import logging
+import re
+from string import Formatter
 
 import markupsafe
 from config_models.models import ConfigurationModel
@@ -17,7 +19,7 @@ from openedx.core.djangoapps.xmodule_django.models import CourseKeyField
 from openedx.core.lib.html_to_text import html_to_text
 from openedx.core.lib.mail_utils import wrap_message
 from student.roles import CourseInstructorRole, CourseStaffRole
-from util.keyword_substitution import substitute_keywords_with_data
+from util.keyword_substitution import anonymous_id_from_user_id, substitute_keywords, substitute_keywords_with_data
 from util.query import use_read_replica_if_available
 
 log = logging.getLogger(__name__)
@@ -319,6 +321,89 @@ class Optout(models.Model):
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
+# Keys of the email context whose values differ between the recipients of an email.
+RECIPIENT_CONTEXT_KEYS = ('name', 'email', 'user_id')
+
+# Slots for recipient values in compiled messages are the name of the value
+# between two NUL characters, which can't otherwise appear in an email.
+RECIPIENT_SLOT_DELIMITER = u'\x00'
+RECIPIENT_SLOT_PATTERN = re.compile(u'\x00(\\w+)\x00')
+
+
+def _recipient_slot(name):
+    """
+    Returns the slot for the recipient value with the given name.
+    """
+    return u'{delimiter}{name}{delimiter}'.format(delimiter=RECIPIENT_SLOT_DELIMITER, name=name)
+
+
+class CompiledCourseEmailMessage(object):
+    """
+    A course email message which has been rendered once for all of its
+    recipients, as lines of static text and lines with slots for the
+    values of each recipient.
+
+    Rendering it for a recipient only substitutes and wraps the lines which
+    hold slots, with the same result as rendering the whole template for
+    that recipient.
+    """
+    def __init__(self, lines, escape_values):
+        """
+        Arguments:
+            lines (list): (text, has_slots) pairs.  Text without slots is
+                already wrapped.
+            escape_values (bool): Whether recipient values are HTML-escaped.
+        """
+        self._lines = lines
+        self._escape_values = escape_values
+
+    def render(self, recipient_context):
+        """
+        Returns the message for the recipient with the given name, email and
+        user_id values.
+        """
+        values = {}
+
+        def _get_value(match):
+            """
+            Returns the recipient value for the matched slot.
+            """
+            name = match.group(1)
+            if name not in values:
+                if name == 'anonymous_user_id':
+                    value = anonymous_id_from_user_id(recipient_context['user_id'])
+                else:
+                    value = recipient_context[name]
+                    if self._escape_values and isinstance(value, basestring):
+                        value = markupsafe.escape(value)
+                values[name] = u'{}'.format(value)
+            return values[name]
+
+        return u'\n'.join(
+            wrap_message(RECIPIENT_SLOT_PATTERN.sub(_get_value, text)) if has_slots else text
+            for text, has_slots in self._lines
+        )
+
+
+class UncompiledCourseEmailMessage(object):
+    """
+    A course email message which is rendered in full for each recipient,
+    for templates which can't be compiled.
+    """
+    def __init__(self, render_fcn, message_body, context):
+        self._render_fcn = render_fcn
+        self._message_body = message_body
+        self._context = context
+
+    def render(self, recipient_context):
+        """
+        Returns the message for the recipient with the given name, email and
+        user_id values.
+        """
+        context = dict(self._context)
+        context.update(recipient_context)
+        return self._render_fcn(self._message_body, context)
+
 
 class CourseEmailTemplate(models.Model):
     """
@@ -382,6 +467,85 @@ class CourseEmailTemplate(models.Model):
         # finally, return the result, after wrapping long lines and without converting to an encoded byte array.
         return wrap_message(result)
 
+    @staticmethod
+    def _is_compilable(format_string, message_body, context):
+        """
+        Returns whether a message can be compiled from the given template,
+        message body and context shared by all recipients.
+
+        Recipient values can only be inserted into slots if the template
+        formats them as they are, and slots can only be told apart from the
+        rest of the message if it has no NUL characters.
+        """
+        texts = [format_string, message_body]
+        texts.extend(value for value in context.itervalues() if isinstance(value, basestring))
+        if any(RECIPIENT_SLOT_DELIMITER in text for text in texts):
+            return False
+
+        for __, field_name, format_spec, conversion in Formatter().parse(format_string):
+            if field_name is None:
+                continue
+            key = re.split(r'[.[]', field_name, 1)[0]
+            if key in RECIPIENT_CONTEXT_KEYS and (key != field_name or format_spec or conversion):
+                return False
+        return True
+
+    @staticmethod
+    def _compile(format_string, message_body, context, escape_values):
+        """
+        Returns a CompiledCourseEmailMessage with the same output as _render
+        for each recipient, given the `context` shared by all recipients.
+        """
+        slot_context = dict(context)
+        slot_context.update((key, _recipient_slot(key)) for key in RECIPIENT_CONTEXT_KEYS)
+
+        # Substitute all %%-encoded keywords in the message body, leaving
+        # slots for the ones which depend on the recipient.  The recipients'
+        # user_id is always set, so this matches substitute_keywords_with_data.
+        if 'course_id' in context and context.get('course_title') is not None:
+            message_body = message_body.replace('%%USER_ID%%', _recipient_slot('anonymous_user_id'))
+            message_body = substitute_keywords(message_body, None, slot_context)
+
+        result = format_string.format(**slot_context)
+        message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        result = result.replace(message_body_tag, message_body, 1)
+
+        # wrap_message wraps each line separately, so the lines without
+        # slots can be wrapped once for all recipients.
+        lines = [
+            (line, True) if RECIPIENT_SLOT_DELIMITER in line else (wrap_message(line), False)
+            for line in result.split('\n')
+        ]
+        return CompiledCourseEmailMessage(lines, escape_values)
+
+    def compile_plaintext(self, plaintext, context):
+        """
+        Create plain text message for all recipients of an email.
+
+        Returns an object whose render method, given a recipient's name, email
+        and user_id, returns the same message as render_plaintext given the
+        provided `context` dict updated with the recipient's values.
+        """
+        if not CourseEmailTemplate._is_compilable(self.plain_template, plaintext, context):
+            return UncompiledCourseEmailMessage(self.render_plaintext, plaintext, context)
+        return CourseEmailTemplate._compile(self.plain_template, plaintext, context, escape_values=False)
+
+    def compile_htmltext(self, htmltext, context):
+        """
+        Create HTML text message for all recipients of an email.
+
+        Returns an object whose render method, given a recipient's name, email
+        and user_id, returns the same message as render_htmltext given the
+        provided `context` dict updated with the recipient's values.
+        """
+        if not CourseEmailTemplate._is_compilable(self.html_template, htmltext, context):
+            return UncompiledCourseEmailMessage(self.render_htmltext, htmltext, context)
+        context = {
+            key: markupsafe.escape(value) if isinstance(value, basestring) else value
+            for key, value in context.iteritems()
+        }
+        return CourseEmailTemplate._compile(self.html_template, htmltext, context, escape_values=True)
+
     def render_plaintext(self, plaintext, context):
         """
         Create plain text message.
@@ -429,6 +593,15 @@ class CourseAuthorization(models.Model):
         except cls.DoesNotExist:
             return False
 
+    @classmethod
+    def instructor_email_enabled_for_courses(cls, course_ids):
+        """
+        Returns the set of the given course ids for which email is enabled.
+        """
+        return frozenset(
+            record.course_id for record in cls.objects.filter(course_id__in=course_ids, email_enabled=True)
+        )
+
     def __unicode__(self):
         not_en = "Not "
         if self.email_enabled:
@@ -470,6 +643,20 @@ class BulkEmailFlag(ConfigurationModel):
         else:  # implies enabled == True and require_course_email == False, so email is globally enabled
             return True
 
+    @classmethod
+    def courses_with_feature_enabled(cls, course_ids):
+        """
+        Returns the set of the given course ids for which the bulk email
+        feature is available, as determined by feature_enabled, with at most
+        one query for the course-specific authorizations.
+        """
+        if not BulkEmailFlag.is_enabled():
+            return frozenset()
+        elif BulkEmailFlag.current().require_course_email_auth:
+            return CourseAuthorization.instructor_email_enabled_for_courses(course_ids)
+        else:
+            return frozenset(course_ids)
+
     class Meta(object):
         app_label = "bulk_email"
 
@@ -7,9 +7,12 @@ import json
 import logging
 import random
 import re
+import sys
 from collections import Counter
+from Queue import Queue
 from smtplib import SMTPConnectError, SMTPDataError, SMTPException, SMTPServerDisconnected
-from time import sleep
+from threading import Thread
+from time import sleep, time
 
 from boto.exception import AWSConnectionError
 from boto.ses.exceptions import (
@@ -419,6 +422,167 @@ def _get_source_address(course_id, course_title, course_language, truncate=True)
     return from_addr
 
 
+def _is_single_email_failure(exc):
+    """
+    Returns whether the given exception, raised while sending a message to a
+    single recipient, only means that the message can't be sent to that
+    recipient.  Other exceptions cause the whole subtask to be retried or to fail.
+    """
+    if isinstance(exc, SMTPDataError):
+        # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
+        return not 400 <= exc.smtp_code < 500
+    return isinstance(exc, SINGLE_EMAIL_FAILURE_ERRORS)
+
+
+def _send_message(connection, email_msg, course_title):
+    """
+    Sends the given message over the given connection.
+
+    Returns the exception raised while sending it, or None if it was sent.
+    """
+    try:
+        with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
+            connection.send_messages([email_msg])
+    except Exception as exc:  # pylint: disable=broad-except
+        return exc
+    return None
+
+
+def _log_connection_throughput(task_id, connection_num, num_sent, elapsed_seconds, course_title):
+    """
+    Logs and records the number of messages sent per second over a connection.
+    """
+    throughput = num_sent / elapsed_seconds if elapsed_seconds else 0.0
+    log.info(
+        "BulkEmail ==> SubTask: %s, Connection: %s, Messages sent: %s in %.3f seconds (%.1f/s)",
+        task_id,
+        connection_num,
+        num_sent,
+        elapsed_seconds,
+        throughput
+    )
+    if num_sent:
+        dog_stats_api.histogram('course_email.connection.throughput', throughput, tags=[_statsd_tag(course_title)])
+
+
+def _send_messages_sequentially(task_id, connection, messages, course_title):
+    """
+    Sends the given (recipient_num, recipient, email_msg) messages one by one
+    over the given connection, generating (recipient_num, recipient, exception)
+    for each of them, where the exception is None if the message was sent.
+
+    Stops after the first exception which isn't a single email failure.
+    """
+    num_sent = 0
+    elapsed_seconds = 0.0
+    try:
+        for recipient_num, recipient, email_msg in messages:
+            start_time = time()
+            exc = _send_message(connection, email_msg, course_title)
+            elapsed_seconds += time() - start_time
+            num_sent += 1
+            yield recipient_num, recipient, exc
+            if exc is not None and not _is_single_email_failure(exc):
+                return
+    finally:
+        _log_connection_throughput(task_id, 1, num_sent, elapsed_seconds, course_title)
+
+
+class PipelinedEmailSender(object):
+    """
+    Sends messages over several SMTP connections at once, with one thread per
+    connection, while the next messages are being rendered.
+
+    Rendering, and any other database access, is left to the calling thread.
+    The sending threads only send already built messages.
+    """
+    # Number of messages waiting to be sent for each connection, so that a
+    # connection never waits for the next message to be rendered.
+    MESSAGES_PER_CONNECTION = 2
+
+    def __init__(self, task_id, connections, course_title):
+        self.task_id = task_id
+        self.connections = connections
+        self.course_title = course_title
+
+    def send_messages(self, messages):
+        """
+        Sends the given (recipient_num, recipient, email_msg) messages,
+        generating (recipient_num, recipient, exception) for each of them in
+        the order in which they were sent, where the exception is None if the
+        message was sent.
+
+        Stops sending new messages after the first exception which isn't a
+        single email failure, or which is raised by `messages`, but still
+        generates the results of the messages which were already being sent.
+        """
+        pending_messages = Queue()
+        results = Queue()
+        threads = [
+            Thread(target=self._send_from_queue, args=(connection_num, connection, pending_messages, results))
+            for connection_num, connection in enumerate(self.connections, start=1)
+        ]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        max_in_flight = len(self.connections) * self.MESSAGES_PER_CONNECTION
+        messages = iter(messages)
+        num_in_flight = 0
+        stopped = False
+        messages_exc_info = None
+        try:
+            while True:
+                while not stopped and num_in_flight < max_in_flight:
+                    try:
+                        message = next(messages)
+                    except StopIteration:
+                        stopped = True
+                    except Exception:  # pylint: disable=broad-except
+                        messages_exc_info = sys.exc_info()
+                        stopped = True
+                    else:
+                        pending_messages.put(message)
+                        num_in_flight += 1
+
+                if not num_in_flight:
+                    break
+
+                result = results.get()
+                num_in_flight -= 1
+                exc = result[2]
+                if exc is not None and not _is_single_email_failure(exc):
+                    stopped = True
+                yield result
+        finally:
+            for __ in threads:
+                pending_messages.put(None)
+            for thread in threads:
+                thread.join()
+
+        if messages_exc_info is not None:
+            raise messages_exc_info[0], messages_exc_info[1], messages_exc_info[2]
+
+    def _send_from_queue(self, connection_num, connection, pending_messages, results):
+        """
+        Sends the messages in the pending_messages queue over the given
+        connection until it gets None, putting their results in the results queue.
+        """
+        num_sent = 0
+        elapsed_seconds = 0.0
+        while True:
+            message = pending_messages.get()
+            if message is None:
+                break
+            recipient_num, recipient, email_msg = message
+            start_time = time()
+            exc = _send_message(connection, email_msg, self.course_title)
+            elapsed_seconds += time() - start_time
+            num_sent += 1
+            results.put((recipient_num, recipient, exc))
+        _log_connection_throughput(self.task_id, connection_num, num_sent, elapsed_seconds, self.course_title)
+
+
 def _send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status):
     """
     Performs the email sending task.
@@ -494,51 +658,56 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+    connections = []
     try:
-        connection = get_connection()
-        connection.open()
-
-        # Define context values to use in all course emails:
-        email_context = {'name': '', 'email': ''}
+        # Only send over several connections at once while the task isn't being rate-limited.
+        num_connections = 1 if subtask_status.retried_nomax > 0 else settings.BULK_EMAIL_CONNECTIONS_PER_TASK
+        for __ in range(max(num_connections, 1)):
+            connection = get_connection()
+            connections.append(connection)
+            connection.open()
+
+        # Define context values to use in all course emails, and render the
+        # parts of the messages which are the same for all recipients once:
+        email_context = {'course_id': course_email.course_id}
         email_context.update(global_email_context)
+        plaintext_template = course_email_template.compile_plaintext(course_email.text_message, email_context)
+        html_template = course_email_template.compile_htmltext(course_email.html_message, email_context)
+
+        def _generate_messages():
+            """
+            Generates (recipient_num, recipient, email_msg) for each recipient
+            in to_list, starting from the end of the list.
+            """
+            for recipient_num, current_recipient in enumerate(reversed(to_list), start=1):
+                email = current_recipient['email']
+
+                # Construct message content using templates and user-specific values:
+                recipient_context = {
+                    'name': current_recipient['profile__name'],
+                    'email': email,
+                    'user_id': current_recipient['pk'],
+                }
+                plaintext_msg = plaintext_template.render(recipient_context)
+                html_msg = html_template.render(recipient_context)
+
+                # Create email:
+                email_msg = EmailMultiAlternatives(
+                    course_email.subject,
+                    plaintext_msg,
+                    from_addr,
+                    [email]
+                )
+                email_msg.attach_alternative(html_msg, 'text/html')
 
-        while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
-            # That way, the to_list will always contain the recipients remaining to be emailed.
-            # This is convenient for retries, which will need to send to those who haven't
-            # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                course_email.subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
-
-            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
-            # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
-                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+                # Throttle if we have gotten the rate limiter.  This is not very high-tech,
+                # but if a task has been retried for rate-limiting reasons, then we sleep
+                # for a period of time between all emails within this task.  Choice of
+                # the value depends on the number of workers that might be sending email in
+                # parallel, and what the SES throttle rate is.
+                if subtask_status.retried_nomax > 0:
+                    sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
 
-            try:
                 log.info(
                     "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
                     Recipient name: %s, Email address: %s",
@@ -550,26 +719,40 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
                     current_recipient['profile__name'],
                     email
                 )
-                with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
-                    connection.send_messages([email_msg])
-
-            except SMTPDataError as exc:
-                # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
-                else:
+                yield recipient_num, current_recipient, email_msg
+
+        if len(connections) > 1:
+            results = PipelinedEmailSender(task_id, connections, course_title).send_messages(_generate_messages())
+        else:
+            results = _send_messages_sequentially(task_id, connections[0], _generate_messages(), course_title)
+
+        # Recipients are only removed from the to_list once they have been processed,
+        # so that the to_list always contains the recipients remaining to be emailed.
+        # This is convenient for retries, which will need to send to those who haven't
+        # yet been emailed, but not send to those who have already been sent to.
+        retry_exc = None
+        processed_recipient_nums = set()
+        try:
+            for recipient_num, current_recipient, exc in results:
+                email = current_recipient['email']
+
+                if isinstance(exc, SMTPDataError):
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    if not _is_single_email_failure(exc):
+                        # This will cause the outer handler to catch the exception and retry the entire task,
+                        # once the results of the messages which were already being sent are recorded.
+                        retry_exc = retry_exc or exc
+                        continue
                     # This will fall through and not retry the message.
                     log.warning(
                         'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
@@ -585,47 +768,59 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
                     dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
                     subtask_status.increment(failed=1)
 
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
-                    EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email,
-                    exc
-                )
-                dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                subtask_status.increment(failed=1)
+                elif isinstance(exc, SINGLE_EMAIL_FAILURE_ERRORS):
+                    # This will fall through and not retry the message.
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
+                        EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email,
+                        exc
+                    )
+                    dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
+                    subtask_status.increment(failed=1)
 
-            else:
-                total_recipients_successful += 1
-                log.info(
-                    "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s,",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info('Email with id %s sent to %s', email_id, email)
-                else:
-                    log.debug('Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
+                elif exc is not None:
+                    # Any other error is handled by the outer handlers, like the SMTPDataErrors above.
+                    retry_exc = retry_exc or exc
+                    continue
 
-            # Pop the user that was emailed off the end of the list only once they have
-            # successfully been processed.  (That way, if there were a failure that
-            # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
+                else:
+                    total_recipients_successful += 1
+                    log.info(
+                        "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s,",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
+                    if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                        log.info('Email with id %s sent to %s', email_id, email)
+                    else:
+                        log.debug('Email with id %s sent to %s', email_id, email)
+                    subtask_status.increment(succeeded=1)
+
+                recipients_info[email] += 1
+                processed_recipient_nums.add(recipient_num)
+        finally:
+            results.close()
+            num_recipients = len(to_list)
+            to_list[:] = [
+                recipient for index, recipient in enumerate(to_list)
+                if num_recipients - index not in processed_recipient_nums
+            ]
+
+        if retry_exc is not None:
+            raise retry_exc
 
         log.info(
             "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
@@ -706,7 +901,8 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        for connection in connections:
+            connection.close()
 
 
 def _get_current_task():
@@ -14,6 +14,7 @@ from bulk_email.models import (
     SEND_TO_COHORT,
     SEND_TO_STAFF,
     SEND_TO_TRACK,
+    RECIPIENT_CONTEXT_KEYS,
     BulkEmailFlag,
     CourseAuthorization,
     CourseEmail,
@@ -223,6 +224,37 @@ class CourseEmailTemplateTest(TestCase):
         self.assertIn(context['course_title'], message)
         self.assertIn(context['name'], message)
 
+    def _assert_compiled_messages_match(self, template, message_body, context):
+        """
+        Assert that the messages compiled from the template render the same
+        messages as the template itself.
+        """
+        shared_context = {key: value for key, value in context.iteritems() if key not in RECIPIENT_CONTEXT_KEYS}
+        recipient_context = {key: context[key] for key in RECIPIENT_CONTEXT_KEYS}
+        self.assertEqual(
+            template.compile_htmltext(message_body, shared_context).render(recipient_context),
+            template.render_htmltext(message_body, dict(context)),
+        )
+        self.assertEqual(
+            template.compile_plaintext(message_body, shared_context).render(recipient_context),
+            template.render_plaintext(message_body, dict(context)),
+        )
+
+    def test_compiled_messages(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._add_xss_fields(self._get_sample_html_context())
+        context['user_id'] = UserFactory.create().id
+        message_body = u"Dear %%USER_FULLNAME%% (%%USER_ID%%), thanks for enrolling in %%COURSE_DISPLAY_NAME%%.\n"
+        self._assert_compiled_messages_match(template, message_body + u"Long line " * 200, context)
+
+    def test_compiled_messages_with_formatted_recipient_values(self):
+        template = CourseEmailTemplate(
+            html_template=u"<p>{name!r}</p>{{message_body}}",
+            plain_template=u"{email:>40}\n{{message_body}}",
+        )
+        context = self._add_xss_fields(self._get_sample_html_context())
+        self._assert_compiled_messages_match(template, u"Dear %%USER_FULLNAME%%.", context)
+
 
 @attr(shard=1)
 class CourseAuthorizationTest(TestCase):
@@ -270,3 +302,14 @@ class CourseAuthorizationTest(TestCase):
 
         # Now, course should STILL be authorized!
         self.assertTrue(BulkEmailFlag.feature_enabled(course_id))
+
+    def test_courses_with_feature_enabled(self):
+        course_ids = [CourseKey.from_string('abc/123/doremi'), CourseKey.from_string('abc/456/doremi')]
+        CourseAuthorization.objects.create(course_id=course_ids[0], email_enabled=True)
+        self.assertEqual(BulkEmailFlag.courses_with_feature_enabled(course_ids), frozenset())
+
+        BulkEmailFlag.objects.create(enabled=True, require_course_email_auth=True)
+        self.assertEqual(BulkEmailFlag.courses_with_feature_enabled(course_ids), frozenset(course_ids[:1]))
+
+        BulkEmailFlag.objects.create(enabled=True, require_course_email_auth=False)
+        self.assertEqual(BulkEmailFlag.courses_with_feature_enabled(course_ids), frozenset(course_ids))
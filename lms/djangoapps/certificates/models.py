@@ -503,6 +503,23 @@ def certificate_status_for_student(student, course_id):
     return certificate_status(generated_certificate)
 
 
+def certificate_statuses_for_student(student, course_ids):
+    """
+    Returns a dictionary mapping each of the given course ids to the
+    student's certificate status in that course, as returned by
+    certificate_status_for_student, retrieving all of the certificates
+    in a single query.
+    """
+    generated_certificates = {
+        generated_certificate.course_id: generated_certificate
+        for generated_certificate in GeneratedCertificate.objects.filter(user=student, course_id__in=course_ids)
+    }
+    return {
+        course_id: certificate_status(generated_certificates.get(course_id))
+        for course_id in course_ids
+    }
+
+
 def certificate_status(generated_certificate):
     '''
     This returns a dictionary with a key for status, and other information.
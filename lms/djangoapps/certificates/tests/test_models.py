@@ -20,7 +20,9 @@ from certificates.models import (
     CertificateTemplateAsset,
     ExampleCertificate,
     ExampleCertificateSet,
-    GeneratedCertificate
+    GeneratedCertificate,
+    certificate_status_for_student,
+    certificate_statuses_for_student
 )
 from certificates.tests.factories import CertificateInvalidationFactory, GeneratedCertificateFactory
 from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
@@ -238,6 +240,45 @@ class EligibleCertificateManagerTest(SharedModuleStoreTestCase):
         )
 
 
+@attr(shard=1)
+class CertificateStatusesForStudentTest(SharedModuleStoreTestCase):
+    """
+    Test retrieving a student's certificate statuses for several courses at once.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super(CertificateStatusesForStudentTest, cls).setUpClass()
+        cls.courses = (CourseFactory(), CourseFactory(), CourseFactory())
+
+    def setUp(self):
+        super(CertificateStatusesForStudentTest, self).setUp()
+        self.user = UserFactory()
+        GeneratedCertificateFactory.create(
+            status=CertificateStatuses.downloadable,
+            user=self.user,
+            course_id=self.courses[0].id,  # pylint: disable=no-member
+            download_url='http://www.example.com/cert.pdf',
+        )
+        GeneratedCertificateFactory.create(
+            status=CertificateStatuses.notpassing,
+            user=self.user,
+            course_id=self.courses[1].id,  # pylint: disable=no-member
+            grade='0.3',
+        )
+
+    def test_statuses_match_single_course_statuses(self):
+        course_ids = [course.id for course in self.courses]  # pylint: disable=no-member
+        with self.assertNumQueries(1):
+            statuses = certificate_statuses_for_student(self.user, course_ids)
+
+        self.assertEqual(
+            statuses,
+            {course_id: certificate_status_for_student(self.user, course_id) for course_id in course_ids}
+        )
+        self.assertEqual(statuses[course_ids[2]]['status'], CertificateStatuses.unavailable)
+
+
 @attr(shard=1)
 @ddt.ddt
 class TestCertificateGenerationHistory(TestCase):
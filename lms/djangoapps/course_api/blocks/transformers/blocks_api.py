@@ -55,6 +55,18 @@ class BlocksAPITransformer(BlockStructureTransformer):
 
         # TODO support olx_data by calling export_to_xml(?)
 
+    def access_signature(self, usage_info, block_structure):
+        """
+        The contained transformers don't depend on the user, only on the
+        requested data.
+        """
+        return (
+            tuple(self.block_types_to_count or ()),
+            tuple(self.requested_student_view_data or ()),
+            self.depth,
+            self.nav_depth,
+        )
+
     def transform(self, usage_info, block_structure):
         """
         Mutates block_structure based on the given usage_info.
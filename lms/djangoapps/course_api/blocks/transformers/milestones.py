@@ -53,11 +53,33 @@ class MilestonesAndSpecialExamsTransformer(BlockStructureTransformer):
         block_structure.request_xblock_fields('is_timed_exam')
         block_structure.request_xblock_fields('entrance_exam_id')
 
+    def access_signature(self, usage_info, block_structure):
+        """
+        Returns the course content the user has pending milestones for, and
+        the content required of them.  Structures with special exams aren't
+        shared, since the special exam information added to them is specific
+        to each user.
+        """
+        if any(self.is_special_exam(block_key, block_structure) for block_key in block_structure):
+            return None
+
+        if usage_info.has_staff_access:
+            return (True,)
+
+        return (
+            False,
+            tuple(sorted(self.get_pending_content_ids(usage_info, block_structure))),
+            tuple(sorted(self.get_required_content(usage_info, block_structure))),
+        )
+
     def transform(self, usage_info, block_structure):
         """
         Modify block structure according to the behavior of milestones and special exams.
         """
         required_content = self.get_required_content(usage_info, block_structure)
+        pending_content_ids = (
+            set() if usage_info.has_staff_access else self.get_pending_content_ids(usage_info, block_structure)
+        )
 
         def user_gated_from_block(block_key):
             """
@@ -67,7 +89,7 @@ class MilestonesAndSpecialExamsTransformer(BlockStructureTransformer):
 
             if usage_info.has_staff_access:
                 return False
-            elif self.has_pending_milestones_for_user(block_key, usage_info):
+            elif unicode(block_key) in pending_content_ids:
                 return True
             elif self.gated_by_required_content(block_key, block_structure, required_content):
                 return True
@@ -95,17 +117,16 @@ class MilestonesAndSpecialExamsTransformer(BlockStructureTransformer):
         )
 
     @staticmethod
-    def has_pending_milestones_for_user(block_key, usage_info):
+    def get_pending_content_ids(usage_info, block_structure):
         """
-        Test whether the current user has any unfulfilled milestones preventing
-        them from accessing this block.
+        Get the ids of the course content the current user has unfulfilled
+        milestones for, which prevent them from accessing it.
         """
-        return bool(milestones_helpers.get_course_content_milestones(
-            unicode(block_key.course_key),
-            unicode(block_key),
+        return milestones_helpers.get_pending_course_content_ids(
+            unicode(block_structure.root_block_usage_key.course_key),
             'requires',
             usage_info.user.id
-        ))
+        )
 
     # TODO: As part of a cleanup effort, this transformer should be split into
     # MilestonesTransformer and SpecialExamsTransformer, which are completely independent.
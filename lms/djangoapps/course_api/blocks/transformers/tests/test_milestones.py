@@ -8,6 +8,8 @@ from nose.plugins.attrib import attr
 
 from gating import api as lms_gating_api
 from lms.djangoapps.course_blocks.transformers.tests.helpers import CourseStructureTestCase
+from lms.djangoapps.course_blocks.usage_info import CourseUsageInfo
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from openedx.core.lib.gating import api as gating_api
 from student.tests.factories import CourseEnrollmentFactory
@@ -210,6 +212,26 @@ class MilestonesTransformerTestCase(CourseStructureTestCase, MilestonesTestCaseM
             )
         self.get_blocks_and_check_against_expected(self.user, self.ALL_BLOCKS)
 
+    def test_access_signature(self):
+        self.course.enable_subsection_gating = True
+        self.setup_gated_section(self.blocks['H'], self.blocks['A'])
+        block_structure = get_course_in_cache(self.course.id)
+
+        def access_signature(user):
+            """
+            Returns the transformer's access signature for the given user.
+            """
+            return self.TRANSFORMER_CLASS_TO_TEST().access_signature(
+                CourseUsageInfo(self.course.id, user), block_structure
+            )
+
+        # Structures with special exams are specific to each user.
+        self.assertIsNone(access_signature(self.user))
+
+        with patch.object(self.TRANSFORMER_CLASS_TO_TEST, 'is_special_exam', return_value=False):
+            self.assertEqual(access_signature(self.user)[:2], (False, (unicode(self.blocks['H'].location),)))
+            self.assertEqual(access_signature(self.staff), (True,))
+
     def get_blocks_and_check_against_expected(self, user, expected_blocks):
         """
         Calls the course API as the specified user and checks the
@@ -88,6 +88,27 @@ class HiddenContentTransformer(FilteringTransformerMixin, BlockStructureTransfor
 
         block_structure.request_xblock_fields(u'self_paced', u'end')
 
+    def access_signature(self, usage_info, block_structure):
+        # Users with staff access bypass the Visibility check.
+        if usage_info.has_staff_access:
+            return (True,)
+
+        hidden_dates = set()
+        for block_key in block_structure:
+            if self._get_merged_hide_after_due(block_structure, block_key):
+                hidden_dates.add(self._get_merged_due_date(block_structure, block_key))
+        if hidden_dates:
+            # In self-paced courses, content is hidden after the end date
+            # of the structure's root, which may be any of its blocks once
+            # the structure is transformed from a starting block.
+            hidden_dates.update(block_structure.get_xblock_field(block_key, 'end') for block_key in block_structure)
+
+        # Hidden blocks only change when the next hidden date is reached,
+        # so share them until then.
+        now = datetime.now(utc)
+        upcoming_dates = [hidden_date for hidden_date in hidden_dates if hidden_date and hidden_date > now]
+        return (False, min(upcoming_dates) if upcoming_dates else None)
+
     def transform_block_filters(self, usage_info, block_structure):
         # Users with staff access bypass the Visibility check.
         if usage_info.has_staff_access:
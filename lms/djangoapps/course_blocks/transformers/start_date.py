@@ -1,11 +1,16 @@
 """
 Start Date Transformer implementation.
 """
-from lms.djangoapps.courseware.access_utils import check_start_date
+from datetime import datetime
+
+from pytz import utc
+
+from lms.djangoapps.courseware.access_utils import adjust_start_date, are_start_dates_enforced, check_start_date
 from openedx.core.djangoapps.content.block_structure.transformer import (
     BlockStructureTransformer,
     FilteringTransformerMixin
 )
+from student.roles import CourseBetaTesterRole
 from xmodule.course_metadata_utils import DEFAULT_START_DATE
 
 from .utils import collect_merged_date_field
@@ -67,6 +72,34 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
             func_merge_ancestors=max,
         )
 
+    def access_signature(self, usage_info, block_structure):
+        # Users with staff access bypass the Start Date check.
+        if usage_info.has_staff_access:
+            return (True,)
+
+        if not are_start_dates_enforced(usage_info.user, usage_info.course_key):
+            return (False, None)
+
+        # The blocks the user has access to only change when the next
+        # effective start date is reached, so share them until then.
+        now = datetime.now(utc)
+        next_start = None
+        for block_key in block_structure:
+            start = self._get_merged_start_date(block_structure, block_key)
+            if not start:
+                continue
+            effective_start = adjust_start_date(
+                usage_info.user,
+                block_structure.get_xblock_field(block_key, 'days_early_for_beta'),
+                start,
+                usage_info.course_key,
+            )
+            if effective_start >= now and (next_start is None or effective_start < next_start):
+                next_start = effective_start
+
+        is_beta_tester = CourseBetaTesterRole(usage_info.course_key).has_user(usage_info.user)
+        return (False, is_beta_tester, next_start)
+
     def transform_block_filters(self, usage_info, block_structure):
         # Users with staff access bypass the Start Date check.
         if usage_info.has_staff_access:
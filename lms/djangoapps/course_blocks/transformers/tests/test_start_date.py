@@ -9,9 +9,12 @@ from mock import patch
 from nose.plugins.attrib import attr
 
 from courseware.tests.factories import BetaTesterFactory
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
+from student.tests.factories import UserFactory
 
+from ...usage_info import CourseUsageInfo
 from ..start_date import DEFAULT_START_DATE, StartDateTransformer
-from .helpers import BlockParentsMapTestCase, update_block
+from .helpers import BlockParentsMapTestCase, publish_course, update_block
 
 
 @attr(shard=3)
@@ -121,3 +124,31 @@ class StartDateTransformerTestCase(BlockParentsMapTestCase):
             blocks_with_differing_student_access,
             self.transformers,
         )
+
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_access_signature(self):
+        block = self.get_block(1)
+        block.start = self.StartDateType.NEXT_MONTH
+        update_block(block)
+        publish_course(self.course)
+
+        block_structure = get_course_in_cache(self.course.id)
+        other_student = UserFactory.create(is_staff=False, username='other_student', password=self.password)
+
+        def access_signature(user):
+            """
+            Returns the transformer's access signature for the given user.
+            """
+            return self.TRANSFORMER_CLASS_TO_TEST().access_signature(
+                CourseUsageInfo(self.course.id, user), block_structure
+            )
+
+        student_signature = access_signature(self.student)
+        self.assertEquals(student_signature[:2], (False, False))
+        self.assertGreater(student_signature[2], self.StartDateType.TODAY)
+        self.assertEquals(access_signature(other_student), student_signature)
+
+        # Block 1 is already released to beta testers, and no other block
+        # is yet to start.
+        self.assertEquals(access_signature(self.beta_user), (False, True, None))
+        self.assertEquals(access_signature(self.staff), (True,))
@@ -0,0 +1,107 @@
+"""
+Command to pre-warm the cache of the results of the python scripts of a
+course's capa problems, for every seed the problems can be given to learners
+with, e.g. before a large exam opens.
+
+Example usage:
+    $ ./manage.py lms prewarm_safe_exec_cache 'edX/DemoX/Demo_Course' --settings=devstack
+"""
+import logging
+from gettext import NullTranslations
+
+from capa.capa_problem import LoncapaProblem, LoncapaSystem
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from edxmako.shortcuts import render_to_string
+from util.sandboxing import can_execute_unsafe_code, get_python_lib_zip, get_safe_exec_cache
+from xmodule.capa_base import MAX_RANDOMIZATION_BINS, NUM_RANDOMIZATION_BINS
+from xmodule.capa_base_constants import RANDOMIZATION
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.django import modulestore
+
+log = logging.getLogger(__name__)
+
+
+def get_problem_seeds(problem):
+    """
+    Returns the seeds which learners can be given the problem with.
+    """
+    if problem.rerandomize == RANDOMIZATION.NEVER:
+        return [1]
+    elif problem.rerandomize == RANDOMIZATION.PER_STUDENT:
+        return range(NUM_RANDOMIZATION_BINS)
+    return range(MAX_RANDOMIZATION_BINS)
+
+
+class Command(BaseCommand):
+    """
+    Executes the scripts of the course's capa problems for every seed, so that
+    their results are in the safe_exec cache when learners load the problems.
+
+    Problems whose scripts depend on the learner, through the
+    anonymous_student_id, are skipped since their results aren't shared.
+    """
+    args = '<course_id>'
+    help = 'Pre-warms the safe_exec cache of the capa problems of a course.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', help='The id of the course to pre-warm.')
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError('Invalid course_id: {}'.format(options['course_id']))
+
+        store = modulestore()
+        if not store.has_course(course_key):
+            raise CommandError('Course not found: {}'.format(course_key))
+
+        python_lib_zip = get_python_lib_zip(contentstore, course_key)
+        capa_system = LoncapaSystem(
+            ajax_url=None,
+            anonymous_student_id=None,
+            cache=get_safe_exec_cache(course_key),
+            can_execute_unsafe_code=lambda: can_execute_unsafe_code(course_key),
+            get_python_lib_zip=lambda: python_lib_zip,
+            DEBUG=settings.DEBUG,
+            filestore=None,
+            i18n=NullTranslations(),
+            node_path=settings.NODE_PATH,
+            render_template=render_to_string,
+            seed=None,
+            STATIC_URL=settings.STATIC_URL,
+            xqueue=None,
+        )
+
+        problem_count = execution_count = error_count = 0
+        for problem in store.get_items(course_key, qualifiers={'category': 'problem'}):
+            if '<script' not in problem.data or 'anonymous_student_id' in problem.data:
+                continue
+
+            problem_count += 1
+            capa_system.filestore = problem.runtime.resources_fs
+            for seed in get_problem_seeds(problem):
+                execution_count += 1
+                try:
+                    LoncapaProblem(
+                        problem_text=problem.data,
+                        id=problem.location.html_id(),
+                        capa_system=capa_system,
+                        capa_module=None,
+                        seed=seed,
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    error_count += 1
+                    log.exception('Error while pre-warming %s with seed %s', problem.location, seed)
+
+        self.stdout.write(
+            'Pre-warmed {problems} problems with {executions} seeds in total, {errors} of which failed.\n'.format(
+                problems=problem_count,
+                executions=execution_count,
+                errors=error_count,
+            )
+        )
@@ -0,0 +1,74 @@
+"""
+Tests for the prewarm_safe_exec_cache management command.
+"""
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from mock import patch
+from nose.plugins.attrib import attr
+
+import capa.capa_problem
+from capa.safe_exec.cache import SafeExecCache
+from xmodule.capa_base import NUM_RANDOMIZATION_BINS
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+SCRIPT_PROBLEM = """
+<problem>
+    <script type="loncapa/python">
+x = random.randint(0, 100)
+{extra_code}
+    </script>
+    <p>What is $x?</p>
+    <stringresponse answer="$x"><textline/></stringresponse>
+</problem>
+"""
+
+
+@attr(shard=1)
+class PrewarmSafeExecCacheTest(SharedModuleStoreTestCase):
+    """
+    Tests for the prewarm_safe_exec_cache management command.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(PrewarmSafeExecCacheTest, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        ItemFactory.create(
+            parent=cls.course,
+            category='problem',
+            data=SCRIPT_PROBLEM.format(extra_code=''),
+            metadata={'rerandomize': 'never'},
+        )
+        ItemFactory.create(
+            parent=cls.course,
+            category='problem',
+            data=SCRIPT_PROBLEM.format(extra_code=''),
+            metadata={'rerandomize': 'per_student'},
+        )
+        ItemFactory.create(
+            parent=cls.course,
+            category='problem',
+            data=SCRIPT_PROBLEM.format(extra_code='y = anonymous_student_id'),
+            metadata={'rerandomize': 'per_student'},
+        )
+        ItemFactory.create(
+            parent=cls.course,
+            category='problem',
+            data='<problem><p>No script</p><stringresponse answer="a"><textline/></stringresponse></problem>',
+        )
+
+    def test_prewarm(self):
+        with patch('capa.capa_problem.safe_exec', wraps=capa.capa_problem.safe_exec) as mock_safe_exec:
+            call_command('prewarm_safe_exec_cache', unicode(self.course.id))
+
+        seeds = sorted(call_args[1]['random_seed'] for call_args in mock_safe_exec.call_args_list)
+        self.assertEqual(seeds, sorted([1] + range(NUM_RANDOMIZATION_BINS)))
+        for call_args in mock_safe_exec.call_args_list:
+            self.assertIsInstance(call_args[1]['cache'], SafeExecCache)
+            self.assertEqual(call_args[1]['cache'].metric_tags, [u'course_id:{}'.format(self.course.id)])
+
+    def test_invalid_course(self):
+        with self.assertRaises(CommandError):
+            call_command('prewarm_safe_exec_cache', 'not/a/course')
+        with self.assertRaises(CommandError):
+            call_command('prewarm_safe_exec_cache', 'invalid course id')
@@ -361,10 +361,12 @@ class UserStateCache(object):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
-        block_field_state = self._client.get_many(
-            self.user.username,
-            _all_usage_keys(xblocks, aside_types),
-        )
+        usage_keys = _all_usage_keys(xblocks, aside_types)
+        # Keep the loaded state for the rest of the request, so that other
+        # FieldDataCaches of these blocks, such as those built to render their
+        # children or to handle their ajax calls, don't query it again.
+        self._client.prefetch(self.user.username, self.course_id, usage_keys)
+        block_field_state = self._client.get_many(self.user.username, usage_keys)
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
 
@@ -134,6 +134,14 @@ class TestStudentModuleStorage(OtherUserFailureTestMixin, TestCase):
         with self.assertNumQueries(0):
             self.assertEquals('a_value', self.kvs.get(user_state_key('a_field')))
 
+    def test_state_prefetched_for_request(self):
+        "Test that other FieldDataCaches of the same request reuse the loaded user state"
+        with self.assertNumQueries(0):
+            field_data_cache = FieldDataCache(
+                [mock_descriptor([mock_field(Scope.user_state, 'a_field')])], course_id, self.user
+            )
+            self.assertEquals('a_value', DjangoKeyValueStore(field_data_cache).get(user_state_key('a_field')))
+
     def test_get_missing_field(self):
         "Test that getting a missing field from an existing StudentModule raises a KeyError"
         # This should only read from the cache, not the database
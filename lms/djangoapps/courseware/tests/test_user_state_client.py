@@ -8,7 +8,12 @@ from unittest import skip
 
 from django.test import TestCase
 from edx_user_state_client.tests import UserStateClientTestBase
+from mock import Mock
+from opaque_keys.edx.locator import CourseLocator
 
+import request_cache
+from courseware.model_data import UserStateCache
+from courseware.models import StudentModule
 from courseware.tests.factories import UserFactory
 from courseware.user_state_client import DjangoXBlockUserStateClient
 
@@ -67,3 +72,92 @@ class TestDjangoUserStateClient(UserStateClientTestBase, TestCase):
     @skip("Not supported by DjangoXBlockUserStateClient")
     def test_iter_course_many_users(self):
         pass
+
+
+class TestDjangoUserStateClientPrefetch(TestCase):
+    """
+    Tests of prefetching state with the DjangoUserStateClient.
+    """
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestDjangoUserStateClientPrefetch, self).setUp()
+        self.user = UserFactory.create()
+        self.client = DjangoXBlockUserStateClient(self.user)
+        self.course_key = CourseLocator('org', 'course', 'run')
+        self.block_keys = [self.course_key.make_usage_key('problem', 'block{}'.format(i)) for i in range(3)]
+        self.addCleanup(request_cache.clear_cache, DjangoXBlockUserStateClient.PREFETCH_CACHE_NAME)
+
+    def _get_state(self, block_keys):
+        """
+        Return a dict mapping block keys to the stored state of the user.
+        """
+        return {
+            user_state.block_key: user_state.state
+            for user_state in self.client.get_many(self.user.username, block_keys)
+        }
+
+    def test_get_many_prefetched(self):
+        self.client.set_many(self.user.username, {self.block_keys[0]: {'a': 1}})
+        with self.assertNumQueries(1):
+            self.client.prefetch(self.user.username, self.course_key, self.block_keys)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_state(self.block_keys), {self.block_keys[0]: {'a': 1}})
+
+    def test_get_many_add_prefetched(self):
+        self.client.set_many(self.user.username, {self.block_keys[0]: {'a': 1}})
+        student_modules = list(StudentModule.objects.filter(student=self.user).select_related('student'))
+        self.client.add_prefetched(student_modules)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_state(self.block_keys[:1]), {self.block_keys[0]: {'a': 1}})
+
+    def test_prefetch_keeps_add_prefetched(self):
+        self.client.set_many(self.user.username, {self.block_keys[0]: {'a': 1}})
+        student_modules = list(StudentModule.objects.filter(student=self.user).select_related('student'))
+        self.client.add_prefetched(student_modules)
+
+        # As when a problem instance builds its FieldDataCache.
+        user_state_cache = UserStateCache(self.user, self.course_key)
+        xblock = Mock(scope_ids=Mock(usage_id=self.block_keys[0]))
+        with self.assertNumQueries(0):
+            user_state_cache.cache_fields(['a'], [xblock], [])
+            self.assertEqual(self._get_state(self.block_keys[:1]), {self.block_keys[0]: {'a': 1}})
+
+    def test_prefetch_old_mongo_keys(self):
+        course_key = CourseLocator('org', 'course', 'run', deprecated=True)
+        block_key = course_key.make_usage_key('problem', 'block')
+        self.client.set_many(self.user.username, {block_key: {'a': 1}})
+
+        # Old Mongo usage keys may or may not have been mapped into their course's run.
+        unmapped_block_key = block_key.map_into_course(course_key.replace(run=None))
+        self.client.prefetch(self.user.username, course_key, [unmapped_block_key])
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_state([block_key]), {block_key: {'a': 1}})
+            self.assertEqual(self._get_state([unmapped_block_key]), {unmapped_block_key: {'a': 1}})
+        with self.assertNumQueries(0):
+            self.client.prefetch(self.user.username, course_key, [block_key])
+
+    def test_set_many_updates_prefetched(self):
+        self.client.set_many(self.user.username, {self.block_keys[0]: {'a': 1}})
+        self.client.prefetch(self.user.username, self.course_key, self.block_keys)
+
+        self.client.set_many(self.user.username, {block_key: {'b': 2} for block_key in self.block_keys})
+        self.client.delete_many(self.user.username, self.block_keys[2:])
+        expected_state = {
+            self.block_keys[0]: {'a': 1, 'b': 2},
+            self.block_keys[1]: {'b': 2},
+        }
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_state(self.block_keys), expected_state)
+
+        request_cache.clear_cache(DjangoXBlockUserStateClient.PREFETCH_CACHE_NAME)
+        self.assertEqual(self._get_state(self.block_keys), expected_state)
+
+    def test_set_many_creates_history(self):
+        self.client.set_many(self.user.username, {block_key: {'a': 1} for block_key in self.block_keys})
+        for block_key in self.block_keys:
+            history = list(self.client.get_history(self.user.username, block_key))
+            self.assertEqual([entry.state for entry in history], [{'a': 1}])
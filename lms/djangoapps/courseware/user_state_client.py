@@ -10,11 +10,13 @@ from time import time
 
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models.signals import post_save
 from django.db.utils import IntegrityError
 from edx_user_state_client.interface import XBlockUserState, XBlockUserStateClient
 from xblock.fields import Scope
 
 import dogstats_wrapper as dog_stats_api
+import request_cache
 from courseware.models import BaseStudentModuleHistory, StudentModule
 from openedx.core.djangoapps import monitoring_utils
 
@@ -50,6 +52,11 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
     # Use this sample rate for DataDog events.
     API_DATADOG_SAMPLE_RATE = 0.1
 
+    # Name of the request cache of StudentModules loaded by :meth:`prefetch`.
+    # It maps the :meth:`_prefetch_key` of a user and block to the block's
+    # StudentModule, or to None if the user has no StudentModule for the block.
+    PREFETCH_CACHE_NAME = 'DjangoXBlockUserStateClient.prefetch'
+
     class ServiceUnavailable(XBlockUserStateClient.ServiceUnavailable):
         """
         This error is raised if the service backing this client is currently unavailable.
@@ -103,6 +110,62 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
                 yield (student_module, usage_key)
 
+    @staticmethod
+    def _prefetch_key(username, block_key):
+        """
+        Return the key of the StudentModule of ``username`` for ``block_key`` in the
+        prefetch request cache.
+
+        Usage keys are compared by their serialization, which for old Mongo usage keys
+        is the same whether or not they have been mapped into their course's run.
+        """
+        return (username, unicode(block_key))
+
+    def _get_prefetched_student_modules(self, username, block_keys):
+        """
+        Retrieve the :class:`~StudentModule`s for the supplied ``username`` and ``block_keys``,
+        using the StudentModules loaded by :meth:`prefetch` during this request where possible.
+
+        Arguments:
+            username (str): The name of the user to load `StudentModule`s for.
+            block_keys (list of :class:`~UsageKey`): The set of XBlocks to load data for.
+        """
+        prefetched = request_cache.get_cache(self.PREFETCH_CACHE_NAME)
+        cached_block_keys = []
+        uncached_block_keys = []
+        for block_key in block_keys:
+            if self._prefetch_key(username, block_key) in prefetched:
+                cached_block_keys.append(block_key)
+            else:
+                uncached_block_keys.append(block_key)
+
+        self._nr_stat_accumulate('get_many', 'cache_hits', len(cached_block_keys))
+        self._nr_stat_accumulate('get_many', 'cache_misses', len(uncached_block_keys))
+
+        for block_key in cached_block_keys:
+            student_module = prefetched[self._prefetch_key(username, block_key)]
+            if student_module is not None:
+                yield (student_module, block_key)
+
+        if uncached_block_keys:
+            for student_module, usage_key in self._get_student_modules(username, uncached_block_keys):
+                yield (student_module, usage_key)
+
+    def _update_prefetched_student_modules(self, username, student_modules):
+        """
+        Replace the prefetched StudentModules of ``username`` with the supplied,
+        more recently saved ``student_modules``.
+
+        Arguments:
+            username (str): The name of the user the `StudentModule`s belong to.
+            student_modules (dict): A dict mapping UsageKeys to :class:`~StudentModule`s.
+        """
+        prefetched = request_cache.get_cache(self.PREFETCH_CACHE_NAME)
+        for usage_key, student_module in student_modules.iteritems():
+            prefetch_key = self._prefetch_key(username, usage_key)
+            if prefetch_key in prefetched:
+                prefetched[prefetch_key] = student_module
+
     def _ddog_increment(self, evt_time, evt_name):
         """
         DataDog increment method.
@@ -169,6 +232,53 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         """
         self._nr_block_stat_accumulate(function_name, block_type, stat_name, count)
 
+    def prefetch(self, username, course_key, block_keys):
+        """
+        Load the stored XBlock state of ``username`` for all of the specified XBlock
+        usages at once, and keep it for the rest of the request. Later calls to
+        :meth:`get_many` for these usages are answered without querying the database.
+        Usages whose state was already loaded during the request aren't loaded again.
+
+        Arguments:
+            username: The name of the user whose state should be loaded
+            course_key (CourseKey): The course the XBlock usages belong to
+            block_keys ([UsageKey]): A list of UsageKeys identifying which xblock states
+                to load, such as all of the blocks in a subtree of the course.
+        """
+        # count how many times this function gets called
+        self._nr_stat_increment('prefetch', 'calls')
+        self._nr_stat_accumulate('prefetch', 'blocks_requested', len(block_keys))
+
+        prefetched = request_cache.get_cache(self.PREFETCH_CACHE_NAME)
+        block_keys = [
+            block_key.map_into_course(course_key) for block_key in block_keys
+            if self._prefetch_key(username, block_key) not in prefetched
+        ]
+        self._nr_stat_accumulate('prefetch', 'blocks_loaded', len(block_keys))
+        if not block_keys:
+            return
+
+        for block_key in block_keys:
+            prefetched[self._prefetch_key(username, block_key)] = None
+        for student_module, usage_key in self._get_student_modules(username, block_keys):
+            prefetched[self._prefetch_key(username, usage_key)] = student_module
+
+    def add_prefetched(self, student_modules):
+        """
+        Keep the supplied, already loaded StudentModules for the rest of the request,
+        as if they had been loaded by :meth:`prefetch`.
+
+        Arguments:
+            student_modules (list of :class:`~StudentModule`): The StudentModules to keep.
+                Their students should have been loaded along with them.
+        """
+        self._nr_stat_increment('add_prefetched', 'calls')
+
+        prefetched = request_cache.get_cache(self.PREFETCH_CACHE_NAME)
+        for student_module in student_modules:
+            usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+            prefetched[self._prefetch_key(student_module.student.username, usage_key)] = student_module
+
     def get_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
         Retrieve the stored XBlock state for the specified XBlock usages.
@@ -196,7 +306,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         self._ddog_histogram(evt_time, 'get_many.blks_requested', len(block_keys))
         self._nr_stat_accumulate('get_many', 'blocks_requested', len(block_keys))
 
-        modules = self._get_student_modules(username, block_keys)
+        modules = self._get_prefetched_student_modules(username, block_keys)
         for module, usage_key in modules:
             if module.state is None:
                 self._ddog_increment(evt_time, 'get_many.empty_state')
@@ -254,10 +364,6 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         # count how many times this function gets called
         self._nr_stat_increment('set_many', 'calls')
 
-        # We do a find_or_create for every block (rather than re-using field objects
-        # that were queried in get_many) so that if the score has
-        # been changed by some other piece of the code, we don't overwrite
-        # that score.
         if self.user is not None and self.user.username == username:
             user = self.user
         else:
@@ -270,41 +376,39 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         evt_time = time()
 
+        # We read every block's StudentModule again (rather than re-using field
+        # objects that were queried in get_many or prefetch) so that if the score
+        # has been changed by some other piece of the code, we don't overwrite
+        # that score. All of the blocks are read with a single query, and the
+        # missing StudentModules are created together.
+        existing_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules(username, block_keys_to_state.keys())
+        }
+
+        saved_modules = {}
+        new_modules = {}
         for usage_key, state in block_keys_to_state.items():
-            student_module, created = StudentModule.objects.get_or_create(
-                student=user,
-                course_id=usage_key.course_key,
-                module_state_key=usage_key,
-                defaults={
-                    'state': json.dumps(state),
-                    'module_type': usage_key.block_type,
-                },
-            )
+            if usage_key in existing_modules:
+                saved_modules[usage_key] = self._update_student_module(
+                    user, existing_modules[usage_key], state, block_keys_to_state
+                )
+            else:
+                new_modules[usage_key] = StudentModule(
+                    student=user,
+                    course_id=usage_key.course_key,
+                    module_state_key=usage_key,
+                    state=json.dumps(state),
+                    module_type=usage_key.block_type,
+                )
+        saved_modules.update(self._create_student_modules(user, new_modules, block_keys_to_state))
+        self._update_prefetched_student_modules(
+            username,
+            {usage_key: saved_module[0] for usage_key, saved_module in saved_modules.iteritems()},
+        )
 
-            num_fields_before = num_fields_after = num_new_fields_set = len(state)
-            num_fields_updated = 0
-            if not created:
-                if student_module.state is None:
-                    current_state = {}
-                else:
-                    current_state = json.loads(student_module.state)
-                num_fields_before = len(current_state)
-                current_state.update(state)
-                num_fields_after = len(current_state)
-                student_module.state = json.dumps(current_state)
-                try:
-                    with transaction.atomic():
-                        # Updating the object - force_update guarantees no INSERT will occur.
-                        student_module.save(force_update=True)
-                except IntegrityError:
-                    # The UPDATE above failed. Log information - but ignore the error.
-                    # See https://openedx.atlassian.net/browse/TNL-5365
-                    log.warning("set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
-                        user, repr(unicode(usage_key.course_key)), usage_key
-                    ))
-                    log.warning("set_many: All {} block keys: {}".format(
-                        len(block_keys_to_state), block_keys_to_state.keys()
-                    ))
+        for usage_key, state in block_keys_to_state.items():
+            student_module, created, num_fields_before, num_fields_after = saved_modules[usage_key]
 
             # DataDog and New Relic reporting
 
@@ -337,6 +441,94 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         self._ddog_histogram(evt_time, 'set_many.response_time', duration)
         self._nr_stat_accumulate('set_many', 'duration', duration)
 
+    def _update_student_module(self, user, student_module, state, block_keys_to_state):
+        """
+        Overlay ``state`` over the stored state of ``student_module`` and save it.
+
+        Returns:
+            A (student_module, created, num_fields_before, num_fields_after) tuple.
+        """
+        if student_module.state is None:
+            current_state = {}
+        else:
+            current_state = json.loads(student_module.state)
+        num_fields_before = len(current_state)
+        current_state.update(state)
+        student_module.state = json.dumps(current_state)
+        try:
+            with transaction.atomic():
+                # Updating the object - force_update guarantees no INSERT will occur.
+                student_module.save(force_update=True)
+        except IntegrityError:
+            # The UPDATE above failed. Log information - but ignore the error.
+            # See https://openedx.atlassian.net/browse/TNL-5365
+            log.warning("set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
+                user, repr(unicode(student_module.course_id)), student_module.module_state_key
+            ))
+            log.warning("set_many: All {} block keys: {}".format(
+                len(block_keys_to_state), block_keys_to_state.keys()
+            ))
+        return student_module, False, num_fields_before, len(current_state)
+
+    def _create_student_modules(self, user, new_modules, block_keys_to_state):
+        """
+        Insert the unsaved StudentModules in ``new_modules``, a dict mapping UsageKeys to
+        :class:`~StudentModule`s. Several StudentModules are inserted with a single query.
+
+        Returns:
+            A dict mapping each UsageKey to a (student_module, created, num_fields_before,
+            num_fields_after) tuple.
+        """
+        if len(new_modules) > 1:
+            try:
+                with transaction.atomic():
+                    StudentModule.objects.bulk_create(new_modules.values())
+            except IntegrityError:
+                # Some of the StudentModules were created concurrently, so fall back
+                # to creating them one by one.
+                pass
+            else:
+                # bulk_create neither sets the ids of the new rows nor sends post_save,
+                # which records the state history, so read the rows back and send it.
+                created_modules = {
+                    usage_key: student_module
+                    for student_module, usage_key in self._get_student_modules(user.username, new_modules.keys())
+                }
+                for student_module in created_modules.itervalues():
+                    post_save.send(
+                        sender=StudentModule,
+                        instance=student_module,
+                        created=True,
+                        update_fields=None,
+                        raw=False,
+                        using=student_module._state.db,  # pylint: disable=protected-access
+                    )
+                return {
+                    usage_key: (student_module, True, len(block_keys_to_state[usage_key]),
+                                len(block_keys_to_state[usage_key]))
+                    for usage_key, student_module in created_modules.iteritems()
+                }
+
+        saved_modules = {}
+        for usage_key, student_module in new_modules.iteritems():
+            state = block_keys_to_state[usage_key]
+            try:
+                with transaction.atomic():
+                    student_module.save(force_insert=True)
+            except IntegrityError:
+                # The StudentModule was created concurrently, so update it instead.
+                student_module = StudentModule.objects.get(
+                    student=user,
+                    course_id=usage_key.course_key,
+                    module_state_key=usage_key,
+                )
+                saved_modules[usage_key] = self._update_student_module(
+                    user, student_module, state, block_keys_to_state
+                )
+            else:
+                saved_modules[usage_key] = (student_module, True, len(state), len(state))
+        return saved_modules
+
     def delete_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
         Delete the stored XBlock state for a many xblock usages.
@@ -358,8 +550,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         self._ddog_histogram(evt_time, 'delete_many.block_count', len(block_keys))
 
+        deleted_modules = {}
         student_modules = self._get_student_modules(username, block_keys)
-        for student_module, _ in student_modules:
+        for student_module, usage_key in student_modules:
             if fields is None:
                 student_module.state = "{}"
             else:
@@ -372,6 +565,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
             # We just read this object, so we know that we can do an update
             student_module.save(force_update=True)
+            deleted_modules[usage_key] = student_module
+
+        self._update_prefetched_student_modules(username, deleted_modules)
 
         # Event for the entire delete_many call.
         finish_time = time()
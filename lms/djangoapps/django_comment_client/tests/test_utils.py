@@ -4,9 +4,11 @@ import json
 
 import ddt
 import mock
+from django.conf import settings
 from django.core.management import call_command
 from django.core.urlresolvers import reverse
 from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
 from django.utils.timezone import UTC as django_utc
 from mock import Mock, patch
 from nose.plugins.attrib import attr
@@ -35,7 +37,8 @@ from django_comment_common.utils import (
 )
 from edxmako import add_lookup
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory, CourseTeamMembershipFactory
-from lms.lib.comment_client.utils import CommentClientMaintenanceError, perform_request
+from lms.lib.comment_client import utils as comment_client_utils
+from lms.lib.comment_client.utils import CommentClientMaintenanceError, perform_concurrently, perform_request
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups import cohorts
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
@@ -1059,6 +1062,40 @@ class CategoryMapTestCase(CategoryMapTestMixin, ModuleStoreTestCase):
             ["Topic_A", "Topic_B", "Topic_C", "discussion1", "discussion2", "discussion3"]
         )
 
+    def _assert_id_map_accessible_topics(self, self_paced):
+        """
+        Verify that the discussion id map of a student only has the released
+        topics which are visible to students, or all topics visible to
+        students if the course is self-paced.
+        """
+        self.course.self_paced = self_paced
+        self.store.update_item(self.course, self.user.id)
+        later = datetime.datetime(datetime.MAXYEAR, 1, 1, tzinfo=django_utc())
+        discussion = self.create_discussion("Chapter 1", "Discussion 1")
+        self.create_discussion("Chapter 1", "Discussion 2", start=later)
+        self.create_discussion("Chapter 2", "Discussion", visible_to_staff_only=True)
+        student = UserFactory.create()
+        CourseEnrollmentFactory.create(user=student, course_id=self.course.id)
+
+        self.assertItemsEqual(
+            utils.get_discussion_id_map(self.course, self.instructor),
+            ["discussion1", "discussion2", "discussion3"]
+        )
+        id_map = utils.get_discussion_id_map(self.course, student)
+        self.assertItemsEqual(id_map, ["discussion1", "discussion2"] if self_paced else ["discussion1"])
+        self.assertEqual(
+            id_map["discussion1"],
+            {"location": discussion.location, "title": "Chapter 1 / Discussion 1"}
+        )
+
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_id_map_accessible_topics(self):
+        self._assert_id_map_accessible_topics(self_paced=False)
+
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_self_paced_id_map_accessible_topics(self):
+        self._assert_id_map_accessible_topics(self_paced=True)
+
 
 @attr(shard=1)
 class ContentGroupCategoryMapTestCase(CategoryMapTestMixin, ContentGroupTestCase):
@@ -1851,6 +1888,79 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+def _client_settings(**kwargs):
+    """
+    Returns COMMENTS_SERVICE_CLIENT_SETTINGS overridden with the given values.
+    """
+    client_settings = dict(settings.COMMENTS_SERVICE_CLIENT_SETTINGS)
+    client_settings.update(kwargs)
+    return client_settings
+
+
+class ClientConnectionTestCase(TestCase):
+    """Test cases for the pooling, caching and concurrency of requests to the comment service."""
+
+    def setUp(self):
+        super(ClientConnectionTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+        patcher = patch.object(comment_client_utils, '_session', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _mock_response(self, data):
+        """
+        Returns a mock response of the comments service with the given data.
+        """
+        response = Mock()
+        response.status_code = 200
+        response.json = lambda: data
+        return response
+
+    @override_settings(COMMENTS_SERVICE_CLIENT_SETTINGS=_client_settings(POOL_SIZE=2))
+    def test_pooled_session(self):
+        session = comment_client_utils.get_session()
+        self.assertIs(comment_client_utils.get_session(), session)
+        with patch.object(session, 'request', return_value=self._mock_response({'id': 1})) as mock_request:
+            self.assertEqual(perform_request('get', 'http://localhost:4567/api/v1/threads/1'), {'id': 1})
+            self.assertEqual(perform_request('get', 'http://localhost:4567/api/v1/threads/1'), {'id': 1})
+        self.assertEqual(mock_request.call_count, 2)
+
+    @override_settings(
+        COMMENTS_SERVICE_CLIENT_SETTINGS=_client_settings(RESPONSE_CACHE_TIMEOUT=60),
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    )
+    @patch('requests.request')
+    def test_response_cache(self, mock_request):
+        mock_request.return_value = self._mock_response({'collection': []})
+        url = 'http://localhost:4567/api/v1/threads'
+        for __ in range(2):
+            perform_request('get', url, {'page': 1}, cache_response=True)
+        self.assertEqual(mock_request.call_count, 1)
+
+        # Requests for other params, or which aren't cacheable, aren't cached
+        perform_request('get', url, {'page': 2}, cache_response=True)
+        perform_request('get', url, {'page': 1})
+        self.assertEqual(mock_request.call_count, 3)
+
+        # Any change invalidates the cached responses
+        perform_request('post', url, {'body': 'text'})
+        perform_request('get', url, {'page': 1}, cache_response=True)
+        self.assertEqual(mock_request.call_count, 5)
+
+    @override_settings(COMMENTS_SERVICE_CLIENT_SETTINGS=_client_settings(MAX_CONCURRENT_REQUESTS=3))
+    def test_perform_concurrently(self):
+        self.assertEqual(perform_concurrently(*[lambda value=value: value for value in range(5)]), range(5))
+
+        def _fail():
+            """ Fails like a request for a missing thread. """
+            raise comment_client_utils.CommentClientRequestError('Not found', 404)
+
+        with self.assertRaises(comment_client_utils.CommentClientRequestError):
+            perform_concurrently(lambda: 1, _fail, lambda: 2)
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
@@ -0,0 +1,79 @@
+"""
+Discussion Topics Transformer
+"""
+from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+
+
+class DiscussionTopicsTransformer(BlockStructureTransformer):
+    """
+    The DiscussionTopicsTransformer collects the metadata of the course's
+    discussion xblocks, so that the discussion category map of a course
+    can be built without loading its xblocks from the modulestore.
+
+    No runtime transformations are performed; the discussion xblocks that
+    a user can't access are removed by the course block access
+    transformers.
+
+    The following value is calculated and stored as a
+    transformer_block_field for each discussion xblock which has all of
+    the discussion_id, discussion_category and discussion_target fields:
+
+        discussion_topic: (dict) the discussion_id, discussion_category,
+            discussion_target, sort_key and start of the xblock.
+    """
+    WRITE_VERSION = 1
+    READ_VERSION = 1
+
+    DISCUSSION_TOPIC = 'discussion_topic'
+    TOPIC_FIELDS = ('discussion_id', 'discussion_category', 'discussion_target', 'sort_key', 'start')
+    REQUIRED_FIELDS = ('discussion_id', 'discussion_category', 'discussion_target')
+
+    @classmethod
+    def name(cls):
+        """
+        Unique identifier for the transformer's class;
+        same identifier used in setup.py.
+        """
+        return "discussion_topics"
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects any information that's necessary to execute this
+        transformer's transform method.
+        """
+        for block_key in block_structure.topological_traversal():
+            if block_key.block_type != 'discussion':
+                continue
+            xblock = block_structure.get_xblock(block_key)
+            if any(getattr(xblock, field, None) is None for field in cls.REQUIRED_FIELDS):
+                continue
+            block_structure.set_transformer_block_field(
+                block_key,
+                cls,
+                cls.DISCUSSION_TOPIC,
+                {field: getattr(xblock, field, None) for field in cls.TOPIC_FIELDS},
+            )
+
+    @classmethod
+    def get_discussion_topics(cls, block_structure):
+        """
+        Returns a list of (usage_key, discussion_topic) tuples for the
+        discussion xblocks in the given block_structure.
+        """
+        topics = []
+        for block_key in block_structure.topological_traversal():
+            topic = block_structure.get_transformer_block_field(block_key, cls, cls.DISCUSSION_TOPIC)
+            if topic is not None:
+                topics.append((block_key, topic))
+        return topics
+
+    def transform(self, usage_info, block_structure):
+        """
+        Perform no transformations.
+        """
+        pass
+
+    def access_signature(self, usage_info, block_structure):
+        # The transform output doesn't depend on the usage.
+        return ()
@@ -15,13 +15,20 @@ from opaque_keys.edx.locations import i4xEncoder
 
 import pystache_custom as pystache
 from courseware import courses
-from courseware.access import has_access
+from courseware.access import get_user_role, has_access
 from django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 from django_comment_client.permissions import check_permissions_by_view, get_team, has_permission
 from django_comment_client.settings import MAX_COMMENT_DEPTH
+from django_comment_client.transformer import DiscussionTopicsTransformer
 from django_comment_common.models import FORUM_ROLE_STUDENT, CourseDiscussionSettings, Role
 from django_comment_common.utils import get_course_discussion_settings
 from edxmako import lookup_template
+from lms.djangoapps.course_blocks.api import get_course_blocks
+from lms.djangoapps.course_blocks.transformers.start_date import StartDateTransformer
+from lms.djangoapps.course_blocks.transformers.user_partitions import UserPartitionTransformer
+from lms.djangoapps.course_blocks.transformers.visibility import VisibilityTransformer
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort_id, get_cohort_names, is_course_cohorted
 from request_cache.middleware import request_cached
@@ -146,6 +153,48 @@ def get_accessible_discussion_xblocks_by_course_id(course_id, user, include_all=
     ]
 
 
+def get_accessible_discussion_topics_by_course_id(course_id, user, self_paced=None):  # pylint: disable=invalid-name
+    """
+    Return a list of (usage_key, discussion_topic) tuples for all valid
+    discussion xblocks in this course that are accessible to the given user,
+    where discussion_topic is the dict of xblock fields collected by the
+    DiscussionTopicsTransformer.
+
+    The discussion xblocks' fields are collected once per published course
+    version in the course's block structure, which is then filtered for the
+    user by group access, visibility and, unless the course is self-paced,
+    start date. As with has_access, users with a staff or instructor role in
+    the course bypass the group access check.
+    """
+    collected_block_structure = get_block_structure_manager(course_id).get_collected()
+    if self_paced is None:
+        self_paced = collected_block_structure.get_xblock_field(
+            collected_block_structure.root_block_usage_key, 'self_paced', False
+        )
+
+    transformers = [VisibilityTransformer()]
+    if get_user_role(user, course_id) not in ['staff', 'instructor']:
+        transformers.append(UserPartitionTransformer())
+    if not self_paced:
+        transformers.append(StartDateTransformer())
+    transformers.append(DiscussionTopicsTransformer())
+
+    block_structure = get_course_blocks(
+        user,
+        collected_block_structure.root_block_usage_key,
+        BlockStructureTransformers(transformers),
+        collected_block_structure,
+    )
+    return DiscussionTopicsTransformer.get_discussion_topics(block_structure)
+
+
+def _get_discussion_title(discussion_category, discussion_target):
+    """
+    Returns the title of a discussion xblock for the discussion id map.
+    """
+    return discussion_category.split("/")[-1].strip() + (" / " + discussion_target if discussion_target else "")
+
+
 def get_discussion_id_map_entry(xblock):
     """
     Returns a tuple of (discussion_id, metadata) suitable for inclusion in the results of get_discussion_id_map().
@@ -154,7 +203,7 @@ def get_discussion_id_map_entry(xblock):
         xblock.discussion_id,
         {
             "location": xblock.location,
-            "title": xblock.discussion_category.split("/")[-1].strip() + (" / " + xblock.discussion_target if xblock.discussion_target else "")
+            "title": _get_discussion_title(xblock.discussion_category, xblock.discussion_target)
         }
     )
 
@@ -222,8 +271,13 @@ def get_discussion_id_map_by_course_id(course_id, user):  # pylint: disable=inva
     Transform the list of this course's discussion xblocks (visible to a given user) into a dictionary of metadata keyed
     by discussion_id.
     """
-    xblocks = get_accessible_discussion_xblocks_by_course_id(course_id, user)
-    return dict(map(get_discussion_id_map_entry, xblocks))
+    return {
+        topic["discussion_id"]: {
+            "location": usage_key,
+            "title": _get_discussion_title(topic["discussion_category"], topic["discussion_target"])
+        }
+        for usage_key, topic in get_accessible_discussion_topics_by_course_id(course_id, user)
+    }
 
 
 def _filter_unstarted_categories(category_map, course):
@@ -332,19 +386,19 @@ def get_discussion_category_map(course, user, divided_only_if_explicit=False, ex
     """
     unexpanded_category_map = defaultdict(list)
 
-    xblocks = get_accessible_discussion_xblocks(course, user)
+    topics = get_accessible_discussion_topics_by_course_id(course.id, user, self_paced=course.self_paced)
 
     discussion_settings = get_course_discussion_settings(course.id)
     discussion_division_enabled = course_discussion_division_enabled(discussion_settings)
     divided_discussion_ids = discussion_settings.divided_discussions
 
-    for xblock in xblocks:
-        discussion_id = xblock.discussion_id
-        title = xblock.discussion_target
-        sort_key = xblock.sort_key
-        category = " / ".join([x.strip() for x in xblock.discussion_category.split("/")])
-        # Handle case where xblock.start is None
-        entry_start_date = xblock.start if xblock.start else datetime.max.replace(tzinfo=pytz.UTC)
+    for __, topic in topics:
+        discussion_id = topic["discussion_id"]
+        title = topic["discussion_target"]
+        sort_key = topic["sort_key"]
+        category = " / ".join([x.strip() for x in topic["discussion_category"].split("/")])
+        # Handle case where the xblock's start is None
+        entry_start_date = topic["start"] if topic["start"] else datetime.max.replace(tzinfo=pytz.UTC)
         unexpanded_category_map[category].append({"title": title,
                                                   "id": discussion_id,
                                                   "sort_key": sort_key,
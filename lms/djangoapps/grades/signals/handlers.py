@@ -1,6 +1,8 @@
 """
 Grades related signals.
 """
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 from logging import getLogger
 
@@ -42,6 +44,9 @@ PROBLEM_SUBMITTED_EVENT_TYPE = 'edx.grades.problem.submitted'
 SUBSECTION_OVERRIDE_EVENT_TYPE = 'edx.grades.subsection.score_overridden'
 STATE_DELETED_EVENT_TYPE = 'edx.grades.problem.state_deleted'
 
+# Subsection grade updates deferred by batch_subsection_updates, per thread
+_subsection_update_batch = threading.local()
+
 
 @receiver(score_set)
 def submissions_score_set_handler(sender, **kwargs):  # pylint: disable=unused-argument
@@ -219,21 +224,49 @@ def enqueue_subsection_update(sender, **kwargs):  # pylint: disable=unused-argum
     enqueueing a subsection update operation to occur asynchronously.
     """
     _emit_event(kwargs)
-    result = recalculate_subsection_grade_v3.apply_async(
-        kwargs=dict(
-            user_id=kwargs['user_id'],
-            anonymous_user_id=kwargs.get('anonymous_user_id'),
-            course_id=kwargs['course_id'],
-            usage_id=kwargs['usage_id'],
-            only_if_higher=kwargs.get('only_if_higher'),
-            expected_modified_time=to_timestamp(kwargs['modified']),
-            score_deleted=kwargs.get('score_deleted', False),
-            event_transaction_id=unicode(get_event_transaction_id()),
-            event_transaction_type=unicode(get_event_transaction_type()),
-            score_db_table=kwargs['score_db_table'],
-        ),
-        countdown=RECALCULATE_GRADE_DELAY,
+    task_kwargs = dict(
+        user_id=kwargs['user_id'],
+        anonymous_user_id=kwargs.get('anonymous_user_id'),
+        course_id=kwargs['course_id'],
+        usage_id=kwargs['usage_id'],
+        only_if_higher=kwargs.get('only_if_higher'),
+        expected_modified_time=to_timestamp(kwargs['modified']),
+        score_deleted=kwargs.get('score_deleted', False),
+        event_transaction_id=unicode(get_event_transaction_id()),
+        event_transaction_type=unicode(get_event_transaction_type()),
+        score_db_table=kwargs['score_db_table'],
     )
+    pending_updates = getattr(_subsection_update_batch, 'pending_updates', None)
+    if pending_updates is not None:
+        # Only the latest update of a user's score on a problem is needed.
+        pending_updates[(task_kwargs['user_id'], task_kwargs['usage_id'])] = task_kwargs
+    else:
+        recalculate_subsection_grade_v3.apply_async(kwargs=task_kwargs, countdown=RECALCULATE_GRADE_DELAY)
+
+
+@contextmanager
+def batch_subsection_updates():
+    """
+    Context manager which defers the subsection grade updates enqueued by
+    enqueue_subsection_update within its block, and enqueues them together
+    once the block completes without error.  Wrap it around a transaction
+    that changes many scores, so that the updates only run once the new
+    scores are committed.  The updates are dropped if the block raises.
+    """
+    if getattr(_subsection_update_batch, 'pending_updates', None) is not None:
+        # The outermost batch enqueues the updates.
+        yield
+        return
+
+    _subsection_update_batch.pending_updates = OrderedDict()
+    try:
+        yield
+        pending_updates = _subsection_update_batch.pending_updates
+    finally:
+        _subsection_update_batch.pending_updates = None
+
+    for task_kwargs in pending_updates.itervalues():
+        recalculate_subsection_grade_v3.apply_async(kwargs=task_kwargs, countdown=RECALCULATE_GRADE_DELAY)
 
 
 @receiver(SUBSECTION_SCORE_CHANGED)
@@ -15,7 +15,9 @@ from util.date_utils import to_timestamp
 
 from ..constants import ScoreDatabaseTableEnum
 from ..signals.handlers import (
+    batch_subsection_updates,
     disconnect_submissions_signal_receiver,
+    enqueue_subsection_update,
     problem_raw_score_changed_handler,
     submissions_score_reset_handler,
     submissions_score_set_handler
@@ -251,3 +253,57 @@ class ScoreChangedSignalRelayTest(TestCase):
         with self.assertRaises(ValueError):
             with disconnect_submissions_signal_receiver(PROBLEM_RAW_SCORE_CHANGED):
                 pass
+
+
+class BatchSubsectionUpdatesTest(TestCase):
+    """
+    Tests that batch_subsection_updates defers the subsection grade updates
+    enqueued within its block.
+    """
+    def setUp(self):
+        super(BatchSubsectionUpdatesTest, self).setUp()
+        self.apply_async_mock = self.setup_patch(
+            'lms.djangoapps.grades.signals.handlers.recalculate_subsection_grade_v3.apply_async'
+        )
+        self.setup_patch('lms.djangoapps.grades.signals.handlers._emit_event')
+
+    def setup_patch(self, function_name):
+        """
+        Patch a function, and return the mock
+        """
+        new_patch = patch(function_name)
+        mock = new_patch.start()
+        self.addCleanup(new_patch.stop)
+        return mock
+
+    def _enqueue_update(self, user_id):
+        """
+        Calls enqueue_subsection_update as the score changed signal would, for the given user.
+        """
+        kwargs = dict(PROBLEM_WEIGHTED_SCORE_CHANGED_KWARGS, user_id=user_id, modified=FROZEN_NOW_DATETIME)
+        enqueue_subsection_update(**kwargs)
+
+    def test_updates_enqueued_after_batch(self):
+        with batch_subsection_updates():
+            self._enqueue_update(1)
+            self._enqueue_update(2)
+            self._enqueue_update(1)
+            self.apply_async_mock.assert_not_called()
+
+        self.assertEqual(
+            [call_kwargs['kwargs']['user_id'] for __, call_kwargs in self.apply_async_mock.call_args_list],
+            [1, 2],
+        )
+
+        self._enqueue_update(3)
+        self.assertEqual(self.apply_async_mock.call_count, 3)
+
+    def test_updates_dropped_on_error(self):
+        with self.assertRaises(ValueError):
+            with batch_subsection_updates():
+                self._enqueue_update(1)
+                raise ValueError()
+        self.apply_async_mock.assert_not_called()
+
+        self._enqueue_update(2)
+        self.assertEqual(self.apply_async_mock.call_count, 1)
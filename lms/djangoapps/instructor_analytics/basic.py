@@ -4,14 +4,15 @@ Student and course analytics.
 Serve miscellaneous course and student data
 """
 import datetime
+import decimal
 import json
+import uuid
 
 from django.conf import settings
-from django.contrib.auth.models import User
 from django.core.exceptions import ObjectDoesNotExist
-from django.core.serializers.json import DjangoJSONEncoder
 from django.core.urlresolvers import reverse
 from django.db.models import Count, Q
+from django.utils.functional import Promise
 from edx_proctoring.api import get_exam_violation_report
 from opaque_keys.edx.keys import UsageKey
 
@@ -19,7 +20,9 @@ import xmodule.graders as xmgraders
 from certificates.models import CertificateStatuses, GeneratedCertificate
 from courseware.models import StudentModule
 from lms.djangoapps.grades.context import grading_context_for_course
+from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
+from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from shoppingcart.models import (
     CouponRedemption,
@@ -52,6 +55,12 @@ CERTIFICATE_FEATURES = ('course_id', 'mode', 'status', 'grade', 'created_date',
 
 UNAVAILABLE = "[unavailable]"
 
+# Number of rows read at once by the streaming student data queries.
+QUERY_BATCH_SIZE = 1000
+
+# Types of the values which DjangoJSONEncoder serializes specially.
+JSON_ENCODER_TYPES = (datetime.datetime, datetime.date, datetime.time, decimal.Decimal, uuid.UUID, Promise)
+
 
 def sale_order_record_features(course_id, features):
     """
@@ -214,87 +223,142 @@ def enrolled_students_features(course_key, features):
         {'username': 'username3', 'first_name': 'firstname3'}
     ]
     """
+    return list(iter_enrolled_students_features(course_key, features))
+
+
+def iter_enrolled_students_features(course_key, features):
+    """
+    Yield the student features of enrolled_students_features as
+    dictionaries, ordered by username.
+
+    The enrolled students are read in batches of QUERY_BATCH_SIZE, with
+    their profiles and enrollment modes, and the cohorts, teams and
+    verifications of each batch are read at once.
+    """
     include_cohort_column = 'cohort' in features
     include_team_column = 'team' in features
     include_enrollment_mode = 'enrollment_mode' in features
     include_verification_status = 'verification_status' in features
 
-    students = User.objects.filter(
-        courseenrollment__course_id=course_key,
-        courseenrollment__is_active=1,
-    ).order_by('username').select_related('profile')
-
-    if include_cohort_column:
-        students = students.prefetch_related('course_groups')
-
-    if include_team_column:
-        students = students.prefetch_related('teams')
-
-    def extract_attr(student, feature):
-        """Evaluate a student attribute that is ready for JSON serialization"""
-        attr = getattr(student, feature)
-        try:
-            DjangoJSONEncoder().default(attr)
-            return attr
-        except TypeError:
-            return unicode(attr)
+    student_features = [x for x in STUDENT_FEATURES if x in features]
+    profile_features = [x for x in PROFILE_FEATURES if x in features]
+
+    # For data extractions on the 'meta' field
+    # the feature name should be in the format of 'meta.foo' where
+    # 'foo' is the keyname in the meta dictionary
+    meta_features = []
+    for feature in features:
+        if 'meta.' in feature:
+            meta_key = feature.split('.')[1]
+            meta_features.append((feature, meta_key))
+
+    fields = {'user__id', 'user__username', 'user__profile__id', 'mode'}
+    fields.update('user__' + feature for feature in student_features)
+    fields.update('user__profile__' + feature for feature in profile_features)
+    if meta_features:
+        fields.add('user__profile__meta')
+
+    enrollments = CourseEnrollment.objects.filter(
+        course_id=course_key,
+        is_active=1,
+    ).values(*fields)
 
-    def extract_student(student, features):
-        """ convert student to dictionary """
-        student_features = [x for x in STUDENT_FEATURES if x in features]
-        profile_features = [x for x in PROFILE_FEATURES if x in features]
-
-        # For data extractions on the 'meta' field
-        # the feature name should be in the format of 'meta.foo' where
-        # 'foo' is the keyname in the meta dictionary
-        meta_features = []
-        for feature in features:
-            if 'meta.' in feature:
-                meta_key = feature.split('.')[1]
-                meta_features.append((feature, meta_key))
-
-        student_dict = dict((feature, extract_attr(student, feature))
-                            for feature in student_features)
-        profile = student.profile
-        if profile is not None:
-            profile_dict = dict((feature, extract_attr(profile, feature))
-                                for feature in profile_features)
-            student_dict.update(profile_dict)
-
-            # now fetch the requested meta fields
-            meta_dict = json.loads(profile.meta) if profile.meta else {}
-            for meta_feature, meta_key in meta_features:
-                student_dict[meta_feature] = meta_dict.get(meta_key)
+    for enrollment_batch in _iter_batches(enrollments, 'user__username'):
+        user_ids = [enrollment['user__id'] for enrollment in enrollment_batch]
 
         if include_cohort_column:
-            # Note that we use student.course_groups.all() here instead of
-            # student.course_groups.filter(). The latter creates a fresh query,
-            # therefore negating the performance gain from prefetch_related().
-            student_dict['cohort'] = next(
-                (cohort.name for cohort in student.course_groups.all() if cohort.course_id == course_key),
-                "[unassigned]"
+            cohort_names = dict(
+                CourseUserGroup.users.through.objects.filter(
+                    courseusergroup__course_id=course_key,
+                    user_id__in=user_ids,
+                ).values_list('user_id', 'courseusergroup__name')
             )
 
         if include_team_column:
-            student_dict['team'] = next(
-                (team.name for team in student.teams.all() if team.course_id == course_key),
-                UNAVAILABLE
+            team_names = dict(
+                CourseTeamMembership.objects.filter(
+                    team__course_id=course_key,
+                    user_id__in=user_ids,
+                ).values_list('user_id', 'team__name')
+            )
+
+        if include_verification_status:
+            verified_user_ids = set(
+                SoftwareSecurePhotoVerification.verified_query().filter(
+                    user_id__in=user_ids,
+                ).values_list('user_id', flat=True)
             )
 
-        if include_enrollment_mode or include_verification_status:
-            enrollment_mode = CourseEnrollment.enrollment_mode_for_user(student, course_key)[0]
+        for enrollment in enrollment_batch:
+            student_dict = dict(
+                (feature, _serializable_value(enrollment['user__' + feature]))
+                for feature in student_features
+            )
+            if enrollment['user__profile__id'] is not None:
+                student_dict.update(
+                    (feature, _serializable_value(enrollment['user__profile__' + feature]))
+                    for feature in profile_features
+                )
+
+                # now fetch the requested meta fields
+                if meta_features:
+                    meta = enrollment['user__profile__meta']
+                    meta_dict = json.loads(meta) if meta else {}
+                    for meta_feature, meta_key in meta_features:
+                        student_dict[meta_feature] = meta_dict.get(meta_key)
+
+            user_id = enrollment['user__id']
+            if include_cohort_column:
+                student_dict['cohort'] = cohort_names.get(user_id, "[unassigned]")
+
+            if include_team_column:
+                student_dict['team'] = team_names.get(user_id, UNAVAILABLE)
+
             if include_verification_status:
                 student_dict['verification_status'] = SoftwareSecurePhotoVerification.verification_status_for_user(
-                    student,
+                    None,
                     course_key,
-                    enrollment_mode
+                    enrollment['mode'],
+                    user_is_verified=user_id in verified_user_ids,
                 )
             if include_enrollment_mode:
-                student_dict['enrollment_mode'] = enrollment_mode
+                student_dict['enrollment_mode'] = enrollment['mode']
+
+            yield student_dict
 
-        return student_dict
 
-    return [extract_student(student, features) for student in students]
+def _serializable_value(value):
+    """
+    Returns the given value if it's of a type that DjangoJSONEncoder
+    serializes specially, such as a date, and its unicode representation
+    otherwise.
+    """
+    if isinstance(value, JSON_ENCODER_TYPES):
+        return value
+    return unicode(value)
+
+
+def _iter_batches(queryset, key_field, batch_size=None):
+    """
+    Yields lists of at most `batch_size` (QUERY_BATCH_SIZE by default) of
+    the values of `queryset`, ordered by the unique `key_field`.
+
+    Each batch is queried starting after the last key of the previous one,
+    so that neither a long-lived cursor nor an increasingly expensive offset
+    is needed.
+    """
+    batch_size = batch_size or QUERY_BATCH_SIZE
+    last_key = None
+    while True:
+        batch_queryset = queryset
+        if last_key is not None:
+            batch_queryset = batch_queryset.filter(**{key_field + '__gt': last_key})
+        batch = list(batch_queryset.order_by(key_field)[:batch_size])
+        if batch:
+            yield batch
+        if len(batch) < batch_size:
+            return
+        last_key = batch[-1][key_field]
 
 
 def list_may_enroll(course_key, features):
@@ -420,24 +484,32 @@ def list_problem_responses(course_key, problem_location):
     where `state` represents a student's response to the problem
     identified by `problem_location`.
     """
+    return list(iter_problem_responses(course_key, problem_location))
+
+
+def iter_problem_responses(course_key, problem_location):
+    """
+    Yield the responses of list_problem_responses, ordered by student.
+
+    The responses are read in batches of QUERY_BATCH_SIZE, along with the
+    usernames of their students.
+    """
     problem_key = UsageKey.from_string(problem_location)
     # Are we dealing with an "old-style" problem location?
     run = problem_key.run
     if not run:
         problem_key = UsageKey.from_string(problem_location).map_into_course(course_key)
     if problem_key.course_key != course_key:
-        return []
+        return
 
     smdat = StudentModule.objects.filter(
         course_id=course_key,
         module_state_key=problem_key
-    )
-    smdat = smdat.order_by('student')
+    ).values('student_id', 'student__username', 'state')
 
-    return [
-        {'username': response.student.username, 'state': response.state}
-        for response in smdat
-    ]
+    for response_batch in _iter_batches(smdat, 'student_id'):
+        for response in response_batch:
+            yield {'username': response['student__username'], 'state': response['state']}
 
 
 def course_registration_features(features, registration_codes, csv_type):
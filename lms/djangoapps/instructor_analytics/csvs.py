@@ -71,19 +71,24 @@ def format_dictlist(dictlist, features):
     }
     """
 
-    def dict_to_entry(dct):
-        """ Convert dictionary to a list for a csv row """
-        relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
-        ordered = sorted(relevant_items, key=lambda (k, v): header.index(k))
-        vals = [v for (_, v) in ordered]
-        return vals
-
     header = features
-    datarows = map(dict_to_entry, dictlist)
+    datarows = list(iter_dictlist_rows(dictlist, features))
 
     return header, datarows
 
 
+def iter_dictlist_rows(dictlist, features):
+    """
+    Lazily convert an iterable of dictionaries to the data rows of
+    format_dictlist, without the header, so that the dictionaries can be
+    generated and written out one at a time.
+    """
+    for dct in dictlist:
+        relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
+        ordered = sorted(relevant_items, key=lambda (k, v): features.index(k))
+        yield [v for (_, v) in ordered]
+
+
 def format_instances(instances, features):
     """
     Convert a list of instances into a header list and datarows list.
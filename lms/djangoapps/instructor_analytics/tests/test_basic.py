@@ -179,20 +179,19 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
             self.assertEqual(set(userreport.keys()), set(query_features))
             self.assertIn(userreport['enrollment_mode'], ["audit"])
             self.assertIn(userreport['verification_status'], ["N/A"])
-        # make sure that the user report respects whatever value
-        # is returned by verification and enrollment code
-        with patch("student.models.CourseEnrollment.enrollment_mode_for_user") as enrollment_patch:
-            with patch(
-                "lms.djangoapps.verify_student.models.SoftwareSecurePhotoVerification.verification_status_for_user"
-            ) as verify_patch:
-                enrollment_patch.return_value = ["verified"]
-                verify_patch.return_value = "dummy verification status"
-                userreports = enrolled_students_features(self.course_key, query_features)
-                self.assertEqual(len(userreports), len(self.users))
-                for userreport in userreports:
-                    self.assertEqual(set(userreport.keys()), set(query_features))
-                    self.assertIn(userreport['enrollment_mode'], ["verified"])
-                    self.assertIn(userreport['verification_status'], ["dummy verification status"])
+        # make sure that the user report respects the enrollment modes
+        # and whatever value is returned by verification code
+        CourseEnrollment.objects.filter(course_id=self.course_key).update(mode="verified")
+        with patch(
+            "lms.djangoapps.verify_student.models.SoftwareSecurePhotoVerification.verification_status_for_user"
+        ) as verify_patch:
+            verify_patch.return_value = "dummy verification status"
+            userreports = enrolled_students_features(self.course_key, query_features)
+            self.assertEqual(len(userreports), len(self.users))
+            for userreport in userreports:
+                self.assertEqual(set(userreport.keys()), set(query_features))
+                self.assertIn(userreport['enrollment_mode'], ["verified"])
+                self.assertIn(userreport['verification_status'], ["dummy verification status"])
 
     def test_enrolled_students_features_keys_cohorted(self):
         course = CourseFactory.create(org="test", course="course1", display_name="run1")
@@ -211,9 +210,8 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
 
         query_features = ('username', 'cohort')
         # There should be a constant of 2 SQL queries when calling
-        # enrolled_students_features.  The first query comes from the call to
-        # User.objects.filter(...), and the second comes from
-        # prefetch_related('course_groups').
+        # enrolled_students_features.  The first query reads the enrolled
+        # students, and the second reads their cohort memberships.
         with self.assertNumQueries(2):
             userreports = enrolled_students_features(course.id, query_features)
         self.assertEqual(len([r for r in userreports if r['username'] in cohorted_usernames]), len(cohorted_students))
@@ -225,6 +223,19 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
             else:
                 self.assertEqual(report['cohort'], '[unassigned]')
 
+    @patch('lms.djangoapps.instructor_analytics.basic.QUERY_BATCH_SIZE', 2)
+    def test_enrolled_students_features_batches(self):
+        query_features = ('username', 'email', 'enrollment_mode')
+        # One query per batch of 2 students, and a last one that finds no more.
+        with self.assertNumQueries(len(self.users) / 2 + 1):
+            userreports = enrolled_students_features(self.course_key, query_features)
+        self.assertEqual(
+            [userreport['username'] for userreport in userreports],
+            sorted(user.username for user in self.users),
+        )
+        for userreport in userreports:
+            self.assertEqual(userreport['enrollment_mode'], 'audit')
+
     def test_available_features(self):
         self.assertEqual(len(AVAILABLE_FEATURES), len(STUDENT_FEATURES + PROFILE_FEATURES))
         self.assertEqual(set(AVAILABLE_FEATURES), set(STUDENT_FEATURES + PROFILE_FEATURES))
@@ -12,3 +12,12 @@ class GradeReportSetting(ConfigurationModel):
     with multiple celery workers.
     """
     batch_size = IntegerField(default=100)
+
+
+class ProblemRescoreSetting(ConfigurationModel):
+    """
+    Sets the number of student modules rescored by each subtask
+    when rescoring a problem for all students with multiple
+    celery workers.
+    """
+    batch_size = IntegerField(default=1000)
@@ -19,14 +19,21 @@ a problem URL and optionally a student.  These are used to set up the initial va
 of the query for traversing StudentModule objects.
 
 """
+import json
 import logging
+import traceback
 from functools import partial
 
 from celery import task
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_noop
 
 from bulk_email.tasks import perform_delegate_email_batches
+from lms.djangoapps.instructor_task.config.models import GradeReportSetting, ProblemRescoreSetting
+from lms.djangoapps.instructor_task.models import PROGRESS, InstructorTask
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, check_subtask_is_valid, update_subtask_status
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
@@ -35,7 +42,15 @@ from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
     upload_may_enroll_csv,
     upload_students_csv
 )
-from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport, ProblemGradeReport, ProblemResponses
+from lms.djangoapps.instructor_task.tasks_helper.grades import (
+    CourseGradeReport,
+    ProblemGradeReport,
+    ProblemResponses,
+    delete_grade_report_shards,
+    generate_grade_report_shard,
+    merge_grade_report_shards,
+    queue_grade_report_shards
+)
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     upload_course_survey_report,
@@ -45,7 +60,9 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
 from lms.djangoapps.instructor_task.tasks_helper.module_state import (
     delete_problem_module_state,
     perform_module_state_update,
+    perform_module_state_update_for_range,
     override_score_module_state,
+    queue_module_state_update_subtasks,
     rescore_problem_module_state,
     reset_attempts_module_state
 )
@@ -53,6 +70,9 @@ from lms.djangoapps.instructor_task.tasks_helper.runner import run_main_task
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# The merge lock only needs to outlive the window in which the last shards complete.
+GRADE_REPORT_MERGE_LOCK_EXPIRE = 60 * 10  # Lock expires in 10 minutes
+
 
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def rescore_problem(entry_id, xmodule_instance_args):
@@ -77,10 +97,56 @@ def rescore_problem(entry_id, xmodule_instance_args):
     action_name = ugettext_noop('rescored')
     update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, None)
+    if ProblemRescoreSetting.current().enabled:
+        def _create_rescore_subtask(module_id_range, initial_subtask_status):
+            """Creates a subtask to rescore the StudentModules whose ids fall within the given range."""
+            return rescore_problem_subtask.subtask(
+                (entry_id, xmodule_instance_args, module_id_range, initial_subtask_status.to_dict()),
+                task_id=initial_subtask_status.task_id,
+            )
+        visit_fcn = partial(queue_module_state_update_subtasks, update_fcn, _create_rescore_subtask)
+    else:
+        visit_fcn = partial(perform_module_state_update, update_fcn, None)
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
+@task  # pylint: disable=not-callable
+def rescore_problem_subtask(entry_id, xmodule_instance_args, module_id_range, subtask_status_dict):
+    """
+    Rescores the problem of a `rescore_problem` task for the StudentModules
+    whose ids fall within the inclusive `module_id_range`, when the rescoring
+    of all students is split into subtasks by ProblemRescoreSetting.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    task_input = json.loads(entry.task_input)
+    action_name = json.loads(entry.task_output)['action_name']
+    update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
+    try:
+        task_progress = perform_module_state_update_for_range(
+            update_fcn, entry.course_id, task_input, action_name, module_id_range
+        )
+    except Exception:
+        TASK_LOG.exception(
+            u'Rescoring StudentModules %s of InstructorTask ID %s failed unexpectedly', module_id_range, entry_id
+        )
+        subtask_status.increment(state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    subtask_status.increment(
+        succeeded=task_progress.succeeded,
+        failed=task_progress.failed,
+        skipped=task_progress.skipped,
+        state=SUCCESS,
+    )
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def override_problem_score(entry_id, xmodule_instance_args):
     """
@@ -183,7 +249,7 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(CourseGradeReport.generate, xmodule_instance_args)
+    task_fn = _grade_report_task_fn(entry_id, 'grade_report', CourseGradeReport, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
@@ -200,10 +266,126 @@ def calculate_problem_grade_report(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(ProblemGradeReport.generate, xmodule_instance_args)
+    task_fn = _grade_report_task_fn(
+        entry_id, 'problem_grade_report', ProblemGradeReport, xmodule_instance_args
+    )
     return run_main_task(entry_id, task_fn, action_name)
 
 
+def _grade_report_task_fn(entry_id, report_name, report_class, xmodule_instance_args):
+    """
+    Returns the function that generates the given grade report: split into
+    subtasks across celery workers when GradeReportSetting is enabled, or
+    generated entirely within the current task otherwise.
+    """
+    if not GradeReportSetting.current().enabled:
+        return partial(report_class.generate, xmodule_instance_args)
+
+    def _create_shard_subtask(shard_index, user_id_range, timestamp_str, initial_subtask_status):
+        """Creates a subtask to generate one shard of the grade report."""
+        return grade_report_shard.subtask(
+            (
+                entry_id,
+                report_name,
+                xmodule_instance_args,
+                shard_index,
+                user_id_range,
+                timestamp_str,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    return partial(queue_grade_report_shards, report_name, _create_shard_subtask, xmodule_instance_args)
+
+
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def grade_report_shard(
+        entry_id, report_name, xmodule_instance_args, shard_index, user_id_range, timestamp_str, subtask_status_dict
+):
+    """
+    Generates the partial CSVs of a grade report for the enrollees whose
+    user ids fall within `user_id_range`, then queues the merge of all
+    partial CSVs once this is the last shard of the report to complete.
+
+    The report stays in PROGRESS until its shards are merged, or is marked
+    as a FAILURE if any of them failed.  This is checked even if this shard
+    fails, since it may be the last one to complete.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    action_name = json.loads(entry.task_output)['action_name']
+    try:
+        num_succeeded, num_failed = generate_grade_report_shard(
+            report_name, xmodule_instance_args, entry_id, entry.course_id, action_name, shard_index, user_id_range
+        )
+    except Exception:
+        TASK_LOG.exception(
+            u'Grade report shard %s of InstructorTask ID %s failed unexpectedly', shard_index, entry_id
+        )
+        subtask_status.increment(state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status, final_state=FAILURE)
+        raise
+    else:
+        subtask_status.increment(succeeded=num_succeeded, failed=num_failed, state=SUCCESS)
+        update_subtask_status(entry_id, current_task_id, subtask_status, final_state=PROGRESS)
+    finally:
+        _complete_grade_report(entry_id, report_name, timestamp_str)
+    return subtask_status.to_dict()
+
+
+def _complete_grade_report(entry_id, report_name, timestamp_str):
+    """
+    Once all shards of the grade report have completed, queues the merge of
+    their partial CSVs, or, if any of them failed, marks the report as a
+    FAILURE and removes the partial CSVs of the shards which did complete.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    subtask_dict = json.loads(entry.subtasks)
+    num_done = subtask_dict['succeeded'] + subtask_dict['failed']
+    if num_done >= subtask_dict['total'] and cache.add(
+            'grade-report-merge-{}'.format(entry_id), 'true', GRADE_REPORT_MERGE_LOCK_EXPIRE
+    ):
+        if subtask_dict['failed'] > 0:
+            TASK_LOG.error(
+                u'Not merging grade report for InstructorTask ID %s: %s of %s shards failed',
+                entry_id, subtask_dict['failed'], subtask_dict['total'],
+            )
+            entry.task_state = FAILURE
+            entry.save_now()
+            delete_grade_report_shards(report_name, entry_id, entry.course_id, subtask_dict['total'])
+        else:
+            merge_grade_report.apply_async(
+                (entry_id, report_name, subtask_dict['total'], timestamp_str),
+                routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+            )
+
+
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def merge_grade_report(entry_id, report_name, num_shards, timestamp_str):
+    """
+    Stitches the partial CSVs of a sharded grade report into the final,
+    user-id ordered report, then marks the report as a SUCCESS, or as a
+    FAILURE if the merge fails.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    try:
+        merge_grade_report_shards(report_name, entry_id, entry.course_id, num_shards, timestamp_str)
+    except Exception as exc:
+        TASK_LOG.exception(u'Merging the grade report of InstructorTask ID %s failed unexpectedly', entry_id)
+        entry.task_output = InstructorTask.create_output_for_failure(exc, traceback.format_exc())
+        entry.task_state = FAILURE
+        entry.save_now()
+        raise
+
+    entry.task_state = SUCCESS
+    entry.save_now()
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def calculate_students_features_csv(entry_id, xmodule_instance_args):
     """
@@ -12,8 +12,8 @@ from pytz import UTC
 
 from courseware.courses import get_course_by_id
 from edxmako.shortcuts import render_to_string
-from instructor_analytics.basic import enrolled_students_features, list_may_enroll
-from instructor_analytics.csvs import format_dictlist
+from instructor_analytics.basic import iter_enrolled_students_features, list_may_enroll
+from instructor_analytics.csvs import format_dictlist, iter_dictlist_rows
 from lms.djangoapps.instructor.paidcourse_enrollment_report import PaidCourseEnrollmentReportProvider
 from lms.djangoapps.instructor_task.models import ReportStore
 from shoppingcart.models import (
@@ -29,7 +29,7 @@ from student.models import CourseAccessRole, CourseEnrollment
 from util.file import course_filename_prefix_generator
 
 from .runner import TaskProgress
-from .utils import tracker_emit, upload_csv_to_report_store
+from .utils import StreamingCSVReport, tracker_emit, upload_csv_to_report_store
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 FILTERED_OUT_ROLES = ['staff', 'instructor', 'finance_admin', 'sales_admin']
@@ -202,21 +202,21 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
     current_step = {'step': 'Calculating Profile Info'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # compute the student features table and format it
+    # compute the student features table and write it out as it's computed
     query_features = task_input
-    student_data = enrolled_students_features(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
+    student_data = iter_enrolled_students_features(course_id, query_features)
+    with StreamingCSVReport('student_profile_info', course_id, start_date) as report:
+        report.write_rows([query_features])
+        report.write_rows(iter_dictlist_rows(student_data, query_features))
 
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
-
-    rows.insert(0, header)
+        task_progress.attempted = task_progress.succeeded = report.num_rows - 1
+        task_progress.skipped = task_progress.total - task_progress.attempted
 
-    current_step = {'step': 'Uploading CSV'}
-    task_progress.update_task_state(extra_meta=current_step)
+        current_step = {'step': 'Uploading CSV'}
+        task_progress.update_task_state(extra_meta=current_step)
 
-    # Perform the upload
-    upload_csv_to_report_store(rows, 'student_profile_info', course_id, start_date)
+        # Perform the upload
+        report.upload()
 
     return task_progress.update_task_state(extra_meta=current_step)
 
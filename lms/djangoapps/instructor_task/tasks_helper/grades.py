@@ -1,11 +1,13 @@
 """
 Functionality for generating grade reports.
 """
+import csv
+import json
 import logging
 import re
 from collections import OrderedDict
 from datetime import datetime
-from itertools import chain, izip, izip_longest
+from itertools import chain, count, izip_longest
 from time import time
 
 from lazy import lazy
@@ -13,11 +15,14 @@ from pytz import UTC
 
 from certificates.models import CertificateWhitelist, GeneratedCertificate, certificate_info_for_user
 from courseware.courses import get_course_by_id
-from instructor_analytics.basic import list_problem_responses
-from instructor_analytics.csvs import format_dictlist
+from instructor_analytics.basic import iter_problem_responses
+from instructor_analytics.csvs import iter_dictlist_rows
 from lms.djangoapps.grades.context import grading_context, grading_context_for_course
 from lms.djangoapps.grades.models import PersistentCourseGrade
 from lms.djangoapps.grades.new.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.instructor_task.config.models import GradeReportSetting
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import queue_subtasks_for_query
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -30,7 +35,7 @@ from xmodule.partitions.partitions_service import PartitionService
 from xmodule.split_test_module import get_split_user_partitions
 
 from .runner import TaskProgress
-from .utils import upload_csv_to_report_store
+from .utils import StreamingCSVReport, upload_csv_to_report_store
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -38,6 +43,9 @@ ENROLLED_IN_COURSE = 'enrolled'
 
 NOT_ENROLLED_IN_COURSE = 'unenrolled'
 
+# Format of the report timestamp passed from a sharded grade report to its merge task.
+SHARD_TIMESTAMP_FORMAT = '%Y-%m-%d-%H%M%S'
+
 
 def _user_enrollment_status(user, course_id):
     """
@@ -210,13 +218,37 @@ class CourseGradeReport(object):
         batched_rows = self._batched_rows(context)
 
         context.update_status(u'Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
+        date = datetime.now(UTC)
+        with StreamingCSVReport('grade_report', context.course_id, date) as success_report, \
+                StreamingCSVReport('grade_report_err', context.course_id, date) as error_report:
+            success_report.write_rows([success_headers])
+            error_report.write_rows([error_headers])
+            self._compile(context, batched_rows, success_report, error_report)
 
-        context.update_status(u'Uploading grades')
-        self._upload(context, success_headers, success_rows, error_headers, error_rows)
+            context.update_status(u'Uploading grades')
+            self._upload(success_report, error_report)
 
         return context.update_status(u'Completed grades')
 
+    @classmethod
+    def generate_shard(cls, _xmodule_instance_args, _entry_id, course_id, action_name, users):
+        """
+        Returns the headers and the (success_rows, error_rows) for the given
+        subset of the course's enrollees.
+        """
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(_xmodule_instance_args, _entry_id, course_id, None, action_name)
+            report = cls()
+            success_rows, error_rows = [], []
+            for users_batch in report._batch_users(context, users):
+                batch_success_rows, batch_error_rows = report._rows_for_users(
+                    context, [user for user in users_batch if user is not None]
+                )
+                success_rows.extend(batch_success_rows)
+                error_rows.extend(batch_error_rows)
+            headers = (report._success_headers(context), report._error_headers())
+            return headers, (success_rows, error_rows)
+
     def _success_headers(self, context):
         """
         Returns a list of all applicable column headers for this grade report.
@@ -246,32 +278,34 @@ class CourseGradeReport(object):
             users = filter(lambda u: u is not None, users)
             yield self._rows_for_users(context, users)
 
-    def _compile(self, context, batched_rows):
+    def _compile(self, context, batched_rows, success_report, error_report):
         """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
+        Writes each batch of (success_rows, error_rows) to the given reports
+        as soon as it is computed, updating the task's progress after every
+        batch.  Only a single batch of rows is held in memory at a time.
         """
-        # partition and chain successes and errors
-        success_rows, error_rows = izip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
+        task_progress = context.task_progress
+        for success_rows, error_rows in batched_rows:
+            success_report.write_rows(success_rows)
+            error_report.write_rows(error_rows)
 
-        # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
-        context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
-        context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
+            # update metrics on task status
+            task_progress.succeeded += len(success_rows)
+            task_progress.failed += len(error_rows)
+            task_progress.attempted = task_progress.succeeded + task_progress.failed
+            task_progress.update_task_state(extra_meta={'step': u'Compiling grades'})
 
-    def _upload(self, context, success_headers, success_rows, error_headers, error_rows):
+        task_progress.total = task_progress.attempted
+
+    def _upload(self, success_report, error_report):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Uploads the compiled success report, and the error report if any
+        student failed to be graded.
         """
-        date = datetime.now(UTC)
-        upload_csv_to_report_store([success_headers] + success_rows, 'grade_report', context.course_id, date)
-        if len(error_rows) > 0:
-            error_rows = [error_headers] + error_rows
-            upload_csv_to_report_store(error_rows, 'grade_report_err', context.course_id, date)
+        success_report.upload()
+        # The error report always contains its header row.
+        if error_report.num_rows > 1:
+            error_report.upload()
 
     def _grades_header(self, context):
         """
@@ -285,15 +319,17 @@ class CourseGradeReport(object):
             grades_header.append(assignment_info['average_header'])
         return grades_header
 
-    def _batch_users(self, context):
+    def _batch_users(self, context, users=None):
         """
-        Returns a generator of batches of users.
+        Returns a generator of batches of users, defaulting to every enrollee
+        in the course.
         """
         def grouper(iterable, chunk_size=self.USER_BATCH_SIZE, fillvalue=None):
             args = [iter(iterable)] * chunk_size
             return izip_longest(*args, fillvalue=fillvalue)
 
-        users = CourseEnrollment.objects.users_enrolled_in(context.course_id, include_inactive=True)
+        if users is None:
+            users = CourseEnrollment.objects.users_enrolled_in(context.course_id, include_inactive=True)
         users = users.select_related('profile__allow_certificate')
         return grouper(users)
 
@@ -425,6 +461,11 @@ class CourseGradeReport(object):
 
 
 class ProblemGradeReport(object):
+    # This struct encapsulates both the display names of each static item in the
+    # header row as values as well as the django User field names of those items
+    # as the keys.  It is structured in this way to keep the values related.
+    HEADER_ROW = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
+
     @classmethod
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
         """
@@ -437,34 +478,79 @@ class ProblemGradeReport(object):
         enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id, include_inactive=True)
         task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
 
-        # This struct encapsulates both the display names of each static item in the
-        # header row as values as well as the django User field names of those items
-        # as the keys.  It is structured in this way to keep the values related.
-        header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
-
         graded_scorable_blocks = cls._graded_scorable_blocks_to_header(course_id)
 
         # Just generate the static fields for now.
-        rows = [list(header_row.values()) + ['Enrollment Status', 'Grade'] + _flatten(graded_scorable_blocks.values())]
-        error_rows = [list(header_row.values()) + ['error_msg']]
+        header, error_header = cls._headers(graded_scorable_blocks)
+        rows = [header]
+        error_rows = [error_header]
         current_step = {'step': 'Calculating Grades'}
 
+        course = get_course_by_id(course_id)
+        for row, is_error in cls._iter_rows(course_id, course, enrolled_students, graded_scorable_blocks):
+            task_progress.attempted += 1
+            if is_error:
+                error_rows.append(row)
+                task_progress.failed += 1
+                continue
+
+            rows.append(row)
+            task_progress.succeeded += 1
+            if task_progress.attempted % status_interval == 0:
+                task_progress.update_task_state(extra_meta=current_step)
+
+        # Perform the upload if any students have been successfully graded
+        if len(rows) > 1:
+            upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
+        # If there are any error rows, write them out as well
+        if len(error_rows) > 1:
+            upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+
+        return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+
+    @classmethod
+    def generate_shard(cls, _xmodule_instance_args, _entry_id, course_id, _action_name, students):
+        """
+        Returns the headers and the (success_rows, error_rows) for the given
+        subset of the course's students.
+        """
+        graded_scorable_blocks = cls._graded_scorable_blocks_to_header(course_id)
+        success_rows, error_rows = [], []
+        course = get_course_by_id(course_id)
+        for row, is_error in cls._iter_rows(course_id, course, students, graded_scorable_blocks):
+            (error_rows if is_error else success_rows).append(row)
+        return cls._headers(graded_scorable_blocks), (success_rows, error_rows)
+
+    @classmethod
+    def _headers(cls, graded_scorable_blocks):
+        """
+        Returns the success and error header rows for this report.
+        """
+        static_headers = list(cls.HEADER_ROW.values())
+        return (
+            static_headers + ['Enrollment Status', 'Grade'] + _flatten(graded_scorable_blocks.values()),
+            static_headers + ['error_msg'],
+        )
+
+    @classmethod
+    def _iter_rows(cls, course_id, course, students, graded_scorable_blocks):
+        """
+        Yields a (row, is_error) tuple for each of the given students, where
+        the row belongs in the error report if is_error is True.
+        """
         # Bulk fetch and cache enrollment states so we can efficiently determine
         # whether each user is currently enrolled in the course.
-        CourseEnrollment.bulk_fetch_enrollment_states(enrolled_students, course_id)
+        CourseEnrollment.bulk_fetch_enrollment_states(students, course_id)
 
-        course = get_course_by_id(course_id)
-        for student, course_grade, error in CourseGradeFactory().iter(enrolled_students, course):
-            student_fields = [getattr(student, field_name) for field_name in header_row]
-            task_progress.attempted += 1
+        for student, course_grade, error in CourseGradeFactory().iter(students, course):
+            student_fields = [getattr(student, field_name) for field_name in cls.HEADER_ROW]
 
             if not course_grade:
                 err_msg = error.message
                 # There was an error grading this student.
                 if not err_msg:
                     err_msg = u'Unknown error'
-                error_rows.append(student_fields + [err_msg])
-                task_progress.failed += 1
+                yield student_fields + [err_msg], True
                 continue
 
             enrollment_status = _user_enrollment_status(student, course_id)
@@ -481,20 +567,7 @@ class ProblemGradeReport(object):
                     else:
                         earned_possible_values.append([u'Not Attempted', problem_score.possible])
 
-            rows.append(student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values))
-
-            task_progress.succeeded += 1
-            if task_progress.attempted % status_interval == 0:
-                task_progress.update_task_state(extra_meta=current_step)
-
-        # Perform the upload if any students have been successfully graded
-        if len(rows) > 1:
-            upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
-        # If there are any error rows, write them out as well
-        if len(error_rows) > 1:
-            upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
-
-        return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+            yield student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values), False
 
     @classmethod
     def _graded_scorable_blocks_to_header(cls, course_key):
@@ -521,6 +594,144 @@ class ProblemGradeReport(object):
         return scorable_blocks_map
 
 
+# Grade reports that can be split across subtasks, keyed by report name.
+SHARDABLE_GRADE_REPORTS = {
+    'grade_report': CourseGradeReport,
+    'problem_grade_report': ProblemGradeReport,
+}
+
+
+def _shard_part_filename(entry_id, report_name, shard_index):
+    """
+    Returns the ReportStore filename of a shard's partial CSV.  Parts are
+    kept in a subdirectory so they are not listed as downloadable reports.
+    """
+    return u'parts/{entry_id}/{report_name}_{shard_index:05d}.csv'.format(
+        entry_id=entry_id,
+        report_name=report_name,
+        shard_index=shard_index,
+    )
+
+
+def queue_grade_report_shards(
+        report_name, create_subtask_fcn, _xmodule_instance_args, entry_id, course_id, _task_input, action_name
+):
+    """
+    Splits the given grade report into subtasks over consecutive ranges of
+    enrolled user ids, sized by the current GradeReportSetting.
+
+    `create_subtask_fcn` is called with the shard's index, its inclusive
+    (first, last) user id range, the report timestamp string and its
+    initial SubtaskStatus, and returns the celery subtask to queue.  Once
+    every shard has completed, `merge_grade_report_shards` stitches the
+    partial CSVs together in shard order.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # As with bulk email, assume that subtasks already defined for this
+    # entry (e.g. when the parent task is requeued) need not be redefined.
+    if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+        TASK_LOG.warning(u'Task %s has already been split into grade report shards', entry.task_id)
+        return json.loads(entry.task_output)
+
+    users = CourseEnrollment.objects.users_enrolled_in(course_id, include_inactive=True).order_by('id')
+    total_num_users = users.count()
+    if total_num_users == 0:
+        # Nothing to split; generate the (empty) report in this task.
+        report_class = SHARDABLE_GRADE_REPORTS[report_name]
+        return report_class.generate(_xmodule_instance_args, entry_id, course_id, _task_input, action_name)
+
+    timestamp_str = datetime.now(UTC).strftime(SHARD_TIMESTAMP_FORMAT)
+    shard_indexes = count()
+
+    def _create_shard_subtask(user_list, initial_subtask_status):
+        """Creates a subtask to grade the users in the given list."""
+        user_id_range = (user_list[0]['pk'], user_list[-1]['pk'])
+        return create_subtask_fcn(next(shard_indexes), user_id_range, timestamp_str, initial_subtask_status)
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_shard_subtask,
+        [users],
+        [],
+        GradeReportSetting.current().batch_size,
+        total_num_users,
+    )
+
+
+def generate_grade_report_shard(
+        report_name, _xmodule_instance_args, entry_id, course_id, action_name, shard_index, user_id_range
+):
+    """
+    Grades the enrollees whose user ids fall within the inclusive
+    `user_id_range`, and stores the resulting rows as partial CSVs for
+    this shard.  Returns the number of (succeeded, failed) users.
+    """
+    first_user_id, last_user_id = user_id_range
+    users = CourseEnrollment.objects.users_enrolled_in(course_id, include_inactive=True).filter(
+        id__gte=first_user_id,
+        id__lte=last_user_id,
+    ).order_by('id')
+
+    report_class = SHARDABLE_GRADE_REPORTS[report_name]
+    headers, rows = report_class.generate_shard(_xmodule_instance_args, entry_id, course_id, action_name, users)
+
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    for part_name, part_headers, part_rows in zip((report_name, report_name + '_err'), headers, rows):
+        report_store.store_rows(
+            course_id,
+            _shard_part_filename(entry_id, part_name, shard_index),
+            [part_headers] + part_rows,
+        )
+    success_rows, error_rows = rows
+    return len(success_rows), len(error_rows)
+
+
+def merge_grade_report_shards(report_name, entry_id, course_id, num_shards, timestamp_str):
+    """
+    Concatenates the partial CSVs of all `num_shards` shards, in shard
+    order, into the final report (and error report, if any user failed to
+    be graded), then removes the partial CSVs, even if the merge fails.
+    """
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    timestamp = datetime.strptime(timestamp_str, SHARD_TIMESTAMP_FORMAT)
+    part_names = (report_name, report_name + '_err')
+    try:
+        for part_name in part_names:
+            with StreamingCSVReport(part_name, course_id, timestamp) as report:
+                for shard_index in range(num_shards):
+                    part_path = report_store.path_to(
+                        course_id, _shard_part_filename(entry_id, part_name, shard_index)
+                    )
+                    with report_store.storage.open(part_path) as part_file:
+                        part_rows = csv.reader(part_file)
+                        header = next(part_rows)
+                        if report.num_rows == 0:
+                            report.write_rows([[item.decode('utf-8') for item in header]])
+                        report.write_rows([item.decode('utf-8') for item in row] for row in part_rows)
+
+                # Only upload an error report if it contains more than its header.
+                if part_name == report_name or report.num_rows > 1:
+                    report.upload()
+    finally:
+        delete_grade_report_shards(report_name, entry_id, course_id, num_shards)
+    TASK_LOG.info(u'Merged %s shards of %s for InstructorTask ID: %s', num_shards, report_name, entry_id)
+
+
+def delete_grade_report_shards(report_name, entry_id, course_id, num_shards):
+    """
+    Removes the partial CSVs of all `num_shards` shards of a grade report,
+    including those of shards which never wrote them.
+    """
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    for part_name in (report_name, report_name + '_err'):
+        for shard_index in range(num_shards):
+            report_store.storage.delete(
+                report_store.path_to(course_id, _shard_part_filename(entry_id, part_name, shard_index))
+            )
+
+
 class ProblemResponses(object):
     @classmethod
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, task_input, action_name):
@@ -535,23 +746,22 @@ class ProblemResponses(object):
         current_step = {'step': 'Calculating students answers to problem'}
         task_progress.update_task_state(extra_meta=current_step)
 
-        # Compute result table and format it
+        # Compute result table and write it out as it's computed
         problem_location = task_input.get('problem_location')
-        student_data = list_problem_responses(course_id, problem_location)
+        student_data = iter_problem_responses(course_id, problem_location)
         features = ['username', 'state']
-        header, rows = format_dictlist(student_data, features)
+        csv_name = 'student_state_from_{}'.format(re.sub(r'[:/]', '_', problem_location))
+        with StreamingCSVReport(csv_name, course_id, start_date) as report:
+            report.write_rows([features])
+            report.write_rows(iter_dictlist_rows(student_data, features))
 
-        task_progress.attempted = task_progress.succeeded = len(rows)
-        task_progress.skipped = task_progress.total - task_progress.attempted
+            task_progress.attempted = task_progress.succeeded = report.num_rows - 1
+            task_progress.skipped = task_progress.total - task_progress.attempted
 
-        rows.insert(0, header)
-
-        current_step = {'step': 'Uploading CSV'}
-        task_progress.update_task_state(extra_meta=current_step)
+            current_step = {'step': 'Uploading CSV'}
+            task_progress.update_task_state(extra_meta=current_step)
 
-        # Perform the upload
-        problem_location = re.sub(r'[:/]', '_', problem_location)
-        csv_name = 'student_state_from_{}'.format(problem_location)
-        upload_csv_to_report_store(rows, csv_name, course_id, start_date)
+            # Perform the upload
+            report.upload()
 
         return task_progress.update_task_state(extra_meta=current_step)
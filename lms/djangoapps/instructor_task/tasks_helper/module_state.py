@@ -10,11 +10,13 @@ from opaque_keys.edx.keys import UsageKey
 from xblock.runtime import KvsFieldData
 
 import dogstats_wrapper as dog_stats_api
+import request_cache
 from capa.responsetypes import LoncapaProblemError, ResponseError, StudentInputError
 from courseware.courses import get_course_by_id, get_problems_in_section
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache
 from courseware.models import StudentModule
 from courseware.module_render import get_module_for_descriptor_internal
+from courseware.user_state_client import DjangoXBlockUserStateClient
 from eventtracking import tracker
 from lms.djangoapps.grades.scores import weighted_score
 from track.contexts import course_context_from_course_id
@@ -26,7 +28,10 @@ from xmodule.modulestore.django import modulestore
 from xblock.runtime import KvsFieldData
 from xblock.scorable import Score, ScorableXBlockMixin
 from xmodule.modulestore.django import modulestore
+from ..config.models import ProblemRescoreSetting
 from ..exceptions import UpdateProblemModuleStateError
+from ..models import InstructorTask
+from ..subtasks import queue_subtasks_for_query
 from .runner import TaskProgress
 from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED, UPDATE_STATUS_SUCCEEDED
 
@@ -36,6 +41,13 @@ TASK_LOG = logging.getLogger('edx.celery.task')
 GRADES_RESCORE_EVENT_TYPE = 'edx.grades.problem.rescored'
 GRADES_OVERRIDE_EVENT_TYPE = 'edx.grades.problem.score_overridden'
 
+# Number of StudentModules which are loaded and updated together, in a single
+# transaction, by perform_module_state_update
+MODULE_STATE_UPDATE_CHUNK_SIZE = 100
+
+# Name of the request cache holding the course loaded for a chunk of StudentModules
+COURSE_CACHE_NAME = 'instructor_task.module_state.course'
+
 
 def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
     """
@@ -56,6 +68,9 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     the update is successful; False indicates the update on the particular student module failed.
     A raised exception indicates a fatal condition -- that no other student modules should be considered.
 
+    StudentModules are loaded and updated in chunks of MODULE_STATE_UPDATE_CHUNK_SIZE, ordered by id.
+    Each chunk is updated in a single transaction, see _update_module_chunk.
+
     The return value is a dict containing the task's results, with the following keys:
 
           'attempted': number of attempts made
@@ -73,6 +88,84 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
 
     """
     start_time = time()
+    problems, modules_to_update = _get_modules_to_update(course_id, task_input, filter_fcn)
+
+    task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
+    task_progress.update_task_state()
+
+    for module_chunk in _iter_module_chunks(modules_to_update):
+        _update_module_chunk(update_fcn, course_id, problems, module_chunk, task_input, action_name, task_progress)
+
+    return task_progress.update_task_state()
+
+
+def queue_module_state_update_subtasks(update_fcn, create_subtask_fcn, entry_id, course_id, task_input, action_name):
+    """
+    Splits the update of all students' StudentModules into subtasks over
+    consecutive ranges of StudentModule ids, sized by the current
+    ProblemRescoreSetting.  Updates of a single student's StudentModules, and
+    updates of no more StudentModules than a single subtask would take, are
+    performed entirely within the current task by perform_module_state_update.
+
+    `create_subtask_fcn` is called with the inclusive (first, last) range of
+    StudentModule ids of a subtask and its initial SubtaskStatus, and returns
+    the celery subtask to queue.  Each subtask then calls
+    perform_module_state_update_for_range.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # As with bulk email, assume that subtasks already defined for this
+    # entry (e.g. when the parent task is requeued) need not be redefined.
+    if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+        TASK_LOG.warning(u'Task %s has already been split into subtasks', entry.task_id)
+        return json.loads(entry.task_output)
+
+    __, modules_to_update = _get_modules_to_update(course_id, task_input, None)
+    total_num_modules = modules_to_update.count()
+    batch_size = ProblemRescoreSetting.current().batch_size
+    if task_input.get('student') is not None or total_num_modules <= batch_size:
+        return perform_module_state_update(update_fcn, None, entry_id, course_id, task_input, action_name)
+
+    def _create_subtask(module_list, initial_subtask_status):
+        """Creates a subtask to update the StudentModules in the given list."""
+        module_id_range = (module_list[0]['pk'], module_list[-1]['pk'])
+        return create_subtask_fcn(module_id_range, initial_subtask_status)
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_subtask,
+        [modules_to_update.order_by('id')],
+        [],
+        batch_size,
+        total_num_modules,
+    )
+
+
+def perform_module_state_update_for_range(update_fcn, course_id, task_input, action_name, module_id_range):
+    """
+    Performs the update of perform_module_state_update on the StudentModules
+    whose ids fall within the inclusive `module_id_range`, for a subtask
+    queued by queue_module_state_update_subtasks.
+
+    Returns the TaskProgress of the updates, which isn't reported to celery.
+    """
+    problems, modules_to_update = _get_modules_to_update(course_id, task_input, None)
+    first_module_id, last_module_id = module_id_range
+    modules_to_update = modules_to_update.filter(id__gte=first_module_id, id__lte=last_module_id)
+
+    task_progress = TaskProgress(action_name, modules_to_update.count(), time())
+    for module_chunk in _iter_module_chunks(modules_to_update):
+        _update_module_chunk(update_fcn, course_id, problems, module_chunk, task_input, action_name, task_progress)
+    return task_progress
+
+
+def _get_modules_to_update(course_id, task_input, filter_fcn):
+    """
+    Returns a dict of the descriptors of the problems to update, keyed by
+    their usage keys, and the queryset of the StudentModules to update,
+    as described by perform_module_state_update.
+    """
     usage_keys = []
     problem_url = task_input.get('problem_url')
     entrance_exam_url = task_input.get('entrance_exam_url')
@@ -113,31 +206,101 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     if filter_fcn is not None:
         modules_to_update = filter_fcn(modules_to_update)
 
-    task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
-    task_progress.update_task_state()
+    return problems, modules_to_update
+
+
+def _iter_module_chunks(modules_to_update):
+    """
+    Yields lists of at most MODULE_STATE_UPDATE_CHUNK_SIZE of the
+    StudentModules of the given queryset, along with their students, in
+    order of their ids.
+
+    Each chunk is queried starting after the last id of the previous one, so
+    that neither a long-lived cursor nor an increasingly expensive offset is
+    needed, and StudentModules deleted by the update aren't skipped over.
+    """
+    last_module_id = 0
+    while True:
+        module_chunk = list(
+            modules_to_update.filter(id__gt=last_module_id).order_by('id').select_related('student')[:MODULE_STATE_UPDATE_CHUNK_SIZE]
+        )
+        if not module_chunk:
+            return
+        yield module_chunk
+        last_module_id = module_chunk[-1].id
+
 
-    for module_to_update in modules_to_update:
+def _update_module_chunk(update_fcn, course_id, problems, module_chunk, task_input, action_name, task_progress):
+    """
+    Applies `update_fcn` to each of the StudentModules of `module_chunk` in a
+    single transaction, and records the outcomes in `task_progress` once the
+    transaction has been committed, so that the progress only counts updates
+    which were saved.
+
+    The already loaded StudentModules are handed to the user state client, so
+    that the problem instances built by the update don't query their state
+    again, and the course is loaded only once for the chunk.  The subsection
+    grade updates triggered by changed scores are enqueued together once the
+    transaction has been committed.
+
+    Each StudentModule is still saved on its own by `update_fcn`: Django has
+    no bulk update, and saving each one records its state history and emits
+    the score signals of its problem.
+    """
+    # Imported here to avoid a circular import, as the grades signal
+    # handlers import the grading event types from this module.
+    from lms.djangoapps.grades.signals.handlers import batch_subsection_updates
+
+    DjangoXBlockUserStateClient().add_prefetched(module_chunk)
+    try:
+        with batch_subsection_updates():
+            with modulestore().bulk_operations(course_id):
+                with outer_atomic():
+                    update_statuses = [
+                        _update_module(update_fcn, problems, module_to_update, task_input, action_name)
+                        for module_to_update in module_chunk
+                    ]
+    finally:
+        request_cache.clear_cache(DjangoXBlockUserStateClient.PREFETCH_CACHE_NAME)
+        request_cache.clear_cache(COURSE_CACHE_NAME)
+
+    for update_status in update_statuses:
         task_progress.attempted += 1
-        module_descriptor = problems[unicode(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        with dog_stats_api.timer('instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]):
-            update_status = update_fcn(module_descriptor, module_to_update, task_input)
-            if update_status == UPDATE_STATUS_SUCCEEDED:
-                # If the update_fcn returns true, then it performed some kind of work.
-                # Logging of failures is left to the update_fcn itself.
-                task_progress.succeeded += 1
-            elif update_status == UPDATE_STATUS_FAILED:
-                task_progress.failed += 1
-            elif update_status == UPDATE_STATUS_SKIPPED:
-                task_progress.skipped += 1
-            else:
-                raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
+        if update_status == UPDATE_STATUS_SUCCEEDED:
+            # If the update_fcn returns true, then it performed some kind of work.
+            # Logging of failures is left to the update_fcn itself.
+            task_progress.succeeded += 1
+        elif update_status == UPDATE_STATUS_FAILED:
+            task_progress.failed += 1
+        elif update_status == UPDATE_STATUS_SKIPPED:
+            task_progress.skipped += 1
 
-    return task_progress.update_task_state()
+
+def _update_module(update_fcn, problems, module_to_update, task_input, action_name):
+    """
+    Applies `update_fcn` to the given StudentModule, and returns its update status.
+    """
+    module_descriptor = problems[unicode(module_to_update.module_state_key)]
+    # There is no try here:  if there's an error, we let it throw, and the task will
+    # be marked as FAILED, with a stack trace.
+    with dog_stats_api.timer('instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]):
+        update_status = update_fcn(module_descriptor, module_to_update, task_input)
+    if update_status not in (UPDATE_STATUS_SUCCEEDED, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED):
+        raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
+    return update_status
+
+
+def _get_course_for_task(course_id):
+    """
+    Returns the course with the given id, which is loaded only once for each
+    chunk of StudentModules updated by _update_module_chunk.
+    """
+    course_cache = request_cache.get_cache(COURSE_CACHE_NAME)
+    if course_id not in course_cache:
+        course_cache[course_id] = get_course_by_id(course_id)
+    return course_cache[course_id]
 
 
-@outer_atomic
 def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, task_input):
     '''
     Takes an XModule descriptor and a corresponding StudentModule object, and
@@ -156,7 +319,7 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
     usage_key = student_module.module_state_key
 
     with modulestore().bulk_operations(course_id):
-        course = get_course_by_id(course_id)
+        course = _get_course_for_task(course_id)
         # TODO: Here is a call site where we could pass in a loaded course.  I
         # think we certainly need it since grading is happening here, and field
         # overrides would be important in handling that correctly
@@ -224,7 +387,6 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
         return UPDATE_STATUS_SUCCEEDED
 
 
-@outer_atomic
 def override_score_module_state(xmodule_instance_args, module_descriptor, student_module, task_input):
     '''
     Takes an XModule descriptor and a corresponding StudentModule object, and
@@ -245,7 +407,7 @@ def override_score_module_state(xmodule_instance_args, module_descriptor, studen
     usage_key = student_module.module_state_key
 
     with modulestore().bulk_operations(course_id):
-        course = get_course_by_id(course_id)
+        course = _get_course_for_task(course_id)
         instance = _get_module_instance_for_task(
             course_id,
             student,
@@ -304,7 +466,6 @@ def override_score_module_state(xmodule_instance_args, module_descriptor, studen
         return UPDATE_STATUS_SUCCEEDED
 
 
-@outer_atomic
 def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, student_module, _task_input):
     """
     Resets problem attempts to zero for specified `student_module`.
@@ -331,7 +492,6 @@ def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, stude
     return update_status
 
 
-@outer_atomic
 def delete_problem_module_state(xmodule_instance_args, _module_descriptor, student_module, _task_input):
     """
     Delete the StudentModule entry.
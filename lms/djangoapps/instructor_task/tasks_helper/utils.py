@@ -1,3 +1,8 @@
+import csv
+import tempfile
+
+from django.core.files import File
+
 from eventtracking import tracker
 from lms.djangoapps.instructor_task.models import ReportStore
 from util.file import course_filename_prefix_generator
@@ -28,18 +33,82 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
         course_id: ID of the course
     """
     report_store = ReportStore.from_config(config_name)
-    report_store.store_rows(
-        course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
-        rows
-    )
+    report_store.store_rows(course_id, _report_filename(csv_name, course_id, timestamp), rows)
     tracker_emit(csv_name)
 
 
+def _report_filename(csv_name, course_id, timestamp):
+    """
+    Returns the name under which a CSV report is stored in the ReportStore.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
+
+class StreamingCSVReport(object):
+    """
+    Incrementally builds a CSV report in a temporary file on local disk and
+    uploads it to the ReportStore once complete.
+
+    Rows may be appended in batches as they are computed, so the memory used
+    while generating a report depends on the size of a batch rather than on
+    the total number of rows in the report.
+
+    Usage:
+        with StreamingCSVReport('grade_report', course_id, timestamp) as report:
+            report.write_rows([header])
+            for batch in batches:
+                report.write_rows(batch)
+            report.upload()
+    """
+    def __init__(self, csv_name, course_id, timestamp, config_name='GRADES_DOWNLOAD'):
+        self.csv_name = csv_name
+        self.course_id = course_id
+        self.timestamp = timestamp
+        self.config_name = config_name
+        self.num_rows = 0
+        self._file = tempfile.TemporaryFile()
+        self._writer = csv.writer(self._file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_rows(self, rows):
+        """
+        Appends the given rows to the report, encoding unicode values as
+        utf-8 for CSV compatibility.
+        """
+        for row in rows:
+            self._writer.writerow([unicode(item).encode('utf-8') for item in row])
+            self.num_rows += 1
+
+    def upload(self):
+        """
+        Uploads the rows written so far to the ReportStore.
+        """
+        self._file.flush()
+        self._file.seek(0)
+        report_store = ReportStore.from_config(self.config_name)
+        report_store.store(
+            self.course_id,
+            _report_filename(self.csv_name, self.course_id, self.timestamp),
+            File(self._file),
+        )
+        tracker_emit(self.csv_name)
+
+    def close(self):
+        """
+        Closes and removes the underlying temporary file.
+        """
+        self._file.close()
+
+
 def tracker_emit(report_name):
     """
     Emits a 'report.requested' event for the given report.
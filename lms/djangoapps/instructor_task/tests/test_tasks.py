@@ -18,6 +18,7 @@ from opaque_keys.edx.locations import i4xEncoder
 
 from courseware.models import StudentModule
 from courseware.tests.factories import StudentModuleFactory
+from lms.djangoapps.instructor_task.config.models import ProblemRescoreSetting
 from lms.djangoapps.instructor_task.exceptions import UpdateProblemModuleStateError
 from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.tasks import (
@@ -29,6 +30,9 @@ from lms.djangoapps.instructor_task.tasks import (
     override_problem_score
 )
 from lms.djangoapps.instructor_task.tasks_helper.misc import upload_ora2_data
+from lms.djangoapps.instructor_task.tasks_helper.module_state import _iter_module_chunks, _update_module_chunk
+from lms.djangoapps.instructor_task.tasks_helper.runner import TaskProgress
+from lms.djangoapps.instructor_task.tasks_helper.utils import UPDATE_STATUS_SUCCEEDED
 from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskModuleTestCase
 from student.tests.factories import CourseEnrollmentFactory, UserFactory
@@ -447,6 +451,37 @@ class TestRescoreInstructorTask(TestInstructorTasks):
             action_name='rescored'
         )
 
+    def test_rescoring_with_subtasks(self):
+        """
+        Tests rescoring a problem in a course, for all students, split into subtasks.
+        """
+        ProblemRescoreSetting.objects.create(enabled=True, batch_size=3)
+        mock_instance = MagicMock()
+        mock_instance.has_submitted_answer.return_value = True
+
+        num_students = 10
+        self._create_students_with_state(num_students)
+        task_entry = self._create_input_entry()
+        with patch(
+                'lms.djangoapps.instructor_task.tasks_helper.module_state.get_module_for_descriptor_internal'
+        ) as mock_get_module:
+            mock_get_module.return_value = mock_instance
+            self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+
+        self.assertEqual(mock_instance.rescore.call_count, num_students)
+        self.assert_task_output(
+            output=self.get_task_output(task_entry.id),
+            total=num_students,
+            attempted=num_students,
+            succeeded=num_students,
+            skipped=0,
+            failed=0,
+            action_name='rescored'
+        )
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertEqual(json.loads(entry.subtasks)['succeeded'], 4)
+
 
 @attr(shard=3)
 class TestResetAttemptsInstructorTask(TestInstructorTasks):
@@ -590,6 +625,44 @@ class TestDeleteStateInstructorTask(TestInstructorTasks):
                                           student=student,
                                           module_state_key=self.location)
 
+    @patch('lms.djangoapps.instructor_task.tasks_helper.module_state.MODULE_STATE_UPDATE_CHUNK_SIZE', 3)
+    def test_delete_in_chunks(self):
+        num_students = 10
+        students = self._create_students_with_state(num_students)
+        self._test_run_with_task(delete_problem_state, 'deleted', num_students)
+        self.assertFalse(StudentModule.objects.filter(student__in=students).exists())
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.module_state.MODULE_STATE_UPDATE_CHUNK_SIZE', 3)
+    def test_delete_fails_in_later_chunk(self):
+        num_students = 6
+        students = self._create_students_with_state(num_students)
+        problem = self.module_store.get_item(self.location)
+        problems = {unicode(self.location): problem}
+        modules_to_update = StudentModule.objects.filter(student__in=students)
+        task_progress = TaskProgress('deleted', num_students, 0)
+
+        deleted_modules = []
+
+        def delete_module(_module_descriptor, student_module, _task_input):
+            """Deletes the StudentModule, failing on the fifth one."""
+            if len(deleted_modules) == 4:
+                raise TestTaskFailure('failed in the second chunk')
+            student_module.delete()
+            deleted_modules.append(student_module)
+            return UPDATE_STATUS_SUCCEEDED
+
+        module_chunks = _iter_module_chunks(modules_to_update)
+        _update_module_chunk(delete_module, self.course.id, problems, next(module_chunks), {}, 'deleted', task_progress)
+        with self.assertRaises(TestTaskFailure):
+            _update_module_chunk(
+                delete_module, self.course.id, problems, next(module_chunks), {}, 'deleted', task_progress
+            )
+
+        # The first chunk is committed and counted, the second one is rolled back.
+        self.assertEqual(modules_to_update.count(), 3)
+        self.assertEqual(task_progress.attempted, 3)
+        self.assertEqual(task_progress.succeeded, 3)
+
 
 class TestCertificateGenerationnstructorTask(TestInstructorTasks):
     """Tests instructor task that generates student certificates."""
@@ -8,14 +8,17 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import json
 import os
 import shutil
 import tempfile
 import urllib
 from datetime import datetime
+from uuid import uuid4
 
 import ddt
 import unicodecsv
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.test.utils import override_settings
@@ -41,18 +44,24 @@ from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
     upload_may_enroll_csv,
     upload_students_csv
 )
+from lms.djangoapps.instructor_task.config.models import GradeReportSetting
+from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.tasks import grade_report_shard, merge_grade_report
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
     ENROLLED_IN_COURSE,
     NOT_ENROLLED_IN_COURSE,
     CourseGradeReport,
     ProblemGradeReport,
-    ProblemResponses
+    ProblemResponses,
+    generate_grade_report_shard,
+    queue_grade_report_shards
 )
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     upload_course_survey_report,
     upload_ora2_data
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -150,6 +159,39 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
         self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
 
+    @patch('lms.djangoapps.instructor_task.tasks_helper.grades.CourseGradeReport.USER_BATCH_SIZE', 1)
+    def test_progress_updated_per_batch(self):
+        """
+        Test that rows are written out, and task progress reported, after
+        every batch of users rather than once at the end of the report.
+        """
+        num_students = 3
+        for i in range(num_students):
+            self.create_student('student{0}'.format(i), 'student{0}@example.com'.format(i))
+
+        self.current_task = Mock()
+        self.current_task.update_state = Mock()
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task') as mock_current_task:
+            mock_current_task.return_value = self.current_task
+            result = CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+
+        self.assertDictContainsSubset(
+            {'attempted': num_students, 'succeeded': num_students, 'failed': 0, 'total': num_students}, result
+        )
+        batch_progress = [
+            call[1]['meta']['attempted']
+            for call in self.current_task.update_state.call_args_list
+            if call[1]['meta']['step'] == u'Compiling grades'
+        ]
+        self.assertEqual(batch_progress[-num_students:], range(1, num_students + 1))
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        self.assertEqual(len(links), 1)
+        self.assertIn('grade_report', links[0][0])
+        with report_store.storage.open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            self.assertEqual(len(list(unicodecsv.DictReader(csv_file))), num_students)
+
     def test_cohort_data_in_grading(self):
         """
         Test that cohort data is included in grades csv if cohort configuration is enabled for course.
@@ -461,6 +503,105 @@ class TestTeamGradeReport(InstructorGradeReportTestCase):
         self._verify_cell_data_for_user(self.student2.username, self.course.id, 'Team Name', team2.name)
 
 
+@ddt.ddt
+class TestShardedGradeReport(InstructorGradeReportTestCase):
+    """
+    Tests that grade reports split across subtasks merge into a single,
+    ordered report.
+    """
+    def setUp(self):
+        super(TestShardedGradeReport, self).setUp()
+        self.course = CourseFactory.create()
+        self.students = [
+            self.create_student(u'student{0}'.format(i), u'student{0}@example.com'.format(i)) for i in range(5)
+        ]
+        GradeReportSetting.objects.create(enabled=True, batch_size=2)
+
+    def _generate_shards(self, report_name, entry):
+        """
+        Splits the given report into shards and generates them, returning the
+        arguments each shard was created with.
+        """
+        create_subtask_fcn = Mock()
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            queue_grade_report_shards(
+                report_name, create_subtask_fcn, None, entry.id, self.course.id, None, 'graded'
+            )
+
+            shards = [call[0] for call in create_subtask_fcn.call_args_list]
+            self.assertEqual([shard[0] for shard in shards], [0, 1, 2])
+            # Run the shards in reverse to show that ordering doesn't depend on completion order.
+            for shard_index, user_id_range, _timestamp_str, _subtask_status in reversed(shards):
+                generate_grade_report_shard(
+                    report_name, None, entry.id, self.course.id, 'graded', shard_index, user_id_range
+                )
+        return shards
+
+    @ddt.data('grade_report', 'problem_grade_report')
+    def test_shards_merged_in_order(self, report_name):
+        entry = InstructorTaskFactory.create(course_id=self.course.id, task_id=str(uuid4()), task_output='')
+        shards = self._generate_shards(report_name, entry)
+        merge_grade_report(entry.id, report_name, len(shards), shards[0][2])
+        self.assertEqual(InstructorTask.objects.get(pk=entry.id).task_state, SUCCESS)
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        self.assertEqual(len(links), 1)
+        self.assertIn(report_name, links[0][0])
+        with report_store.storage.open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            usernames = [row['Username'] for row in unicodecsv.DictReader(csv_file)]
+        self.assertEqual(usernames, [student.username for student in self.students])
+
+    def test_merge_failure(self):
+        entry = InstructorTaskFactory.create(course_id=self.course.id, task_id=str(uuid4()), task_output='')
+        shards = self._generate_shards('grade_report', entry)
+        with patch('lms.djangoapps.instructor_task.tasks_helper.grades.StreamingCSVReport.upload') as mock_upload:
+            mock_upload.side_effect = IOError('Upload failed')
+            with self.assertRaises(IOError):
+                merge_grade_report(entry.id, 'grade_report', len(shards), shards[0][2])
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.task_output)['message'], 'Upload failed')
+
+        # The partial CSVs are removed even though the merge failed.
+        self._assert_parts_removed(entry, len(shards))
+
+    def test_last_shard_failure(self):
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id, task_id=str(uuid4()), task_output=json.dumps({'action_name': 'graded'}),
+        )
+        shards = self._generate_shards('grade_report', entry)
+        # The other shards have completed, and the last one fails.
+        InstructorTask.objects.filter(pk=entry.id).update(
+            subtasks=json.dumps({'total': len(shards), 'succeeded': len(shards) - 1, 'failed': 1})
+        )
+        shard_index, user_id_range, timestamp_str, subtask_status = shards[0]
+        with patch('lms.djangoapps.instructor_task.tasks.check_subtask_is_valid'), \
+                patch('lms.djangoapps.instructor_task.tasks.update_subtask_status'), \
+                patch('lms.djangoapps.instructor_task.tasks.generate_grade_report_shard') as mock_generate:
+            mock_generate.side_effect = IOError('Shard failed')
+            with self.assertRaises(IOError):
+                grade_report_shard(
+                    entry.id, 'grade_report', None, shard_index, user_id_range, timestamp_str, subtask_status.to_dict()
+                )
+
+        self.assertEqual(InstructorTask.objects.get(pk=entry.id).task_state, FAILURE)
+        self._assert_parts_removed(entry, len(shards))
+
+    def _assert_parts_removed(self, entry, num_shards):
+        """
+        Asserts that the partial CSVs of all shards of the grade report have
+        been removed.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        for shard_index in range(num_shards):
+            for part_name in ('grade_report', 'grade_report_err'):
+                self.assertFalse(report_store.storage.exists(report_store.path_to(
+                    self.course.id, u'parts/{}/{}_{:05d}.csv'.format(entry.id, part_name, shard_index)
+                )))
+
+
 class TestProblemResponsesReport(TestReportMixin, InstructorTaskCourseTestCase):
     """
     Tests that generation of CSV files listing student answers to a
@@ -473,7 +614,7 @@ class TestProblemResponsesReport(TestReportMixin, InstructorTaskCourseTestCase):
     def test_success(self):
         task_input = {'problem_location': ''}
         with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
-            with patch('lms.djangoapps.instructor_task.tasks_helper.grades.list_problem_responses') as patched_data_source:
+            with patch('lms.djangoapps.instructor_task.tasks_helper.grades.iter_problem_responses') as patched_data_source:
                 patched_data_source.return_value = [
                     {'username': 'user0', 'state': u'state0'},
                     {'username': 'user1', 'state': u'state1'},
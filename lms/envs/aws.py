@@ -215,6 +215,16 @@ if ENV_TOKENS.get('SESSION_COOKIE_NAME', None):
 LOG_DIR = ENV_TOKENS['LOG_DIR']
 
 CACHES = ENV_TOKENS['CACHES']
+COURSE_STRUCTURE_PROCESS_CACHE_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_PROCESS_CACHE_SIZE', COURSE_STRUCTURE_PROCESS_CACHE_SIZE
+)
+COURSE_OVERVIEW_CACHE_SETTINGS.update(ENV_TOKENS.get('COURSE_OVERVIEW_CACHE_SETTINGS', {}))
+CAPA_PROBLEM_TEMPLATE_CACHE_SETTINGS.update(ENV_TOKENS.get('CAPA_PROBLEM_TEMPLATE_CACHE_SETTINGS', {}))
+SAFE_EXEC_CACHE_SETTINGS.update(ENV_TOKENS.get('SAFE_EXEC_CACHE_SETTINGS', {}))
+CONTENTSERVER_MEMORY_CACHE_SIZE = ENV_TOKENS.get('CONTENTSERVER_MEMORY_CACHE_SIZE', CONTENTSERVER_MEMORY_CACHE_SIZE)
+CONTENTSERVER_MEMORY_CACHE_TTL = ENV_TOKENS.get('CONTENTSERVER_MEMORY_CACHE_TTL', CONTENTSERVER_MEMORY_CACHE_TTL)
+CONTENTSERVER_SPOOL_DIR = ENV_TOKENS.get('CONTENTSERVER_SPOOL_DIR', CONTENTSERVER_SPOOL_DIR)
+CONTENTSERVER_SPOOL_MAX_SIZE = ENV_TOKENS.get('CONTENTSERVER_SPOOL_MAX_SIZE', CONTENTSERVER_SPOOL_MAX_SIZE)
 # Cache used for location mapping -- called many times with the same key/value
 # in a given request.
 if 'loc_cache' not in CACHES:
@@ -259,6 +269,7 @@ BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get(
     'BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS',
     BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS
 )
+BULK_EMAIL_CONNECTIONS_PER_TASK = ENV_TOKENS.get('BULK_EMAIL_CONNECTIONS_PER_TASK', BULK_EMAIL_CONNECTIONS_PER_TASK)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -353,6 +364,7 @@ VIRTUAL_UNIVERSITIES = ENV_TOKENS.get('VIRTUAL_UNIVERSITIES', [])
 META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_CLIENT_SETTINGS.update(ENV_TOKENS.get('COMMENTS_SERVICE_CLIENT_SETTINGS', {}))
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
 ZENDESK_URL = ENV_TOKENS.get('ZENDESK_URL', ZENDESK_URL)
 ZENDESK_CUSTOM_FIELDS = ENV_TOKENS.get('ZENDESK_CUSTOM_FIELDS', ZENDESK_CUSTOM_FIELDS)
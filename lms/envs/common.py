@@ -822,6 +822,55 @@ MODULESTORE = {
     }
 }
 
+# Maximum total size, in bytes, of the pickled split modulestore course
+# structures kept in each process's in-process cache, in front of the
+# 'course_structure_cache' django cache.  0 disables the in-process cache.
+COURSE_STRUCTURE_PROCESS_CACHE_SIZE = 64 * 1024 * 1024
+
+# Caching of CourseOverviews in front of the database: the number of
+# overviews kept in each process's in-process cache and for how many seconds,
+# for how many seconds they're kept in the default django cache, and for how
+# many seconds the regeneration of an outdated overview is considered to be
+# in progress.  A size or timeout of 0 disables the corresponding cache.
+COURSE_OVERVIEW_CACHE_SETTINGS = dict(
+    PROCESS_CACHE_SIZE=1000,
+    PROCESS_CACHE_TIMEOUT=60,
+    CACHE_TIMEOUT=60 * 60,
+    REGENERATION_LOCK_TIMEOUT=5 * 60,
+)
+
+# The number of parsed capa problems, with the results of their scripts, kept
+# in memory to be shared by the learners who get the same variant of a
+# problem, and for how many seconds.  A size of 0 disables the cache.
+CAPA_PROBLEM_TEMPLATE_CACHE_SETTINGS = dict(
+    SIZE=1000,
+    TIMEOUT=60,
+)
+
+# Caching of the results of the python scripts of capa problems: the django
+# cache they're shared in and for how many seconds, the number of results kept
+# in each process's in-process cache, and the size, in bytes, of the largest
+# result to cache.  A PROCESS_CACHE_SIZE of 0 disables the in-process cache.
+SAFE_EXEC_CACHE_SETTINGS = dict(
+    CACHE_NAME='default',
+    TIMEOUT=24 * 60 * 60,
+    PROCESS_CACHE_SIZE=1000,
+    MAX_RESULT_SIZE=512 * 1024,
+)
+
+############################ Contentserver ####################################
+
+# Maximum total size, in bytes, of the small unlocked course assets kept in
+# each process's memory, and the number of seconds they may be served from
+# there before being fetched again.  A size of 0 disables the in-memory cache.
+CONTENTSERVER_MEMORY_CACHE_SIZE = 32 * 1024 * 1024
+CONTENTSERVER_MEMORY_CACHE_TTL = 60
+
+# Directory to which course assets too large for the cache are spooled, and
+# the maximum total size, in bytes, of the spooled assets.  None disables spooling.
+CONTENTSERVER_SPOOL_DIR = None
+CONTENTSERVER_SPOOL_MAX_SIZE = 1024 * 1024 * 1024
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -1869,6 +1918,12 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     # Maximum number of retries per task.
     TASK_MAX_RETRIES=5,
 
+    # Maximum total size, in bytes, of the serialized transformed block
+    # structures kept in each process's memory when the
+    # block_structure.share_transformed_structures switch is active.
+    # 0 disables the in-process cache.
+    TRANSFORMED_PROCESS_CACHE_SIZE=32 * 1024 * 1024,
+
     # Backend storage
     # STORAGE_CLASS='storages.backends.s3boto.S3BotoStorage',
     # STORAGE_KWARGS=dict(bucket='nim-beryl-test'),
@@ -1919,6 +1974,11 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of SMTP connections over which each bulk email subtask sends its
+# messages at once.  Messages are rendered while earlier ones are being sent.
+# A single connection is used while a subtask is being rate-limited.
+BULK_EMAIL_CONNECTIONS_PER_TASK = 1
+
 ############################# Persistent Grades ####################################
 
 # Queue to use for updating persistent grades
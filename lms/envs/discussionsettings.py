@@ -1,2 +1,21 @@
 
 DISCUSSION_ALLOWED_UPLOAD_FILE_TYPES = ('.jpg', '.jpeg', '.gif', '.bmp', '.png', '.tiff')
+
+# Connections to the comments service.
+COMMENTS_SERVICE_CLIENT_SETTINGS = {
+    # Number of connections to the comments service kept open by each
+    # process.  With 0, a new connection is opened for every request.
+    'POOL_SIZE': 10,
+    # Number of times a request which failed to connect, or an idempotent
+    # request which failed to get a response, is retried, waiting
+    # RETRY_BACKOFF_FACTOR * 2 ** (retry number - 1) seconds in between.
+    'MAX_RETRIES': 2,
+    'RETRY_BACKOFF_FACTOR': 0.1,
+    # Seconds for which responses to cacheable requests, such as thread lists
+    # and user info, are cached.  Any change made through the comments
+    # client invalidates all cached responses.  With 0, nothing is cached.
+    'RESPONSE_CACHE_TIMEOUT': 0,
+    # Number of independent requests which can be made at once while
+    # serving a single discussion API request.
+    'MAX_CONCURRENT_REQUESTS': 4,
+}
@@ -237,6 +237,29 @@ CACHES = {
     },
 }
 
+# Don't keep course structures in memory across tests
+COURSE_STRUCTURE_PROCESS_CACHE_SIZE = 0
+
+# Don't keep course overviews in memory across tests
+COURSE_OVERVIEW_CACHE_SETTINGS['PROCESS_CACHE_SIZE'] = 0
+
+# Don't share capa problems across tests
+CAPA_PROBLEM_TEMPLATE_CACHE_SETTINGS['SIZE'] = 0
+
+# Don't keep the results of capa scripts in memory across tests
+SAFE_EXEC_CACHE_SETTINGS['PROCESS_CACHE_SIZE'] = 0
+
+# Don't keep course assets in memory across tests
+CONTENTSERVER_MEMORY_CACHE_SIZE = 0
+
+# Don't keep transformed block structures in memory across tests
+BLOCK_STRUCTURES_SETTINGS['TRANSFORMED_PROCESS_CACHE_SIZE'] = 0
+
+# Make requests to the mocked comments service one at a time, in order, and
+# without a shared session
+COMMENTS_SERVICE_CLIENT_SETTINGS['POOL_SIZE'] = 0
+COMMENTS_SERVICE_CLIENT_SETTINGS['MAX_CONCURRENT_REQUESTS'] = 1
+
 # Dummy secret key for dev
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
 
@@ -67,7 +67,8 @@ class Thread(models.Model):
             params,
             metric_tags=[u'course_id:{}'.format(query_params['course_id'])],
             metric_action='thread.search',
-            paged_results=True
+            paged_results=True,
+            cache_response=True,
         )
         if query_params.get('text'):
             search_query = query_params['text']
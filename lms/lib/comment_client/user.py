@@ -150,6 +150,7 @@ class User(models.Model):
                 retrieve_params,
                 metric_action='model.retrieve',
                 metric_tags=self._metric_tags,
+                cache_response=True,
             )
         except utils.CommentClientRequestError as e:
             if e.status_code == 404:
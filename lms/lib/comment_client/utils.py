@@ -1,17 +1,43 @@
 """" Common utilities for comment client wrapper """
+import hashlib
 import logging
+import sys
+import threading
 from contextlib import contextmanager
+from Queue import Empty, Queue
 from time import time
 from uuid import uuid4
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import get_language
+from django.utils.translation import override as override_language
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 
 import dogstats_wrapper as dog_stats_api
+from request_cache import get_cache
 
 log = logging.getLogger(__name__)
 
+# Used for any COMMENTS_SERVICE_CLIENT_SETTINGS which aren't set, such as in
+# services which don't configure the client.
+DEFAULT_CLIENT_SETTINGS = {
+    'POOL_SIZE': 0,
+    'MAX_RETRIES': 0,
+    'RETRY_BACKOFF_FACTOR': 0,
+    'RESPONSE_CACHE_TIMEOUT': 0,
+    'MAX_CONCURRENT_REQUESTS': 1,
+}
+
+# Cache key of the version of the cached responses, which is incremented to
+# invalidate all of them whenever the comments service's data is changed.
+RESPONSE_CACHE_VERSION_KEY = 'comment_client.response_cache.version'
+
+_session = None
+_session_lock = threading.Lock()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -53,11 +79,160 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
+def get_client_setting(name):
+    """
+    Returns the value of the given COMMENTS_SERVICE_CLIENT_SETTINGS setting.
+    """
+    client_settings = getattr(settings, 'COMMENTS_SERVICE_CLIENT_SETTINGS', {})
+    return client_settings.get(name, DEFAULT_CLIENT_SETTINGS[name])
+
+
+def get_session():
+    """
+    Returns the requests Session shared by all threads of the process, which
+    keeps connections to the comments service open between requests, or None
+    if connection pooling is disabled.
+    """
+    global _session  # pylint: disable=global-statement
+    pool_size = get_client_setting('POOL_SIZE')
+    if not pool_size:
+        return None
+
+    with _session_lock:
+        if _session is None:
+            # Requests which fail to connect are always retried, but only
+            # idempotent requests are retried after they were sent.
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=Retry(
+                    total=get_client_setting('MAX_RETRIES'),
+                    backoff_factor=get_client_setting('RETRY_BACKOFF_FACTOR'),
+                    method_whitelist=frozenset(['GET', 'HEAD', 'PUT', 'DELETE']),
+                ),
+            )
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def _get_response_cache_key(url, params):
+    """
+    Returns the cache key of the response to a GET request with the given url
+    and params, in the current language.
+    """
+    version = cache.get(RESPONSE_CACHE_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(RESPONSE_CACHE_VERSION_KEY, version, None)
+    key_data = u'{url}|{params!r}|{language}'.format(
+        url=url,
+        params=sorted(params.items()),
+        language=get_language(),
+    )
+    return 'comment_client.response.{version}.{key_hash}'.format(
+        version=version,
+        key_hash=hashlib.sha1(key_data.encode('utf-8')).hexdigest(),
+    )
+
+
+def invalidate_response_cache():
+    """
+    Invalidates all cached responses of the comments service.
+    """
+    try:
+        cache.incr(RESPONSE_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.add(RESPONSE_CACHE_VERSION_KEY, 1, None)
+
+
+def perform_concurrently(*calls):
+    """
+    Calls the given functions, which make independent requests to the comments
+    service, at the same time, and returns their results in order.
+
+    The last function is called in the calling thread, and the others in up
+    to MAX_CONCURRENT_REQUESTS - 1 other threads.  The other threads only
+    share the calling thread's language and forums configuration, so the
+    functions called in them should do nothing but make requests to the
+    comments service.  With MAX_CONCURRENT_REQUESTS of 1, the functions are
+    called in order in the calling thread.
+
+    The first exception raised by any of the functions is re-raised once all
+    of them are done.
+    """
+    max_concurrent_requests = get_client_setting('MAX_CONCURRENT_REQUESTS')
+    if max_concurrent_requests <= 1 or len(calls) <= 1:
+        return [call() for call in calls]
+
+    # To avoid dependency conflict
+    from django_comment_common.models import ForumsConfig
+    # Load the config in the calling thread, so that the other threads don't
+    # need to access the database.
+    ForumsConfig.current_for_request()
+    config_cache = dict(get_cache(ForumsConfig.REQUEST_CACHE_NAME))
+    language = get_language()
+    results = [None] * len(calls)
+    exc_infos = [None] * len(calls)
+
+    def _call(index):
+        """
+        Calls the function with the given index, recording its result or exception.
+        """
+        try:
+            results[index] = calls[index]()
+        except Exception:  # pylint: disable=broad-except
+            exc_infos[index] = sys.exc_info()
+
+    pending_indexes = Queue()
+    for index in range(len(calls) - 1):
+        pending_indexes.put(index)
+
+    def _call_pending():
+        """
+        Calls the pending functions until there are none left.
+        """
+        get_cache(ForumsConfig.REQUEST_CACHE_NAME).update(config_cache)
+        with override_language(language):
+            while True:
+                try:
+                    index = pending_indexes.get_nowait()
+                except Empty:
+                    return
+                _call(index)
+
+    threads = [
+        threading.Thread(target=_call_pending)
+        for __ in range(min(max_concurrent_requests, len(calls)) - 1)
+    ]
+    for thread in threads:
+        thread.start()
+    _call(len(calls) - 1)
+    for thread in threads:
+        thread.join()
+
+    for exc_info in exc_infos:
+        if exc_info is not None:
+            raise exc_info[0], exc_info[1], exc_info[2]
+    return results
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
-                    metric_action=None, metric_tags=None, paged_results=False):
+                    metric_action=None, metric_tags=None, paged_results=False, cache_response=False):
+    """
+    Makes a request to the comments service, and returns its JSON-decoded
+    response, or its text if `raw`.
+
+    The responses of GET requests made with `cache_response` are cached for
+    RESPONSE_CACHE_TIMEOUT seconds, or until any request which isn't a GET
+    request is made.  Only requests for data which is fine to be briefly out
+    of date, such as lists of threads, should be cached.
+    """
     # To avoid dependency conflict
     from django_comment_common.models import ForumsConfig
-    config = ForumsConfig.current()
+    config = ForumsConfig.current_for_request()
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
@@ -78,14 +253,27 @@ def perform_request(method, url, data_or_params=None, raw=False,
     request_id = uuid4()
     request_id_dict = {'request_id': request_id}
 
+    response_cache_timeout = get_client_setting('RESPONSE_CACHE_TIMEOUT')
+    response_cache_key = None
+    if cache_response and response_cache_timeout and method.lower() == 'get' and not raw:
+        response_cache_key = _get_response_cache_key(url, data_or_params)
+        data = cache.get(response_cache_key)
+        if data is not None:
+            metric_tags.append(u'result:cached')
+            dog_stats_api.increment('comment_client.request.count', tags=metric_tags)
+            return data
+
     if method in ['post', 'put', 'patch']:
         data = data_or_params
         params = request_id_dict
     else:
         data = None
         params = merge_dict(data_or_params, request_id_dict)
+
+    session = get_session()
+    request_fcn = session.request if session is not None else requests.request
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = request_fcn(
             method,
             url,
             data=data,
@@ -94,6 +282,9 @@ def perform_request(method, url, data_or_params=None, raw=False,
             timeout=config.connection_timeout
         )
 
+    if response_cache_timeout and method.lower() != 'get':
+        invalidate_response_cache()
+
     metric_tags.append(u'status_code:{}'.format(response.status_code))
     if response.status_code > 200:
         metric_tags.append(u'result:failure')
@@ -138,6 +329,8 @@ def perform_request(method, url, data_or_params=None, raw=False,
                     value=data.get('num_pages', 1),
                     tags=metric_tags
                 )
+            if response_cache_key is not None:
+                cache.set(response_cache_key, data, response_cache_timeout)
             return data
 
 
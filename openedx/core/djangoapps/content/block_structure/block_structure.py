@@ -6,7 +6,8 @@ Module with family of classes for block structures.
 
 The following internal data structures are implemented:
     _BlockRelations - Data structure for a single block's relations.
-    _BlockData - Data structure for a single block's data.
+    _BlockGraph - Data structure for all blocks' relations, by block id.
+    BlockData - Data structure for a single block's data.
 """
 from copy import deepcopy
 from functools import partial
@@ -28,7 +29,13 @@ class _BlockRelations(object):
     """
     Data structure to encapsulate relationships for a single block,
     including its children and parents.
+
+    Only used as the interchange format of a structure's relations (see
+    BlockStructure._block_relations); the structure itself keeps its
+    relations in a _BlockGraph.
     """
+    __slots__ = ('parents', 'children')
+
     def __init__(self):
 
         # List of usage keys of this block's parents.
@@ -39,6 +46,129 @@ class _BlockRelations(object):
         # list [UsageKey]
         self.children = []
 
+    def __getstate__(self):
+        return {'parents': self.parents, 'children': self.children}
+
+    def __setstate__(self, state):
+        # Also supports the __dict__ state pickled before __slots__ were used.
+        self.parents = state['parents']
+        self.children = state['children']
+
+
+class _BlockGraph(object):
+    """
+    Data structure to encapsulate the blocks of a structure and their
+    relationships.
+
+    Each block is assigned a dense integer id when it is added.  Relations
+    are kept as lists of integer ids, indexed by block id, so traversals
+    hash and compare small integers rather than usage keys, and copying
+    the graph never copies a usage key.  The ids of removed blocks are not
+    reused.
+    """
+    __slots__ = ('keys', 'ids', 'parents', 'children')
+
+    def __init__(self):
+
+        # Usage key of each block, indexed by block id.
+        # list [UsageKey]
+        self.keys = []
+
+        # Map of a block's usage key to its block id.  The existence
+        # of a block in the graph is determined by its presence in
+        # this map.
+        # dict {UsageKey: int}
+        self.ids = {}
+
+        # Block ids of each block's parents, indexed by block id.
+        # list [list [int]]
+        self.parents = []
+
+        # Block ids of each block's children, indexed by block id.
+        # list [list [int]]
+        self.children = []
+
+    @classmethod
+    def from_relations(cls, block_relations):
+        """
+        Returns a new graph for the given map of a block's usage key to
+        its _BlockRelations.
+        """
+        graph = cls()
+        for usage_key in block_relations:
+            graph.add_block(usage_key)
+        ids = graph.ids
+        for usage_key, relations in block_relations.iteritems():
+            block_id = ids[usage_key]
+            graph.parents[block_id] = [ids[parent_key] for parent_key in relations.parents]
+            graph.children[block_id] = [ids[child_key] for child_key in relations.children]
+        return graph
+
+    def to_relations(self):
+        """
+        Returns a map of each block's usage key to its _BlockRelations.
+        """
+        keys = self.keys
+        block_relations = {}
+        for usage_key, block_id in self.ids.iteritems():
+            relations = _BlockRelations()
+            relations.parents = [keys[parent_id] for parent_id in self.parents[block_id]]
+            relations.children = [keys[child_id] for child_id in self.children[block_id]]
+            block_relations[usage_key] = relations
+        return block_relations
+
+    def copy(self):
+        """
+        Returns a copy of this graph, sharing its (immutable) usage keys.
+        """
+        graph = _BlockGraph()
+        graph.keys = list(self.keys)
+        graph.ids = dict(self.ids)
+        graph.parents = [list(parent_ids) for parent_ids in self.parents]
+        graph.children = [list(child_ids) for child_ids in self.children]
+        return graph
+
+    def add_block(self, usage_key):
+        """
+        Adds the given usage_key to the graph, if not already present,
+        and returns its block id.
+        """
+        block_id = self.ids.get(usage_key)
+        if block_id is None:
+            block_id = len(self.keys)
+            self.ids[usage_key] = block_id
+            self.keys.append(usage_key)
+            self.parents.append([])
+            self.children.append([])
+        return block_id
+
+    def add_relation(self, parent_key, child_key):
+        """
+        Adds a parent to child relationship, adding either block to the
+        graph if not already present.
+        """
+        parent_id = self.add_block(parent_key)
+        child_id = self.add_block(child_key)
+        self.parents[child_id].append(parent_id)
+        self.children[parent_id].append(child_id)
+
+    def remove_block(self, usage_key):
+        """
+        Removes the given block and its relations from the graph, and
+        returns the (parent_ids, child_ids) it had.
+
+        Raises KeyError if the block is not in the graph.
+        """
+        block_id = self.ids.pop(usage_key)
+        parent_ids, child_ids = self.parents[block_id], self.children[block_id]
+        for child_id in child_ids:
+            self.parents[child_id].remove(block_id)
+        for parent_id in parent_ids:
+            self.children[parent_id].remove(block_id)
+        self.parents[block_id] = []
+        self.children[block_id] = []
+        return parent_ids, child_ids
+
 
 class BlockStructure(object):
     """
@@ -56,14 +186,12 @@ class BlockStructure(object):
         # UsageKey
         self.root_block_usage_key = root_block_usage_key
 
-        # Map of a block's usage key to its block relations. The
-        # existence of a block in the structure is determined by its
-        # presence in this map.
-        # dict {UsageKey: _BlockRelations}
-        self._block_relations = {}
+        # Graph of the blocks in this structure and their relations.
+        # _BlockGraph
+        self._graph = _BlockGraph()
 
         # Add the root block.
-        self._add_block(self._block_relations, root_block_usage_key)
+        self._graph.add_block(root_block_usage_key)
 
     def __iter__(self):
         """
@@ -74,7 +202,7 @@ class BlockStructure(object):
         return self.get_block_keys()
 
     def __len__(self):
-        return len(self._block_relations)
+        return len(self._graph.ids)
 
     #--- Block structure relation methods ---#
 
@@ -91,7 +219,7 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's parents.
         """
-        return self._block_relations[usage_key].parents if usage_key in self else []
+        return self._get_related_keys(self._graph.parents, usage_key)
 
     def get_children(self, usage_key):
         """
@@ -105,7 +233,7 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's children.
         """
-        return self._block_relations[usage_key].children if usage_key in self else []
+        return self._get_related_keys(self._graph.children, usage_key)
 
     def set_root_block(self, usage_key):
         """
@@ -120,7 +248,7 @@ class BlockStructure(object):
                 new root of the block structure.
         """
         self.root_block_usage_key = usage_key
-        self._block_relations[usage_key].parents = []
+        self._graph.parents[self._graph.ids[usage_key]] = []
 
     def __contains__(self, usage_key):
         """
@@ -135,7 +263,7 @@ class BlockStructure(object):
             bool - Whether or not a block with the given usage_key
                 is present in this block structure.
         """
-        return usage_key in self._block_relations
+        return usage_key in self._graph.ids
 
     def get_block_keys(self):
         """
@@ -145,7 +273,7 @@ class BlockStructure(object):
             iterator(UsageKey) - An iterator of the usage
             keys of all the blocks in the block structure.
         """
-        return self._block_relations.iterkeys()
+        return self._graph.ids.iterkeys()
 
     #--- Block structure traversal methods ---#
 
@@ -167,13 +295,22 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_topologically method.
         """
-        return traverse_topologically(
-            start_node=start_node or self.root_block_usage_key,
-            get_parents=self.get_parents,
-            get_children=self.get_children,
-            filter_func=filter_func,
+        start_node = start_node or self.root_block_usage_key
+        if start_node not in self:
+            return traverse_topologically(
+                start_node=start_node,
+                get_parents=self.get_parents,
+                get_children=self.get_children,
+                filter_func=filter_func,
+                yield_descendants_of_unyielded=yield_descendants_of_unyielded,
+            )
+        return self._keys_of(traverse_topologically(
+            start_node=self._graph.ids[start_node],
+            get_parents=self._graph.parents.__getitem__,
+            get_children=self._graph.children.__getitem__,
+            filter_func=self._id_filter(filter_func),
             yield_descendants_of_unyielded=yield_descendants_of_unyielded,
-        )
+        ))
 
     def post_order_traversal(
             self,
@@ -192,42 +329,102 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_post_order method.
         """
-        return traverse_post_order(
-            start_node=start_node or self.root_block_usage_key,
-            get_children=self.get_children,
-            filter_func=filter_func,
-        )
+        start_node = start_node or self.root_block_usage_key
+        if start_node not in self:
+            return traverse_post_order(
+                start_node=start_node,
+                get_children=self.get_children,
+                filter_func=filter_func,
+            )
+        return self._keys_of(traverse_post_order(
+            start_node=self._graph.ids[start_node],
+            get_children=self._graph.children.__getitem__,
+            filter_func=self._id_filter(filter_func),
+        ))
 
     #--- Internal methods ---#
     # To be used within the block_structure framework or by tests.
 
+    @property
+    def _block_relations(self):
+        """
+        Map of a block's usage key to its block relations, for all blocks
+        in this structure.  The map is a snapshot: changes to it are not
+        reflected in the structure unless it is assigned back.
+
+        dict {UsageKey: _BlockRelations}
+        """
+        return self._graph.to_relations()
+
+    @_block_relations.setter
+    def _block_relations(self, block_relations):
+        """
+        Replaces this structure's relations with the given map of a
+        block's usage key to its block relations, or with the given
+        _BlockGraph.
+        """
+        if isinstance(block_relations, _BlockGraph):
+            self._graph = block_relations
+        else:
+            self._graph = _BlockGraph.from_relations(block_relations)
+
+    def _get_related_keys(self, related_ids, usage_key):
+        """
+        Returns the usage keys of the given usage_key's related blocks
+        in related_ids, or an empty list if the block is not present.
+        """
+        block_id = self._graph.ids.get(usage_key)
+        if block_id is None:
+            return []
+        keys = self._graph.keys
+        return [keys[related_id] for related_id in related_ids[block_id]]
+
+    def _keys_of(self, block_ids):
+        """
+        Returns a generator of the usage keys of the given block ids.
+        """
+        keys = self._graph.keys
+        return (keys[block_id] for block_id in block_ids)
+
+    def _id_filter(self, filter_func):
+        """
+        Returns a filter function on block ids for the given filter
+        function on usage keys.
+        """
+        if filter_func is None:
+            return None
+        keys = self._graph.keys
+        return lambda block_id: filter_func(keys[block_id])
+
     def _prune_unreachable(self):
         """
         Mutates this block structure by removing any unreachable blocks.
         """
 
-        # Create a new block relations map to store only those blocks
-        # that are still linked
-        pruned_block_relations = {}
-        old_block_relations = self._block_relations
+        # Create a new graph to store only those blocks that are still
+        # linked
+        pruned_graph = _BlockGraph()
+        old_graph = self._graph
 
         # Build the structure from the leaves up by doing a post-order
         # traversal of the old structure, thereby encountering only
         # reachable blocks.
         for block_key in self.post_order_traversal():
             # If the block is in the old structure,
-            if block_key in old_block_relations:
+            block_id = old_graph.ids.get(block_key)
+            if block_id is not None:
                 # Add it to the new pruned structure
-                self._add_block(pruned_block_relations, block_key)
+                pruned_graph.add_block(block_key)
 
                 # Add a relationship to only those old children that
                 # were also added to the new pruned structure.
-                for child in old_block_relations[block_key].children:
-                    if child in pruned_block_relations:
-                        self._add_to_relations(pruned_block_relations, block_key, child)
+                for child_id in old_graph.children[block_id]:
+                    child_key = old_graph.keys[child_id]
+                    if child_key in pruned_graph.ids:
+                        pruned_graph.add_relation(block_key, child_key)
 
         # Replace this structure's relations with the newly pruned one.
-        self._block_relations = pruned_block_relations
+        self._graph = pruned_graph
 
     def _add_relation(self, parent_key, child_key):
         """
@@ -237,57 +434,26 @@ class BlockStructure(object):
             parent_key (UsageKey) - Usage key of the parent block.
             child_key (UsageKey) - Usage key of the child block.
         """
-        self._add_to_relations(self._block_relations, parent_key, child_key)
-
-    @staticmethod
-    def _add_to_relations(block_relations, parent_key, child_key):
-        """
-        Adds a parent to child relationship in the given block
-        relations map.
-
-        Arguments:
-            block_relations (dict({UsageKey: _BlockRelations})) -
-                Internal map of a block's usage key to its
-                parents/children relations.
-
-            parent_key (UsageKey) - Usage key of the parent block.
-
-            child_key (UsageKey) - Usage key of the child block.
-        """
-        BlockStructure._add_block(block_relations, parent_key)
-        BlockStructure._add_block(block_relations, child_key)
-
-        block_relations[child_key].parents.append(parent_key)
-        block_relations[parent_key].children.append(child_key)
-
-    @staticmethod
-    def _add_block(block_relations, usage_key):
-        """
-        Adds the given usage_key to the given block_relations map.
-
-        Arguments:
-            block_relations (dict({UsageKey: _BlockRelations})) -
-                Internal map of a block's usage key to its
-                parents/children relations.
-
-            usage_key (UsageKey) - Usage key of the block that is to
-                be added to the given block_relations.
-        """
-        if usage_key not in block_relations:
-            block_relations[usage_key] = _BlockRelations()
+        self._graph.add_relation(parent_key, child_key)
 
 
 class FieldData(object):
     """
     Data structure to encapsulate collected fields.
     """
+    __slots__ = ('fields',)
+
+    # Names of the fields that are defined directly on the class, as
+    # opposed to those stored in the self.fields dict.
+    _CLASS_FIELD_NAMES = frozenset(__slots__)
+
     def class_field_names(self):
         """
         Returns list of names of fields that are defined directly
-        on the class. Can be overridden by subclasses. All other
-        fields are assumed to be stored in the self.fields dict.
+        on the class. All other fields are assumed to be stored in the
+        self.fields dict.
         """
-        return ['fields']
+        return list(self._CLASS_FIELD_NAMES)
 
     def __init__(self):
         # Map of field name to the field's value for this block.
@@ -295,8 +461,9 @@ class FieldData(object):
         self.fields = {}
 
     def __getattr__(self, field_name):
+        # Only called when field_name is not found on the object itself.
         if self._is_own_field(field_name):
-            return super(FieldData, self).__getattr__(field_name)
+            raise AttributeError("Field {0} is not set".format(field_name))
         try:
             return self.fields[field_name]
         except KeyError:
@@ -314,19 +481,27 @@ class FieldData(object):
         else:
             delattr(self.fields, field_name)
 
+    def __getstate__(self):
+        return {field_name: getattr(self, field_name) for field_name in self._CLASS_FIELD_NAMES}
+
+    def __setstate__(self, state):
+        # Also supports the __dict__ state pickled before __slots__ were used.
+        for field_name, field_value in state.iteritems():
+            super(FieldData, self).__setattr__(field_name, field_value)
+
     def _is_own_field(self, field_name):
         """
         Returns whether the given field_name is the name of an
         actual field of this class.
         """
-        return field_name in self.class_field_names()
+        return field_name in self._CLASS_FIELD_NAMES
 
 
 class TransformerData(FieldData):
     """
     Data structure to encapsulate collected data for a transformer.
     """
-    pass
+    __slots__ = ()
 
 
 class TransformerDataMap(dict):
@@ -379,8 +554,9 @@ class BlockData(FieldData):
     """
     Data structure to encapsulate collected data for a single block.
     """
-    def class_field_names(self):
-        return super(BlockData, self).class_field_names() + ['location', 'transformer_data']
+    __slots__ = ('location', 'transformer_data')
+
+    _CLASS_FIELD_NAMES = FieldData._CLASS_FIELD_NAMES | frozenset(__slots__)
 
     def __init__(self, usage_key):
         super(BlockData, self).__init__()
@@ -414,17 +590,25 @@ class BlockStructureBlockData(BlockStructure):
         # Map of a transformer's name to its non-block-specific data.
         self.transformer_data = TransformerDataMap()
 
+        # Digest of the serialized data this structure was stored as or
+        # read from, identifying the version of its collected data.
+        # None if the structure did not go through a BlockStructureStore.
+        self.serialized_digest = None
+
     def copy(self):
         """
         Returns a new instance of BlockStructureBlockData with a
         deep-copy of this instance's contents.
         """
         from .factory import BlockStructureFactory
+
+        # Usage keys are immutable, so share rather than copy them.
+        memo = {id(usage_key): usage_key for usage_key in self._graph.keys}
         return BlockStructureFactory.create_new(
             self.root_block_usage_key,
-            deepcopy(self._block_relations),
-            deepcopy(self.transformer_data),
-            deepcopy(self._block_data_map),
+            self._graph.copy(),
+            deepcopy(self.transformer_data, memo),
+            deepcopy(self._block_data_map, memo),
         )
 
     def iteritems(self):
@@ -602,26 +786,16 @@ class BlockStructureBlockData(BlockStructure):
                 removed block's children become children of the
                 removed block's parents.
         """
-        children = self._block_relations[usage_key].children
-        parents = self._block_relations[usage_key].parents
-
-        # Remove block from its children.
-        for child in children:
-            self._block_relations[child].parents.remove(usage_key)
-
-        # Remove block from its parents.
-        for parent in parents:
-            self._block_relations[parent].children.remove(usage_key)
-
-        # Remove block.
-        self._block_relations.pop(usage_key, None)
+        # Remove block and its relations.
+        parent_ids, child_ids = self._graph.remove_block(usage_key)
         self._block_data_map.pop(usage_key, None)
 
         # Recreate the graph connections if descendants are to be kept.
         if keep_descendants:
-            for child in children:
-                for parent in parents:
-                    self._add_relation(parent, child)
+            keys = self._graph.keys
+            for child_id in child_ids:
+                for parent_id in parent_ids:
+                    self._add_relation(keys[parent_id], keys[child_id])
 
     def create_universal_filter(self):
         """
@@ -8,6 +8,7 @@ from . import config
 from .exceptions import UsageKeyNotInBlockStructure, TransformerDataIncompatible, BlockStructureNotFound
 from .factory import BlockStructureFactory
 from .store import BlockStructureStore
+from .transformed_cache import TransformedBlockStructureCache
 from .transformers import BlockStructureTransformers
 
 
@@ -33,6 +34,7 @@ class BlockStructureManager(object):
         self.root_block_usage_key = root_block_usage_key
         self.modulestore = modulestore
         self.store = BlockStructureStore(cache)
+        self.transformed_cache = TransformedBlockStructureCache(cache)
 
     def get_transformed(self, transformers, starting_block_usage_key=None, collected_block_structure=None):
         """
@@ -41,7 +43,10 @@ class BlockStructureManager(object):
         and modulestore, as needed.
 
         Details: Similar to the get_collected method, except the transformers'
-        transform methods are also called.
+        transform methods are also called.  When sharing is enabled and all
+        the transformers declare an access signature, the transformed
+        structure is cached and shared by all usages with the same access
+        signature.
 
         Arguments:
             transformers (BlockStructureTransformers) - Collection of
@@ -60,20 +65,38 @@ class BlockStructureManager(object):
             BlockStructureBlockData - A transformed block structure,
                 starting at starting_block_usage_key.
         """
-        block_structure = collected_block_structure.copy() if collected_block_structure else self.get_collected()
+        collected = collected_block_structure or self.get_collected()
 
+        if starting_block_usage_key and starting_block_usage_key not in collected:
+            raise UsageKeyNotInBlockStructure(
+                "The requested usage_key '{0}' is not found in the block_structure with root '{1}'",
+                unicode(starting_block_usage_key),
+                unicode(self.root_block_usage_key),
+            )
+
+        transformed_cache_key = None
+        if config.waffle().is_enabled(config.SHARE_TRANSFORMED_STRUCTURES):
+            transformed_root_key = starting_block_usage_key or collected.root_block_usage_key
+            transformed_cache_key = self.transformed_cache.get_key(
+                collected,
+                transformed_root_key,
+                transformers.access_signature(collected),
+            )
+            if transformed_cache_key:
+                block_structure = self.transformed_cache.get(transformed_cache_key, transformed_root_key)
+                if block_structure is not None:
+                    return block_structure
+
+        block_structure = collected.copy() if collected_block_structure else collected
         if starting_block_usage_key:
             # Override the root_block_usage_key so traversals start at the
             # requested location.  The rest of the structure will be pruned
             # as part of the transformation.
-            if starting_block_usage_key not in block_structure:
-                raise UsageKeyNotInBlockStructure(
-                    "The requested usage_key '{0}' is not found in the block_structure with root '{1}'",
-                    unicode(starting_block_usage_key),
-                    unicode(self.root_block_usage_key),
-                )
             block_structure.set_root_block(starting_block_usage_key)
         transformers.transform(block_structure)
+
+        if transformed_cache_key:
+            self.transformed_cache.add(transformed_cache_key, block_structure)
         return block_structure
 
     def get_collected(self):
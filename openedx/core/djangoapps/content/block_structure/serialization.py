@@ -0,0 +1,248 @@
+"""
+Compact serialization format for the cacheable data of BlockStructures.
+
+Rather than pickling the structure's relations and BlockData objects as
+is, this format:
+
+    * interns all usage keys into a single table, so that each key is
+      serialized once and is thereafter referred to by its integer index,
+    * stores parent and child relations as CSR-style integer adjacency
+      arrays (a flat array of offsets into a flat array of indices),
+    * stores collected xBlock fields and block-specific transformer data
+      column by column, as parallel arrays of block indices and values.
+
+A serialized blob is prefixed with FORMAT_MARKER so it can be told apart
+from data serialized with zpickle, which is still read by `deserialize`.
+"""
+# pylint: disable=protected-access
+import cPickle as pickle
+import zlib
+from array import array
+
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .block_structure import BlockData, TransformerData, _BlockGraph
+
+
+# Prefix of data serialized in the compact format.  zlib streams, and
+# therefore zpickled data, never start with this byte sequence.
+FORMAT_MARKER = b'BSC'
+
+# The version of the compact format.  Increment whenever the layout of
+# the serialized tuple changes.
+FORMAT_VERSION = 1
+
+# Typecode of the integer arrays used for relations and columns.
+_INDEX_TYPECODE = 'i'
+
+
+def serialize(block_structure):
+    """
+    Returns the compact serialization of the given block structure's
+    relations, transformer data and block data.
+    """
+    graph = block_structure._graph
+    block_data_map = block_structure._block_data_map
+
+    usage_keys = list(graph.ids)
+    usage_keys.extend(key for key in block_data_map if key not in graph.ids)
+    key_indices = {usage_key: index for index, usage_key in enumerate(usage_keys)}
+
+    # Map of block id in the graph to index in the key table.  Ids of
+    # removed blocks are never referenced, so are left unmapped.
+    block_indices = [None] * len(graph.keys)
+    for usage_key, block_id in graph.ids.iteritems():
+        block_indices[block_id] = key_indices[usage_key]
+
+    data_to_cache = (
+        FORMAT_VERSION,
+        usage_keys,
+        len(graph.ids),
+        _serialize_adjacency(graph.parents, graph.ids, block_indices),
+        _serialize_adjacency(graph.children, graph.ids, block_indices),
+        block_structure.transformer_data,
+        _serialize_block_data(block_data_map, key_indices),
+    )
+    return FORMAT_MARKER + zlib.compress(pickle.dumps(data_to_cache, pickle.HIGHEST_PROTOCOL))
+
+
+def deserialize(serialized_data):
+    """
+    Returns a (block_relations, transformer_data, block_data_map) tuple
+    for the given serialized data, which may be in either the compact or
+    the zpickle format.  The block_relations are either a _BlockGraph or
+    a map of a block's usage key to its _BlockRelations.
+    """
+    if not is_compact(serialized_data):
+        return zunpickle(serialized_data)
+
+    (
+        version,
+        usage_keys,
+        num_related_blocks,
+        serialized_parents,
+        serialized_children,
+        transformer_data,
+        serialized_block_data,
+    ) = pickle.loads(zlib.decompress(serialized_data[len(FORMAT_MARKER):]))
+    if version != FORMAT_VERSION:
+        raise ValueError('Unsupported BlockStructure serialization version: {}'.format(version))
+
+    # Blocks with relations come first in the key table, so their block
+    # ids in the graph are the same as their indices in the table.
+    graph = _BlockGraph()
+    graph.keys = usage_keys[:num_related_blocks]
+    graph.ids = {usage_key: block_id for block_id, usage_key in enumerate(graph.keys)}
+    graph.parents = _deserialize_adjacency(serialized_parents)
+    graph.children = _deserialize_adjacency(serialized_children)
+
+    return graph, transformer_data, _deserialize_block_data(serialized_block_data, usage_keys)
+
+
+def is_compact(serialized_data):
+    """
+    Returns whether the given serialized data is in the compact format.
+    """
+    return serialized_data.startswith(FORMAT_MARKER)
+
+
+def legacy_serialize(block_structure):
+    """
+    Returns the zpickle serialization of the given block structure's
+    relations, transformer data and block data.
+    """
+    return zpickle((
+        block_structure._block_relations,
+        block_structure.transformer_data,
+        block_structure._block_data_map,
+    ))
+
+
+def _serialize_adjacency(related_ids, ids, block_indices):
+    """
+    Returns an (offsets, indices) pair of packed integer arrays for the
+    given relation of each block present in the graph, in key-table
+    order.  The related blocks of the block with index i are
+    indices[offsets[i]:offsets[i + 1]].
+    """
+    offsets = array(_INDEX_TYPECODE, [0])
+    indices = array(_INDEX_TYPECODE)
+    for block_id in ids.itervalues():
+        indices.extend(block_indices[related_id] for related_id in related_ids[block_id])
+        offsets.append(len(indices))
+    return offsets.tostring(), indices.tostring()
+
+
+def _deserialize_adjacency(serialized_adjacency):
+    """
+    Returns a list of block id lists, one per block, for the given
+    serialized adjacency arrays.
+    """
+    offsets, indices = (_unpack_indices(packed).tolist() for packed in serialized_adjacency)
+    return [indices[offsets[i]:offsets[i + 1]] for i in xrange(len(offsets) - 1)]
+
+
+def _serialize_block_data(block_data_map, key_indices):
+    """
+    Returns the column-wise serialization of the given block data map:
+
+        (
+            packed indices of blocks with BlockData,
+            {field_name: (packed block indices, [values])},
+            {transformer_name: (
+                packed indices of blocks with TransformerData,
+                {field_name: (packed block indices, [values])},
+            )},
+        )
+    """
+    field_columns = {}
+    transformer_columns = {}
+    for usage_key, block_data in block_data_map.iteritems():
+        index = key_indices[usage_key]
+        _add_to_columns(field_columns, index, block_data.fields)
+        for transformer_name, transformer_block_data in block_data.transformer_data.iteritems():
+            block_indices, columns = transformer_columns.setdefault(transformer_name, ([], {}))
+            block_indices.append(index)
+            _add_to_columns(columns, index, transformer_block_data.fields)
+
+    return (
+        _pack_indices(key_indices[usage_key] for usage_key in block_data_map),
+        _pack_columns(field_columns),
+        {
+            transformer_name: (_pack_indices(block_indices), _pack_columns(columns))
+            for transformer_name, (block_indices, columns) in transformer_columns.iteritems()
+        },
+    )
+
+
+def _deserialize_block_data(serialized_block_data, usage_keys):
+    """
+    Returns the block data map for the given column-wise serialization.
+    """
+    block_indices, field_columns, transformer_columns = serialized_block_data
+
+    block_data_map = {}
+    fields_by_index = {}
+    transformer_data_by_index = {}
+    for index in _unpack_indices(block_indices):
+        block_data = BlockData(usage_keys[index])
+        block_data_map[usage_keys[index]] = block_data
+        fields_by_index[index] = block_data.fields
+        transformer_data_by_index[index] = block_data.transformer_data
+
+    _fill_from_columns(field_columns, fields_by_index)
+
+    for transformer_name, (transformer_block_indices, columns) in transformer_columns.iteritems():
+        transformer_fields_by_index = {}
+        for index in _unpack_indices(transformer_block_indices):
+            transformer_block_data = TransformerData()
+            transformer_data_by_index[index][transformer_name] = transformer_block_data
+            transformer_fields_by_index[index] = transformer_block_data.fields
+        _fill_from_columns(columns, transformer_fields_by_index)
+
+    return block_data_map
+
+
+def _add_to_columns(columns, index, fields):
+    """
+    Appends the given block's fields to the given columns.
+    """
+    for field_name, value in fields.iteritems():
+        block_indices, values = columns.setdefault(field_name, ([], []))
+        block_indices.append(index)
+        values.append(value)
+
+
+def _pack_columns(columns):
+    """
+    Returns the given columns with their block indices packed.
+    """
+    return {
+        field_name: (_pack_indices(block_indices), values)
+        for field_name, (block_indices, values) in columns.iteritems()
+    }
+
+
+def _fill_from_columns(columns, fields_by_index):
+    """
+    Sets each column's values into the fields dicts of the given blocks.
+    """
+    for field_name, (block_indices, values) in columns.iteritems():
+        for index, value in zip(_unpack_indices(block_indices), values):
+            fields_by_index[index][field_name] = value
+
+
+def _pack_indices(indices):
+    """
+    Returns the given integer indices packed into a byte string.
+    """
+    return array(_INDEX_TYPECODE, indices).tostring()
+
+
+def _unpack_indices(packed_indices):
+    """
+    Returns the integer array for the given packed indices.
+    """
+    indices = array(_INDEX_TYPECODE)
+    indices.fromstring(packed_indices)
+    return indices
@@ -2,11 +2,10 @@
 Module for the Storage of BlockStructure objects.
 """
 # pylint: disable=protected-access
+import hashlib
 from logging import getLogger
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
-
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
@@ -62,6 +61,7 @@ class BlockStructureStore(object):
                 that is to be cached and stored.
         """
         serialized_data = self._serialize(block_structure)
+        block_structure.serialized_digest = self._digest(serialized_data)
 
         bs_model = self._update_or_create_model(block_structure, serialized_data)
         self._add_to_cache(serialized_data, bs_model)
@@ -191,26 +191,34 @@ class BlockStructureStore(object):
 
     def _serialize(self, block_structure):
         """
-        Serializes the data for the given block_structure.
+        Serializes the data for the given block_structure, in the
+        compact format if enabled.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        return zpickle(data_to_cache)
+        if config.waffle().is_enabled(config.COMPACT_SERIALIZATION):
+            return serialization.serialize(block_structure)
+        return serialization.legacy_serialize(block_structure)
 
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+        Data in either the compact or the legacy format is supported.
         """
-        block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
-        return BlockStructureFactory.create_new(
+        block_relations, transformer_data, block_data_map = serialization.deserialize(serialized_data)
+        block_structure = BlockStructureFactory.create_new(
             root_block_usage_key,
             block_relations,
             transformer_data,
             block_data_map,
         )
+        block_structure.serialized_digest = self._digest(serialized_data)
+        return block_structure
+
+    @staticmethod
+    def _digest(serialized_data):
+        """
+        Returns the digest of the given serialized data.
+        """
+        return hashlib.sha1(serialized_data).hexdigest()
 
     @staticmethod
     def _encode_root_cache_key(bs_model):
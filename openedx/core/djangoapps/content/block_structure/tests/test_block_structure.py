@@ -2,6 +2,7 @@
 Tests for block_structure.py
 """
 # pylint: disable=protected-access
+import cPickle as pickle
 from collections import namedtuple
 from copy import deepcopy
 import ddt
@@ -11,7 +12,7 @@ from unittest import TestCase
 
 from openedx.core.lib.graph_traversals import traverse_post_order
 
-from ..block_structure import BlockStructure, BlockStructureModulestoreData
+from ..block_structure import BlockData, BlockStructure, BlockStructureModulestoreData, TransformerDataMap
 from ..exceptions import TransformerException
 from .helpers import MockXBlock, MockTransformer, ChildrenMapTestMixin
 
@@ -268,3 +269,42 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         self.assertEquals(_get_value(block_structure), 'edit1')
         self.assertEquals(_get_value(new_copy), 'edit2')
+
+    def test_readd_removed_block(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.LINEAR_CHILDREN_MAP)
+        block_structure.remove_block(2, keep_descendants=False)
+        self.assert_block_structure(block_structure, [[1], [], [], []], missing_blocks=[2])
+
+        block_structure._add_relation(1, 2)
+        block_structure._add_relation(2, 3)
+        self.assert_block_structure(block_structure, [[1], [2], [3], []])
+        self.assertEquals(list(block_structure.topological_traversal()), [0, 1, 2, 3])
+
+    def test_relations_round_trip(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP)
+        block_structure.remove_block(3, keep_descendants=True)
+        block_relations = block_structure._block_relations
+
+        new_structure = BlockStructure(block_structure.root_block_usage_key)
+        new_structure._block_relations = block_relations
+        for block in block_structure:
+            self.assertEquals(block_structure.get_parents(block), new_structure.get_parents(block))
+            self.assertEquals(block_structure.get_children(block), new_structure.get_children(block))
+        self.assertEquals(len(block_structure), len(new_structure))
+
+    def test_block_data_legacy_pickle_state(self):
+        # State of a BlockData pickled before its fields were slotted.
+        block_data = BlockData.__new__(BlockData)
+        block_data.__setstate__({
+            'fields': {'display_name': 'Block'},
+            'location': 1,
+            'transformer_data': TransformerDataMap(),
+        })
+        self.assertEquals(block_data.location, 1)
+        self.assertEquals(block_data.display_name, 'Block')
+
+        unpickled = pickle.loads(pickle.dumps(block_data, pickle.HIGHEST_PROTOCOL))
+        self.assertEquals(unpickled.location, 1)
+        self.assertEquals(unpickled.display_name, 'Block')
+        with self.assertRaises(AttributeError):
+            _ = unpickled.not_a_field
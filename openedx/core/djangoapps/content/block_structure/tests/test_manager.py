@@ -6,7 +6,7 @@ from django.test import TestCase
 from nose.plugins.attrib import attr
 
 from ..block_structure import BlockStructureBlockData
-from ..config import RAISE_ERROR_WHEN_NOT_FOUND, STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import RAISE_ERROR_WHEN_NOT_FOUND, SHARE_TRANSFORMED_STRUCTURES, STORAGE_BACKING_FOR_CACHE, waffle
 from ..exceptions import UsageKeyNotInBlockStructure, BlockStructureNotFound
 from ..manager import BlockStructureManager
 from ..transformers import BlockStructureTransformers
@@ -89,6 +89,21 @@ class TestTransformer1(MockTransformer):
         return data_key + 't1.val1.' + unicode(block_key)
 
 
+class SharedTestTransformer(TestTransformer1):
+    """
+    Test Transformer class whose transform output depends only on the
+    usage info, so can be shared by all usages with the same usage info.
+    """
+    transform_call_count = 0
+
+    def access_signature(self, usage_info, block_structure):
+        return usage_info
+
+    def transform(self, usage_info, block_structure):
+        type(self).transform_call_count += 1
+        super(SharedTestTransformer, self).transform(usage_info, block_structure)
+
+
 @attr(shard=2)
 @ddt.ddt
 class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
@@ -219,3 +234,40 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         self.assertEquals(TestTransformer1.collect_call_count, 2)
+
+    def get_shared_transformed(self, usage_info, starting_block_usage_key=None):
+        """
+        Returns the structure transformed by the SharedTestTransformer for
+        the given usage info, with sharing of transformed structures enabled.
+        """
+        registered_transformers = [SharedTestTransformer()]
+        with mock_registered_transformers(registered_transformers):
+            transformers = BlockStructureTransformers(registered_transformers, usage_info)
+            with waffle().override(SHARE_TRANSFORMED_STRUCTURES, active=True):
+                return self.bs_manager.get_transformed(transformers, starting_block_usage_key)
+
+    @ddt.data(None, 1)
+    def test_get_transformed_shared(self, starting_block):
+        SharedTestTransformer.transform_call_count = 0
+        starting_block_usage_key = self.block_key_factory(starting_block) if starting_block is not None else None
+        if starting_block is None:
+            expected_structure, missing_blocks = self.children_map, []
+        else:
+            expected_structure, missing_blocks = [[], [3, 4], [], [], []], [0, 2]
+
+        for usage_info, expected_transform_call_count in (('group1', 1), ('group1', 1), ('group2', 2)):
+            block_structure = self.get_shared_transformed(usage_info, starting_block_usage_key)
+            self.assertEquals(SharedTestTransformer.transform_call_count, expected_transform_call_count)
+            self.assert_block_structure(block_structure, expected_structure, missing_blocks=missing_blocks)
+            SharedTestTransformer.assert_transformed(block_structure)
+
+    def test_get_transformed_not_shared(self):
+        TestTransformer1.collect_call_count = 0
+        with mock_registered_transformers(self.registered_transformers):
+            with waffle().override(SHARE_TRANSFORMED_STRUCTURES, active=True):
+                for _ in range(2):
+                    self.cache.set_call_count = 0
+                    block_structure = self.bs_manager.get_transformed(self.transformers)
+                    TestTransformer1.assert_transformed(block_structure)
+                    # Only the collected structure may be cached.
+                    self.assertLessEqual(self.cache.set_call_count, 1)
@@ -6,7 +6,7 @@ from nose.plugins.attrib import attr
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import COMPACT_SERIALIZATION, STORAGE_BACKING_FOR_CACHE, waffle
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
 from ..store import BlockStructureStore
@@ -90,3 +90,29 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         self.assertEquals(self.mock_cache.timeout_from_last_call, 0)
         self.store.add(self.block_structure)
         self.assertEquals(self.mock_cache.timeout_from_last_call, timeout)
+
+    @ddt.data(
+        (True, True),
+        (True, False),
+        (False, True),
+        (False, False),
+    )
+    @ddt.unpack
+    def test_compact_serialization(self, compact_on_add, compact_on_get):
+        self.block_structure.set_transformer_data(MockTransformer, 'collected', 'transformer val')
+        block_data = self.block_structure._get_or_create_block(self.block_key_factory(1))  # pylint: disable=protected-access
+        block_data.test_field = 'field val'
+
+        with waffle().override(COMPACT_SERIALIZATION, active=compact_on_add):
+            self.store.add(self.block_structure)
+        with waffle().override(COMPACT_SERIALIZATION, active=compact_on_get):
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+
+        self.assert_block_structure(stored_value, self.children_map)
+        self.assertEquals(
+            stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+            '{} val'.format(MockTransformer.name()),
+        )
+        self.assertEquals(stored_value.get_transformer_data(MockTransformer, 'collected'), 'transformer val')
+        self.assertEquals(stored_value.get_xblock_field(self.block_key_factory(1), 'test_field'), 'field val')
+        self.assertIsNone(stored_value.get_xblock_field(self.block_key_factory(2), 'test_field'))
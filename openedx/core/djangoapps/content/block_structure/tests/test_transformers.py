@@ -71,6 +71,24 @@ class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
             self.transformers.transform(block_structure=MagicMock())
             self.assertTrue(mock_transform_call.called)
 
+    def test_access_signature(self):
+        self.add_mock_transformer()
+        with patch(
+            'openedx.core.djangoapps.content.block_structure.tests.helpers.MockTransformer.access_signature',
+            return_value=('group1',),
+        ):
+            with patch(
+                'openedx.core.djangoapps.content.block_structure.tests.helpers.MockFilteringTransformer.access_signature',
+                return_value=True,
+            ):
+                self.assertEquals(
+                    self.transformers.access_signature(block_structure=MagicMock()),
+                    (('MockFilteringTransformer', True), ('MockTransformer', ('group1',))),
+                )
+
+        # The transformers don't support sharing their output by default.
+        self.assertIsNone(self.transformers.access_signature(block_structure=MagicMock()))
+
     def test_verify_versions(self):
         block_structure = self.create_block_structure(
             self.SIMPLE_CHILDREN_MAP,
@@ -0,0 +1,116 @@
+"""
+Module for the caching of transformed BlockStructure objects, which are
+shared by all usages with the same access signature.
+"""
+import hashlib
+from logging import getLogger
+
+from django.conf import settings
+
+from openedx.core.lib.cache_utils import ProcessLRUCache
+
+from . import config, serialization
+from .block_structure import BlockStructureBlockData
+from .factory import BlockStructureFactory
+
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+
+class ProcessCache(ProcessLRUCache):
+    """
+    An in-process LRU cache of serialized transformed block structures,
+    shared by all threads of the process.
+
+    The total size of the cached data is kept under the
+    TRANSFORMED_PROCESS_CACHE_SIZE block structures setting, in bytes, by
+    evicting the least recently used structures.  The cache keys include
+    the digest of the collected data, so entries never need to be
+    invalidated.
+    """
+    def __init__(self):
+        super(ProcessCache, self).__init__(get_size=len)
+
+    def set(self, key, serialized_data):  # pylint: disable=arguments-differ
+        """
+        Caches the serialized data for the given key, if the cache is
+        enabled and the data fits.
+        """
+        max_size = settings.BLOCK_STRUCTURES_SETTINGS.get('TRANSFORMED_PROCESS_CACHE_SIZE', 0)
+        super(ProcessCache, self).set(key, serialized_data, max_size=max_size)
+
+
+PROCESS_CACHE = ProcessCache()
+
+
+class TransformedBlockStructureCache(object):
+    """
+    Cache of transformed block structures, in memory and in the given
+    django cache, keyed by the version of their collected data, their
+    starting block and the access signature of their transformers.
+    """
+    def __init__(self, cache):
+        """
+        Arguments:
+            cache (django.core.cache.backends.base.BaseCache) - The
+                cache into which transformed block structures are
+                serialized.
+        """
+        self._cache = cache
+
+    @staticmethod
+    def get_key(collected_block_structure, starting_block_usage_key, access_signature):
+        """
+        Returns the cache key for the structure transformed from the given
+        collected block structure, starting at starting_block_usage_key, by
+        transformers with the given access signature.
+
+        Returns None if the transformed structure can't be shared, because
+        the collected data's version is unknown or the transformers don't
+        support sharing.
+        """
+        if collected_block_structure.serialized_digest is None or access_signature is None:
+            return None
+
+        key_data = u'{digest}|{starting_block}|{signature!r}'.format(
+            digest=collected_block_structure.serialized_digest,
+            starting_block=unicode(starting_block_usage_key),
+            signature=access_signature,
+        )
+        return "v{version}.transformed.{key_hash}".format(
+            version=unicode(BlockStructureBlockData.VERSION),
+            key_hash=hashlib.sha1(key_data.encode('utf-8')).hexdigest(),
+        )
+
+    def get(self, key, starting_block_usage_key):
+        """
+        Returns the transformed block structure cached for the given key,
+        starting at starting_block_usage_key, or None if not found.
+        """
+        serialized_data = PROCESS_CACHE.get(key)
+        if serialized_data is None:
+            serialized_data = self._cache.get(key)
+            if not serialized_data:
+                return None
+            PROCESS_CACHE.set(key, serialized_data)
+
+        block_relations, transformer_data, block_data_map = serialization.deserialize(serialized_data)
+        return BlockStructureFactory.create_new(
+            starting_block_usage_key,
+            block_relations,
+            transformer_data,
+            block_data_map,
+        )
+
+    def add(self, key, block_structure):
+        """
+        Caches the given transformed block structure for the given key.
+        """
+        serialized_data = serialization.serialize(block_structure)
+        self._cache.set(key, serialized_data, timeout=config.cache_timeout_in_seconds())
+        PROCESS_CACHE.set(key, serialized_data)
+        logger.info(
+            "BlockStructure: Added transformed structure to cache; %s, size: %d",
+            block_structure.root_block_usage_key,
+            len(serialized_data),
+        )
@@ -155,6 +155,35 @@ class BlockStructureTransformer(object):
         """
         raise NotImplementedError
 
+    def access_signature(self, usage_info, block_structure):  # pylint: disable=unused-argument
+        """
+        Optionally implemented by transformers whose transform output
+        depends on only a few usage-specific inputs, such as the user's
+        cohort or staff status, so that a transformed block structure can
+        be shared by all usages with the same inputs.
+
+        Returns a value that, together with the collected data of the
+        given block_structure, fully determines the result of this
+        transformer's transform method for the given usage_info. The
+        value must be built only from tuples, strings, numbers, booleans,
+        None and dates, so that its repr is stable.
+
+        Time-sensitive transformers should include the next date at
+        which their result changes, rather than the current time, so that
+        the signature stays the same until that date.
+
+        Returns None, which is the default, if the transform output cannot
+        be shared with other usages.
+
+        Arguments:
+            usage_info (any negotiated type) - The usage-specific object
+                that would be passed to the transform method.
+
+            block_structure (BlockStructureBlockData) - The collected
+                block structure, before any transformation.
+        """
+        return None
+
 
 class FilteringTransformerMixin(BlockStructureTransformer):
     """
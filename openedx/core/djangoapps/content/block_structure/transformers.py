@@ -105,6 +105,21 @@ class BlockStructureTransformers(object):
             )
         return True
 
+    def access_signature(self, block_structure):
+        """
+        Returns the combined access signature of all transformers in the
+        collection for the given collected block structure and the
+        collection's usage_info, or None if any of the transformers
+        doesn't support sharing its transform output.
+        """
+        signature = []
+        for transformer in self._transformers['supports_filter'] + self._transformers['no_filter']:
+            transformer_signature = transformer.access_signature(self.usage_info, block_structure)
+            if transformer_signature is None:
+                return None
+            signature.append((transformer.name(), transformer_signature))
+        return tuple(signature)
+
     def transform(self, block_structure):
         """
         The given block structure is transformed by each transformer in the
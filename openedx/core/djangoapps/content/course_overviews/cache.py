@@ -0,0 +1,124 @@
+"""
+Caches of CourseOverview objects, keyed by course id and
+CourseOverview.VERSION.
+
+Overviews are looked up in the request cache, then in an in-process LRU
+cache and finally in the django cache, before being read from the
+database.  All the tiers are invalidated whenever an overview or its
+image set is saved or deleted.
+"""
+import cPickle as pickle
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+import request_cache
+from openedx.core.lib.cache_utils import ProcessLRUCache
+
+
+REQUEST_CACHE_NAME = 'course_overviews.cache'
+
+
+def _cache_settings():
+    """
+    Returns the COURSE_OVERVIEW_CACHE_SETTINGS, or an empty dict, which
+    disables the in-process and django cache tiers.
+    """
+    return getattr(settings, 'COURSE_OVERVIEW_CACHE_SETTINGS', {})
+
+
+class ProcessCache(ProcessLRUCache):
+    """
+    An in-process LRU cache of pickled course overviews, shared by all
+    threads of the process.
+
+    At most PROCESS_CACHE_SIZE overviews are kept, each for at most
+    PROCESS_CACHE_TIMEOUT seconds, since invalidations only reach the
+    cache of the process in which the overview was saved.  Overviews are
+    stored pickled so that each request gets its own copy.
+    """
+    def set(self, key, pickled_overview):  # pylint: disable=arguments-differ
+        """
+        Caches the pickled overview for the given key, if the cache is
+        enabled.
+        """
+        super(ProcessCache, self).set(
+            key,
+            pickled_overview,
+            max_size=_cache_settings().get('PROCESS_CACHE_SIZE', 0),
+            timeout=_cache_settings().get('PROCESS_CACHE_TIMEOUT', 0),
+        )
+
+
+PROCESS_CACHE = ProcessCache()
+
+
+def get_cache_key(course_id):
+    """
+    Returns the process and django cache key of the overview of the
+    given course.
+    """
+    from .models import CourseOverview
+    return "course_overview.v{version}.{key_hash}".format(
+        version=CourseOverview.VERSION,
+        key_hash=hashlib.sha1(unicode(course_id).encode('utf-8')).hexdigest(),
+    )
+
+
+def get_cached_course_overviews(course_ids):
+    """
+    Returns a dict mapping the given course ids to their cached
+    CourseOverviews, for those that are cached in any tier.
+    """
+    course_overviews = {}
+    cached_in_request = request_cache.get_cache(REQUEST_CACHE_NAME)
+    keys_by_course_id = {}
+    for course_id in course_ids:
+        if course_id in cached_in_request:
+            course_overviews[course_id] = cached_in_request[course_id]
+        else:
+            keys_by_course_id[course_id] = get_cache_key(course_id)
+
+    uncached_keys = {}
+    for course_id, key in keys_by_course_id.iteritems():
+        pickled_overview = PROCESS_CACHE.get(key)
+        if pickled_overview is None:
+            uncached_keys[key] = course_id
+        else:
+            course_overviews[course_id] = cached_in_request[course_id] = pickle.loads(pickled_overview)
+
+    if uncached_keys:
+        for key, course_overview in cache.get_many(uncached_keys.keys()).iteritems():
+            course_id = uncached_keys[key]
+            PROCESS_CACHE.set(key, pickle.dumps(course_overview, pickle.HIGHEST_PROTOCOL))
+            course_overviews[course_id] = cached_in_request[course_id] = course_overview
+
+    return course_overviews
+
+
+def cache_course_overviews(course_overviews):
+    """
+    Caches the given CourseOverviews in all the tiers.
+    """
+    cached_in_request = request_cache.get_cache(REQUEST_CACHE_NAME)
+    cached_overviews = {}
+    for course_overview in course_overviews:
+        key = get_cache_key(course_overview.id)
+        cached_in_request[course_overview.id] = course_overview
+        PROCESS_CACHE.set(key, pickle.dumps(course_overview, pickle.HIGHEST_PROTOCOL))
+        cached_overviews[key] = course_overview
+
+    timeout = _cache_settings().get('CACHE_TIMEOUT', 0)
+    if cached_overviews and timeout > 0:
+        cache.set_many(cached_overviews, timeout=timeout)
+
+
+def invalidate_cached_course_overview(course_id):
+    """
+    Removes the overview of the given course from all the tiers.
+    """
+    key = get_cache_key(course_id)
+    request_cache.get_cache(REQUEST_CACHE_NAME).pop(course_id, None)
+    PROCESS_CACHE.delete(key)
+    cache.delete(key)
@@ -6,6 +6,7 @@ import logging
 from urlparse import urlparse, urlunparse
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField, IntegerField
 from django.db.utils import IntegrityError
@@ -25,6 +26,8 @@ from xmodule.error_module import ErrorDescriptor
 from xmodule.modulestore.django import modulestore
 from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, UsageKeyField
 
+from .cache import cache_course_overviews, get_cached_course_overviews, invalidate_cached_course_overview
+
 log = logging.getLogger(__name__)
 
 
@@ -251,6 +254,10 @@ class CourseOverview(TimeStampedModel):
                     )
                     raise
 
+                # The overview was removed from the cache when it was saved,
+                # but concurrent readers may have cached the previous overview
+                # again before the transaction was committed.
+                invalidate_cached_course_overview(course_id)
                 return course_overview
             elif course is not None:
                 raise IOError(
@@ -266,10 +273,13 @@ class CourseOverview(TimeStampedModel):
         """
         Load a CourseOverview object for a given course ID.
 
-        First, we try to load the CourseOverview from the database. If it
-        doesn't exist, we load the entire course from the modulestore, create a
-        CourseOverview object from it, and then cache it in the database for
-        future use.
+        First, we try to load the CourseOverview from the cache, then from
+        the database. If it doesn't exist, we load the entire course from the
+        modulestore, create a CourseOverview object from it, and then cache it
+        in the database for future use.
+
+        Outdated CourseOverviews are returned as they are, and regenerated in
+        the background.
 
         Arguments:
             course_id (CourseKey): the ID of the course overview to be loaded.
@@ -283,22 +293,95 @@ class CourseOverview(TimeStampedModel):
             - IOError if some other error occurs while trying to load the
                 course from the module store.
         """
+        course_overview = get_cached_course_overviews([course_id]).get(course_id)
+        if course_overview is not None:
+            cls._prepare_for_serving([course_overview], cached=True)
+            return course_overview
+
         try:
             course_overview = cls.objects.select_related('image_set').get(id=course_id)
-            if course_overview.version < cls.VERSION:
-                # Throw away old versions of CourseOverview, as they might contain stale data.
-                course_overview.delete()
-                course_overview = None
         except cls.DoesNotExist:
-            course_overview = None
+            course_overview = cls.load_from_module_store(course_id)
 
-        # Regenerate the thumbnail images if they're missing (either because
-        # they were never generated, or because they were flushed out after
-        # a change to CourseOverviewImageConfig.
-        if course_overview and not hasattr(course_overview, 'image_set'):
-            CourseOverviewImageSet.create(course_overview)
+        cls._prepare_for_serving([course_overview], cached=False)
+        return course_overview
+
+    @classmethod
+    def get_from_ids(cls, course_ids):
+        """
+        Return a dict mapping course_ids to CourseOverviews.
 
-        return course_overview or cls.load_from_module_store(course_id)
+        This is the bulk version of get_from_id: cached CourseOverviews are
+        returned first, then the remaining ones are read from the database in
+        a single query, and the ones that still don't exist are loaded from
+        the modulestore.
+
+        Courses that don't exist, or that fail to load from the modulestore,
+        are omitted from the result.
+        """
+        course_ids = list(course_ids)
+        course_overviews = get_cached_course_overviews(course_ids)
+        cls._prepare_for_serving(course_overviews.values(), cached=True)
+
+        uncached_course_ids = [course_id for course_id in course_ids if course_id not in course_overviews]
+        if uncached_course_ids:
+            uncached_overviews = list(cls.objects.select_related('image_set').filter(id__in=uncached_course_ids))
+            stored_course_ids = {course_overview.id for course_overview in uncached_overviews}
+            for course_id in uncached_course_ids:
+                if course_id not in stored_course_ids:
+                    try:
+                        uncached_overviews.append(cls.load_from_module_store(course_id))
+                    except (cls.DoesNotExist, IOError):
+                        log.warning('CourseOverview for course %s could not be loaded.', course_id)
+
+            cls._prepare_for_serving(uncached_overviews, cached=False)
+            course_overviews.update((course_overview.id, course_overview) for course_overview in uncached_overviews)
+
+        return course_overviews
+
+    @classmethod
+    def _prepare_for_serving(cls, course_overviews, cached):
+        """
+        Completes the given CourseOverviews before they're returned, caches
+        them and schedules the regeneration of the outdated ones.
+
+        Arguments:
+            course_overviews ([CourseOverview]): the overviews to be served.
+            cached (bool): whether the overviews were read from the cache.
+        """
+        to_cache = []
+        for course_overview in course_overviews:
+            # Regenerate the thumbnail images if they're missing (either because
+            # they were never generated, or because they were flushed out after
+            # a change to CourseOverviewImageConfig.
+            if not hasattr(course_overview, 'image_set'):
+                CourseOverviewImageSet.create(course_overview)
+                if hasattr(course_overview, 'image_set'):
+                    to_cache.append(course_overview)
+            elif not cached:
+                to_cache.append(course_overview)
+
+        # Outdated overviews are cached too, so that they're served without
+        # hitting the database until they're regenerated, which invalidates them.
+        cache_course_overviews(to_cache)
+
+        for course_overview in course_overviews:
+            if course_overview.version < cls.VERSION:
+                cls._schedule_regeneration(course_overview.id)
+
+    @classmethod
+    def _schedule_regeneration(cls, course_id):
+        """
+        Schedules the regeneration of the CourseOverview of the given course
+        from the modulestore, unless it's already scheduled.
+        """
+        # Import here to avoid circular import.
+        from .tasks import get_regeneration_lock_key, regenerate_course_overview
+
+        lock_timeout = getattr(settings, 'COURSE_OVERVIEW_CACHE_SETTINGS', {}).get('REGENERATION_LOCK_TIMEOUT', 5 * 60)
+        if cache.add(get_regeneration_lock_key(course_id), True, timeout=lock_timeout):
+            log.info('Scheduling the regeneration of the outdated course overview of %s.', course_id)
+            regenerate_course_overview.delay(unicode(course_id))
 
     @classmethod
     def get_from_ids_if_exists(cls, course_ids):
@@ -312,14 +395,21 @@ class CourseOverview(TimeStampedModel):
         Callers should assume that this list is incomplete and fall back to
         get_from_id if they need to guarantee CourseOverview generation.
         """
-        return {
-            overview.id: overview
-            for overview
-            in cls.objects.select_related('image_set').filter(
-                id__in=course_ids,
-                version__gte=cls.VERSION
-            )
+        course_ids = list(course_ids)
+        course_overviews = {
+            course_id: course_overview
+            for course_id, course_overview in get_cached_course_overviews(course_ids).iteritems()
+            if course_overview.version >= cls.VERSION
         }
+        uncached_course_ids = [course_id for course_id in course_ids if course_id not in course_overviews]
+        if uncached_course_ids:
+            stored_overviews = list(cls.objects.select_related('image_set').filter(
+                id__in=uncached_course_ids,
+                version__gte=cls.VERSION
+            ))
+            cache_course_overviews(stored_overviews)
+            course_overviews.update((course_overview.id, course_overview) for course_overview in stored_overviews)
+        return course_overviews
 
     def clean_id(self, padding_char='='):
         """
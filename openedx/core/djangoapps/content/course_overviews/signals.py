@@ -1,9 +1,11 @@
 """
 Signal handler for invalidating cached course overviews
 """
+from django.db.models.signals import post_delete, post_save
 from django.dispatch.dispatcher import receiver
 
-from .models import CourseOverview
+from .cache import invalidate_cached_course_overview
+from .models import CourseOverview, CourseOverviewImageSet
 from openedx.core.djangoapps.signals.signals import COURSE_PACING_CHANGED, COURSE_START_DATE_CHANGED
 from xmodule.modulestore.django import SignalHandler
 
@@ -14,7 +16,10 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
     Catches the signal that a course has been published in Studio and
     updates the corresponding CourseOverview cache entry.
     """
-    previous_course_overview = CourseOverview.get_from_ids_if_exists([course_key]).get(course_key)
+    # The previous overview is read from the database, since cached ones may be outdated.
+    previous_course_overview = CourseOverview.objects.filter(
+        id=course_key, version__gte=CourseOverview.VERSION
+    ).first()
     updated_course_overview = CourseOverview.load_from_module_store(course_key)
     _check_for_course_changes(previous_course_overview, updated_course_overview)
 
@@ -32,6 +37,25 @@ def _listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=
     CourseAboutSearchIndexer.remove_deleted_items(course_key)
 
 
+@receiver(post_save, sender=CourseOverview)
+@receiver(post_delete, sender=CourseOverview)
+def _invalidate_cached_course_overview(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Removes a CourseOverview from the cache whenever it's saved or deleted.
+    """
+    invalidate_cached_course_overview(instance.id)
+
+
+@receiver(post_save, sender=CourseOverviewImageSet)
+@receiver(post_delete, sender=CourseOverviewImageSet)
+def _invalidate_cached_course_overview_of_image_set(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Removes the CourseOverview of a CourseOverviewImageSet from the cache
+    whenever the image set is saved or deleted.
+    """
+    invalidate_cached_course_overview(instance.course_overview_id)
+
+
 def _check_for_course_changes(previous_course_overview, updated_course_overview):
     if previous_course_overview:
         _check_for_course_date_changes(previous_course_overview, updated_course_overview)
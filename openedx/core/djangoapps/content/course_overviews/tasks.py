@@ -0,0 +1,46 @@
+"""
+Asynchronous tasks related to the Course Overviews sub-application
+"""
+import logging
+
+from celery.task import task
+from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey
+
+
+log = logging.getLogger('edx.celery.task')
+
+
+def get_regeneration_lock_key(course_key):
+    """
+    Returns the cache key used to avoid scheduling the regeneration of a
+    course's overview more than once at a time.
+    """
+    return u'course_overview.regeneration.{}'.format(course_key)
+
+
+@task(name=u'openedx.core.djangoapps.content.course_overviews.tasks.regenerate_course_overview')
+def regenerate_course_overview(course_key):
+    """
+    Regenerates the CourseOverview of the specified course from the modulestore.
+    """
+    # Import here to avoid circular import.
+    from .cache import invalidate_cached_course_overview
+    from .models import CourseOverview
+
+    # Callers should pass the course key as a Unicode string, since CourseLocators
+    # aren't JSON-serializable.
+    if not isinstance(course_key, basestring):
+        raise ValueError('course_key must be a string. {} is not acceptable.'.format(type(course_key)))
+
+    try:
+        course_key = CourseKey.from_string(course_key)
+        CourseOverview.load_from_module_store(course_key)
+        # Remove the previous overview, in case it was cached again before
+        # the regenerated one was committed.
+        invalidate_cached_course_overview(course_key)
+    except Exception as ex:
+        log.exception('An error occurred while regenerating the course overview of %s: %s', course_key, ex.message)
+        raise
+    finally:
+        cache.delete(get_regeneration_lock_key(course_key))
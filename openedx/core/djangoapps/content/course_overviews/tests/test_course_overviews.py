@@ -15,6 +15,7 @@ from django.db.utils import IntegrityError
 from django.test.utils import override_settings
 from django.utils import timezone
 from PIL import Image
+from request_cache.middleware import RequestCache
 
 from lms.djangoapps.certificates.api import get_active_web_certificate
 from openedx.core.djangoapps.models.course_details import CourseDetails
@@ -35,6 +36,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls_range
 
+from ..cache import PROCESS_CACHE
 from ..models import CourseOverview, CourseOverviewImageSet, CourseOverviewImageConfig
 
 
@@ -398,8 +400,11 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             overview_v10.save()
 
             # Now we're going to ask for it again. Because 9 < 10, we expect
-            # that this entry will be deleted() and that we'll get back a new
-            # entry with version = 10 again.
+            # that the outdated entry will be returned while it's regenerated
+            # in the background, and that we'll get back a new entry with
+            # version = 10 afterwards.
+            outdated_overview = CourseOverview.get_from_id(course.id)
+            self.assertEqual(outdated_overview.version, 9)
             updated_overview = CourseOverview.get_from_id(course.id)
             self.assertEqual(updated_overview.version, 10)
 
@@ -509,6 +514,71 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
         self.assertEqual(len(course_ids_to_overviews), 1)
         self.assertIn(course_with_overview_1.id, course_ids_to_overviews)
 
+    def test_get_from_ids(self):
+        # Generate image sets, so that cached overviews are complete.
+        CourseOverviewImageConfig.objects.create(enabled=True)
+        course_with_overview = CourseFactory.create(emit_signals=True)
+        course_without_overview = CourseFactory.create(emit_signals=False)
+        non_existent_course_id = self.store.make_course_key('Non', 'Existent', 'Course')
+
+        course_ids_to_overviews = CourseOverview.get_from_ids(
+            [course_with_overview.id, course_without_overview.id, non_existent_course_id]
+        )
+
+        # Missing overviews are loaded from the modulestore, and courses that
+        # don't exist are omitted.
+        self.assertItemsEqual(course_ids_to_overviews.keys(), [course_with_overview.id, course_without_overview.id])
+        for course in (course_with_overview, course_without_overview):
+            self.assertEqual(course_ids_to_overviews[course.id].display_name, course.display_name)
+
+        # The overviews are now served from the request cache.
+        with self.assertNumQueries(0):
+            cached_overviews = CourseOverview.get_from_ids([course_with_overview.id, course_without_overview.id])
+        for course_id, course_overview in course_ids_to_overviews.iteritems():
+            self.assertIs(cached_overviews[course_id], course_overview)
+
+    @override_settings(COURSE_OVERVIEW_CACHE_SETTINGS={'PROCESS_CACHE_SIZE': 10, 'PROCESS_CACHE_TIMEOUT': 60})
+    def test_cache_invalidation(self):
+        self.addCleanup(PROCESS_CACHE.clear)
+        CourseOverviewImageConfig.objects.create(enabled=True)
+        course = CourseFactory.create(emit_signals=True)
+        course_overview = CourseOverview.get_from_id(course.id)
+
+        # Overviews are served from the process cache once the request cache
+        # is cleared, as copies of the stored overview.
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(0):
+            cached_overview = CourseOverview.get_from_id(course.id)
+        self.assertIsNot(cached_overview, course_overview)
+        self.assertEqual(cached_overview.display_name, course_overview.display_name)
+
+        # Saving the overview removes it from all the caches.
+        course_overview.display_name = u'Updated display name'
+        course_overview.save()
+        self.assertEqual(CourseOverview.get_from_id(course.id).display_name, u'Updated display name')
+
+    def test_cache_invalidated_after_commit(self):
+        course = CourseFactory.create(emit_signals=True)
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.models.invalidate_cached_course_overview'
+        ) as mock_invalidate:
+            CourseOverview.load_from_module_store(course.id)
+        mock_invalidate.assert_called_once_with(course.id)
+
+    def test_outdated_overviews_regeneration(self):
+        course = CourseFactory.create(emit_signals=True)
+        course_overview = CourseOverview.get_from_id(course.id)
+        course_overview.version = CourseOverview.VERSION - 1
+        course_overview.save()
+
+        # Outdated overviews are served, and their regeneration is scheduled.
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.tasks.regenerate_course_overview.delay'
+        ) as mock_regenerate:
+            course_ids_to_overviews = CourseOverview.get_from_ids([course.id])
+            self.assertEqual(course_ids_to_overviews[course.id].version, CourseOverview.VERSION - 1)
+            mock_regenerate.assert_called_once_with(unicode(course.id))
+
 
 @attr(shard=3)
 @ddt.ddt
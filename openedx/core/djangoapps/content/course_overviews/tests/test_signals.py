@@ -1,12 +1,15 @@
 import datetime
 import ddt
+from django.test.utils import override_settings
 from mock import patch
 from nose.plugins.attrib import attr
+from request_cache.middleware import RequestCache
 
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls
 
+from ..cache import PROCESS_CACHE
 from ..models import CourseOverview
 
 
@@ -89,3 +92,17 @@ class CourseOverviewSignalsTestCase(ModuleStoreTestCase):
     @patch('openedx.core.djangoapps.signals.signals.COURSE_PACING_CHANGED.send')
     def test_pacing_changed(self, mock_signal):
         self.assert_changed_signal_sent('self_paced', True, False, mock_signal)
+
+    @override_settings(COURSE_OVERVIEW_CACHE_SETTINGS={'PROCESS_CACHE_SIZE': 10, 'PROCESS_CACHE_TIMEOUT': 60})
+    @patch('openedx.core.djangoapps.signals.signals.COURSE_START_DATE_CHANGED.send')
+    def test_previous_overview_not_cached(self, mock_signal):
+        self.addCleanup(PROCESS_CACHE.clear)
+        course = CourseFactory.create(emit_signals=True, start=self.TODAY)
+        CourseOverview.get_from_id(course.id)
+        RequestCache.clear_request_cache()
+
+        # The cached overview is outdated, but the stored one isn't.
+        CourseOverview.objects.filter(id=course.id).update(start=self.NEXT_WEEK)
+        course.start = self.NEXT_WEEK
+        self.store.update_item(course, ModuleStoreEnum.UserID.test)
+        self.assertFalse(mock_signal.called)
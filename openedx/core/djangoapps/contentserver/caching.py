@@ -1,12 +1,31 @@
 """
 Helper functions for caching course assets.
+
+Assets are cached in up to three tiers:
+
+  * small, unlocked assets are kept in an in-process LRU for up to
+    CONTENTSERVER_MEMORY_CACHE_TTL seconds, in front of
+  * the "course_assets" (or default) django cache, which holds all small
+    assets, while
+  * assets too large for the django cache are spooled to files in the
+    CONTENTSERVER_SPOOL_DIR directory, keyed by their digest and last
+    modification date.
 """
+import hashlib
+import logging
+import os
+import tempfile
+
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
+from openedx.core.lib.cache_utils import ProcessLRUCache
 from xmodule.contentstore.content import STATIC_CONTENT_VERSION
 
+log = logging.getLogger(__name__)
+
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
 try:
@@ -15,18 +34,64 @@ except InvalidCacheBackendError:
     pass
 
 
+# Prefix of the temporary files being written in the spool directory.
+SPOOL_TEMP_PREFIX = '.spooling-'
+
+
+class MemoryContentCache(ProcessLRUCache):
+    """
+    A bounded, thread-safe, in-process LRU cache of small assets.
+
+    Since this cache can't be invalidated from other processes, its entries
+    expire after a TTL, and locked assets are never kept in it so that
+    changes to their access rules take effect immediately.
+    """
+    def __init__(self):
+        super(MemoryContentCache, self).__init__(get_size=lambda content: getattr(content, 'length', None) or 0)
+
+    def set(self, key, content, max_size, ttl):  # pylint: disable=arguments-differ
+        """
+        Caches the given content for ttl seconds, evicting the least
+        recently used assets to keep the total size under max_size.
+        """
+        if getattr(content, 'locked', False):
+            self.delete(key)
+            return
+        super(MemoryContentCache, self).set(key, content, max_size=max_size, timeout=ttl)
+
+
+MEMORY_CONTENT_CACHE = MemoryContentCache()
+
+
+def _set_in_memory(key, content):
+    """
+    Keeps the given content in the in-process cache, if it is enabled.
+    """
+    max_size = getattr(settings, 'CONTENTSERVER_MEMORY_CACHE_SIZE', 0)
+    if max_size:
+        MEMORY_CONTENT_CACHE.set(key, content, max_size, getattr(settings, 'CONTENTSERVER_MEMORY_CACHE_TTL', 60))
+
+
 def set_cached_content(content):
     """
     Stores the given piece of content in the cache, using its location as the key.
     """
-    CONTENT_CACHE.set(unicode(content.location).encode("utf-8"), content, version=STATIC_CONTENT_VERSION)
+    key = unicode(content.location).encode("utf-8")
+    CONTENT_CACHE.set(key, content, version=STATIC_CONTENT_VERSION)
+    _set_in_memory(key, content)
 
 
 def get_cached_content(location):
     """
     Retrieves the given piece of content by its location if cached.
     """
-    return CONTENT_CACHE.get(unicode(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
+    key = unicode(location).encode("utf-8")
+    content = MEMORY_CONTENT_CACHE.get(key)
+    if content is None:
+        content = CONTENT_CACHE.get(key, version=STATIC_CONTENT_VERSION)
+        if content is not None:
+            _set_in_memory(key, content)
+    return content
 
 
 def del_cached_content(location):
@@ -48,3 +113,79 @@ def del_cached_content(location):
         pass
 
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    for key in locations:
+        MEMORY_CONTENT_CACHE.delete(key)
+
+
+def get_spooled_content_path(content):
+    """
+    Returns the path of a local file holding the data of the given content
+    stream, spooling the stream to it if it isn't there yet.
+
+    Returns None, leaving the stream untouched, if spooling is disabled or
+    the content has no digest.  Returns None as well if spooling fails, in
+    which case the stream may have been partially read.
+    """
+    spool_dir = getattr(settings, 'CONTENTSERVER_SPOOL_DIR', None)
+    max_size = getattr(settings, 'CONTENTSERVER_SPOOL_MAX_SIZE', 0)
+    if not spool_dir or not content.content_digest or content.last_modified_at is None:
+        return None
+    if content.length is None or content.length > max_size:
+        return None
+
+    spool_key = u'{}|{}'.format(content.content_digest, content.last_modified_at.isoformat())
+    path = os.path.join(spool_dir, hashlib.sha1(spool_key.encode('utf-8')).hexdigest())
+    try:
+        # Mark the spooled file as recently used.
+        os.utime(path, None)
+        return path
+    except OSError:
+        pass
+
+    temp_path = None
+    try:
+        if not os.path.isdir(spool_dir):
+            os.makedirs(spool_dir)
+        spool_fd, temp_path = tempfile.mkstemp(dir=spool_dir, prefix=SPOOL_TEMP_PREFIX)
+        with os.fdopen(spool_fd, 'wb') as spool_file:
+            for chunk in content.stream_data():
+                spool_file.write(chunk)
+        # Concurrent requests may spool the same content; renaming is atomic.
+        os.rename(temp_path, path)
+    except (IOError, OSError):
+        log.exception(u"Could not spool content %s to %s", unicode(content.location), spool_dir)
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+
+    _evict_spooled_content(spool_dir, max_size, path)
+    return path
+
+
+def _evict_spooled_content(spool_dir, max_size, keep_path):
+    """
+    Removes the least recently used spooled files, other than keep_path,
+    until the spool directory holds at most max_size bytes.
+    """
+    spooled_files = []
+    total_size = 0
+    for name in os.listdir(spool_dir):
+        if name.startswith(SPOOL_TEMP_PREFIX):
+            continue
+        path = os.path.join(spool_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        total_size += stat.st_size
+        if path != keep_path:
+            spooled_files.append((stat.st_mtime, stat.st_size, path))
+
+    for __, size, path in sorted(spooled_files):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_size -= size
@@ -2,8 +2,10 @@
 Middleware to serve assets.
 """
 
+import calendar
 import logging
 import datetime
+from uuid import uuid4
 log = logging.getLogger(__name__)
 try:
     import newrelic.agent
@@ -11,16 +13,19 @@ except ImportError:
     newrelic = None  # pylint: disable=invalid-name
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
-    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect, StreamingHttpResponse)
+from django.utils.http import parse_http_date_safe
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import (
+    StaticContent, StaticContentStream, STREAM_DATA_CHUNK_SIZE, XASSET_LOCATION_TAG
+)
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from openedx.core.djangoapps.header_control import force_header_for_response
-from .caching import get_cached_content, set_cached_content
+from .caching import get_cached_content, get_spooled_content_path, set_cached_content
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -31,6 +36,11 @@ from .models import CourseAssetCacheTtlConfig, CdnUserAgentsConfig
 
 HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# Requests for more byte ranges than this get the full content instead, since
+# many (possibly overlapping) ranges can make for a response much larger than
+# the content itself.
+MAX_BYTE_RANGES = 20
+
 
 class StaticContentServer(object):
     """
@@ -108,24 +118,20 @@ class StaticContentServer(object):
 
             # Figure out if the client sent us a conditional request, and let them know
             # if this asset has changed since then.
-            last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
-                if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
-                if if_modified_since == last_modified_at_str:
-                    return HttpResponseNotModified()
+            if self.is_not_modified(request, content):
+                response = HttpResponseNotModified()
+                self.set_caching_headers(content, response)
+                return response
 
-            # *** File streaming within a byte range ***
+            # *** File streaming within byte ranges ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
-            # Request -> Range attribute structure: "Range: bytes=first-[last]"
+            # Request -> Range attribute structure: "Range: bytes first-[last][, first-[last]...]"
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
+            # or, for many ranges, a multipart/byteranges message with a Content-Range per part.
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
             if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -138,45 +144,52 @@ class StaticContentServer(object):
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, unicode(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
+                    elif len(ranges) > MAX_BYTE_RANGES:
                         log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            u"Too many ranges in Range header: %s for content: %s", header_value, unicode(loc)
                         )
                     else:
-                        first, last = ranges[0]
+                        # Unsatisfiable ranges are ignored, as long as some range is satisfiable.
+                        ranges = [(first, last) for first, last in ranges if 0 <= first <= last < content.length]
+                        if not ranges:
+                            log.warning(
+                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            )
+                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
 
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                        read_range = self.get_range_reader(content)
+                        if len(ranges) == 1:
+                            first, last = ranges[0]
+                            response = self.make_response(content, read_range(first, last))
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
                             response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
-
-                            if newrelic:
-                                newrelic.agent.add_custom_parameter('contentserver.ranged', True)
+                            response['Content-Type'] = content.content_type
                         else:
-                            log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                            response = self.make_multipart_response(content, read_range, ranges)
+                        response.status_code = 206  # Partial Content
+
+                        if newrelic:
+                            newrelic.agent.add_custom_parameter('contentserver.ranged', True)
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                read_range = self.get_range_reader(content)
+                response = self.make_response(content, read_range(0, content.length - 1))
                 response['Content-Length'] = content.length
+                response['Content-Type'] = content.content_type
 
             if newrelic:
                 newrelic.agent.add_custom_parameter('contentserver.content_len', content.length)
                 newrelic.agent.add_custom_parameter('contentserver.content_type', content.content_type)
 
+            if isinstance(read_range, FileRangeReader):
+                # Close the spooled file once the server has sent the response.
+                response._closable_objects.append(read_range)  # pylint: disable=protected-access
+
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
             # middleware we have in place, there's no easy way to use the built-in Django
@@ -212,12 +225,123 @@ class StaticContentServer(object):
             response['Cache-Control'] = "private, no-cache, no-store"
 
         response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+        etag = self.get_etag(content)
+        if etag is not None:
+            response['ETag'] = etag
 
         # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
         # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
         # caches a version of the response without CORS headers, in turn breaking XHR requests.
         force_header_for_response(response, 'Vary', 'Origin')
 
+    @staticmethod
+    def get_etag(content):
+        """
+        Returns the ETag of the given content, based on its digest, or None if it has no digest.
+        """
+        content_digest = getattr(content, "content_digest", None)
+        if content_digest is None:
+            return None
+        return '"{}"'.format(content_digest)
+
+    def is_not_modified(self, request, content):
+        """
+        Determines whether the conditional headers of the request show that the
+        client's copy of the given content is still current.
+
+        If-None-Match takes precedence over If-Modified-Since.
+        """
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            etag = self.get_etag(content)
+            if etag is None:
+                return False
+            # Weak validators are fine for GET requests.
+            client_etags = [client_etag.strip() for client_etag in if_none_match.split(',')]
+            return '*' in client_etags or any(
+                client_etag == etag or client_etag == 'W/' + etag for client_etag in client_etags
+            )
+
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        if if_modified_since is not None:
+            # HTTP dates have a resolution of a second.
+            last_modified = calendar.timegm(content.last_modified_at.utctimetuple())
+            return last_modified <= if_modified_since
+
+        return False
+
+    @staticmethod
+    def get_range_reader(content):
+        """
+        Returns a function which, given the first and last bytes of a range of the
+        given content, returns an iterable over the chunks of data in that range.
+
+        Data is read from memory for cached content, from a spooled copy of the
+        content when one is available, or else streamed from the contentstore.
+        The spooled copy is read through a FileRangeReader, which must be closed.
+        """
+        if not isinstance(content, StaticContentStream):
+            return lambda first, last: [content.data[first:last + 1]]
+
+        spooled_path = get_spooled_content_path(content)
+        if spooled_path is not None:
+            try:
+                # Once opened, the file stays readable even if it gets evicted from the spool.
+                spooled_file = open(spooled_path, 'rb')
+            except IOError:
+                log.warning(u"Could not open spooled content %s for %s", spooled_path, unicode(content.location))
+            else:
+                return FileRangeReader(spooled_file)
+
+        return content.stream_data_in_range
+
+    @staticmethod
+    def make_response(content, data):
+        """
+        Returns a response with the given data, streamed unless the content is in memory.
+        """
+        if isinstance(content, StaticContentStream):
+            return StreamingHttpResponse(data)
+        return HttpResponse(data)
+
+    def make_multipart_response(self, content, read_range, ranges):
+        """
+        Returns a multipart/byteranges response with the given ranges of the content.
+
+        http://www.w3.org/Protocols/rfc2616/rfc2616-sec19.html#sec19.2
+        """
+        boundary = uuid4().hex
+        part_headers = [
+            (
+                '--{boundary}\r\n'
+                'Content-Type: {content_type}\r\n'
+                'Content-Range: bytes {first}-{last}/{length}\r\n\r\n'
+            ).format(
+                boundary=boundary, content_type=content.content_type, first=first, last=last, length=content.length
+            )
+            for first, last in ranges
+        ]
+        closing_delimiter = '--{boundary}--\r\n'.format(boundary=boundary)
+
+        def multipart_data():
+            """
+            Yields the chunks of the message, range by range.
+            """
+            for part_header, (first, last) in zip(part_headers, ranges):
+                yield part_header
+                for chunk in read_range(first, last):
+                    yield chunk
+                yield '\r\n'
+            yield closing_delimiter
+
+        response = self.make_response(content, multipart_data())
+        response['Content-Length'] = str(
+            sum(len(part_header) + (last - first + 1) + 2 for part_header, (first, last) in zip(part_headers, ranges)) +
+            len(closing_delimiter)
+        )
+        response['Content-Type'] = 'multipart/byteranges; boundary={}'.format(boundary)
+        return response
+
     @staticmethod
     def is_cdn_request(request):
         """
@@ -290,6 +414,37 @@ class StaticContentServer(object):
         return content
 
 
+class FileRangeReader(object):
+    """
+    Reads ranges of data from an open file, which is closed by close().
+    """
+    def __init__(self, data_file):
+        self.data_file = data_file
+
+    def __call__(self, first_byte, last_byte):
+        return read_file_range(self.data_file, first_byte, last_byte)
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        self.data_file.close()
+
+
+def read_file_range(data_file, first_byte, last_byte):
+    """
+    Yields the data of the file between first_byte and last_byte (included), chunk by chunk.
+    """
+    data_file.seek(first_byte)
+    remaining = last_byte - first_byte + 1
+    while remaining > 0:
+        chunk = data_file.read(min(remaining, STREAM_DATA_CHUNK_SIZE))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
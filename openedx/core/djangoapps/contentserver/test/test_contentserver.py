@@ -6,6 +6,9 @@ import copy
 import datetime
 import ddt
 import logging
+import os
+import shutil
+import tempfile
 import unittest
 from uuid import uuid4
 
@@ -27,7 +30,8 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
-from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
+from ..caching import MemoryContentCache
+from ..middleware import parse_range_header, FileRangeReader, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
 
@@ -38,6 +42,15 @@ TEST_DATA_DIR = settings.COMMON_TEST_DATA_ROOT
 FAKE_MD5_HASH = 'ffffffffffffffffffffffffffffffff'
 
 
+def get_response_content(response):
+    """
+    Returns the body of the given response, whether or not it is streamed.
+    """
+    if response.streaming:
+        return ''.join(response.streaming_content)
+    return response.content
+
+
 def get_versioned_asset_url(asset_path):
     """
     Creates a versioned asset URL.
@@ -242,16 +255,41 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart message with a part per range.
         """
         first_byte = self.length_unlocked / 4
         last_byte = self.length_unlocked / 2
-        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
+        data = get_response_content(self.client.get(self.url_unlocked))
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -10'.format(
             first=first_byte, last=last_byte))
 
-        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
         self.assertNotIn('Content-Range', resp)
-        self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+        content_type, boundary = resp['Content-Type'].split('; boundary=')
+        self.assertEqual(content_type, 'multipart/byteranges')
+        content = get_response_content(resp)
+        self.assertEqual(resp['Content-Length'], str(len(content)))
+
+        parts = content.split('--' + boundary)
+        self.assertEqual(parts[0], '')
+        self.assertEqual(parts[-1], '--\r\n')
+        expected_ranges = [(first_byte, last_byte), (self.length_unlocked - 10, self.length_unlocked - 1)]
+        for part, (first, last) in zip(parts[1:-1], expected_ranges):
+            headers, part_data = part.split('\r\n\r\n', 1)
+            self.assertIn('Content-Range: bytes {first}-{last}/{length}'.format(
+                first=first, last=last, length=self.length_unlocked), headers)
+            self.assertEqual(part_data, data[first:last + 1] + '\r\n')
+
+    def test_range_request_some_ranges_unsatisfiable(self):
+        """
+        Test that unsatisfiable ranges are ignored when another range is satisfiable.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9, {first}-'.format(
+            first=self.length_unlocked))
+
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertEqual(resp['Content-Range'], 'bytes 0-9/{length}'.format(length=self.length_unlocked))
+        self.assertEqual(resp['Content-Length'], '10')
 
     @ddt.data(
         'bytes 0-',
@@ -285,6 +323,84 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
             first=(self.length_unlocked), last=(self.length_unlocked)))
         self.assertEqual(resp.status_code, 416)
 
+    def test_if_none_match(self):
+        """
+        Test that a request with the ETag of the current content gets a 304 Not Modified.
+        """
+        etag = self.client.get(self.url_unlocked)['ETag']
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"{}"'.format(FAKE_MD5_HASH))
+        self.assertEqual(resp.status_code, 200)
+
+    def test_if_modified_since(self):
+        """
+        Test that a request for content not modified since the given date gets a 304 Not Modified.
+        """
+        resp = self.client.get(self.url_unlocked)
+        last_modified = datetime.datetime.strptime(resp['Last-Modified'], HTTP_DATE_FORMAT)
+
+        later = (last_modified + datetime.timedelta(days=1)).strftime(HTTP_DATE_FORMAT)
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=later)
+        self.assertEqual(resp.status_code, 304)
+
+        earlier = (last_modified - datetime.timedelta(days=1)).strftime(HTTP_DATE_FORMAT)
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=earlier)
+        self.assertEqual(resp.status_code, 200)
+
+    def test_spooled_content(self):
+        """
+        Test that content streams are spooled to disk and read from there.
+        """
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir)
+        data = get_response_content(self.client.get(self.url_unlocked))
+
+        with override_settings(CONTENTSERVER_SPOOL_DIR=spool_dir, CONTENTSERVER_SPOOL_MAX_SIZE=self.length_unlocked):
+            for __ in range(2):
+                content = AssetManager.find(self.unlocked_asset, as_stream=True)
+                read_range = StaticContentServer.get_range_reader(content)
+                self.assertEqual(''.join(read_range(0, self.length_unlocked - 1)), data)
+                self.assertEqual(''.join(read_range(5, 9)), data[5:10])
+                self.assertEqual(len(os.listdir(spool_dir)), 1)
+                read_range.close()
+                self.assertTrue(read_range.data_file.closed)
+
+    def test_spooled_content_closed_with_response(self):
+        """
+        Test that the spooled copy of content is closed once its response is.
+        """
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir)
+        data = get_response_content(self.client.get(self.url_unlocked))
+
+        opened_files = []
+        original_init = FileRangeReader.__init__
+
+        def record_init(reader, data_file):
+            """
+            Records the files opened by range readers.
+            """
+            opened_files.append(data_file)
+            original_init(reader, data_file)
+
+        with override_settings(CONTENTSERVER_SPOOL_DIR=spool_dir, CONTENTSERVER_SPOOL_MAX_SIZE=self.length_unlocked):
+            with patch.object(FileRangeReader, '__init__', record_init):
+                # Contents smaller than 1MB are otherwise served from memory.
+                with patch.object(
+                    StaticContentServer,
+                    'load_asset_from_location',
+                    lambda _self, _loc: AssetManager.find(self.unlocked_asset, as_stream=True),
+                ):
+                    resp = self.client.get(self.url_unlocked)
+
+                    self.assertEqual(len(opened_files), 1)
+                    self.assertFalse(opened_files[0].closed)
+                    self.assertEqual(get_response_content(resp), data)
+                    self.assertTrue(opened_files[0].closed)
+
     def test_vary_header_sent(self):
         """
         Tests that we're properly setting the Vary header to ensure browser requests don't get
@@ -447,3 +563,46 @@ class ParseRangeHeaderTestCase(unittest.TestCase):
         self.assertRaisesRegexp(
             exception_class, exception_message_regex, parse_range_header, header_value, self.content_length
         )
+
+
+class MemoryContentCacheTestCase(unittest.TestCase):
+    """
+    Tests for the in-process cache of small assets.
+    """
+
+    class Content(object):
+        """
+        Mock content
+        """
+        def __init__(self, length, locked=False):
+            self.length = length
+            self.locked = locked
+
+    def setUp(self):
+        super(MemoryContentCacheTestCase, self).setUp()
+        self.cache = MemoryContentCache()
+
+    def test_lru_eviction(self):
+        contents = [self.Content(4) for __ in range(3)]
+        self.cache.set('a', contents[0], 10, 60)
+        self.cache.set('b', contents[1], 10, 60)
+
+        # getting 'a' makes 'b' the least recently used asset
+        self.assertIs(self.cache.get('a'), contents[0])
+        self.cache.set('c', contents[2], 10, 60)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIs(self.cache.get('a'), contents[0])
+        self.assertIs(self.cache.get('c'), contents[2])
+        self.assertEqual(self.cache.size, 8)
+
+    def test_expiration(self):
+        self.cache.set('a', self.Content(4), 10, -1)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.size, 0)
+
+    def test_uncacheable_content(self):
+        self.cache.set('locked', self.Content(4, locked=True), 10, 60)
+        self.cache.set('large', self.Content(11), 10, 60)
+        self.assertIsNone(self.cache.get('locked'))
+        self.assertIsNone(self.cache.get('large'))
+        self.assertEqual(self.cache.size, 0)
@@ -4,6 +4,8 @@ Utilities related to caching.
 import collections
 import cPickle as pickle
 import functools
+import threading
+import time
 import zlib
 
 from xblock.core import XBlock
@@ -102,3 +104,90 @@ def zpickle(data):
 def zunpickle(zdata):
     """Given a zlib compressed pickled serialization, returns the deserialized data."""
     return pickle.loads(zlib.decompress(zdata))
+
+
+class ProcessLRUCache(object):
+    """
+    A bounded, thread-safe, in-process LRU cache, shared by all threads of
+    the process.
+
+    The total size of the cached values is kept under max_size by evicting
+    the least recently used ones.  The size of a value is given by get_size,
+    or is 1, so that max_size is the number of values.  Values larger than
+    max_size aren't cached.  Unless timeout is None, values expire after
+    timeout seconds.
+    """
+    def __init__(self, max_size=0, timeout=None, get_size=None):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.size = 0
+        self._get_size = get_size
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the value cached for the given key, or None.
+        """
+        with self._lock:
+            entry = self._pop(key)
+            if entry is None:
+                return None
+            expiration, __, value = entry
+            if expiration is not None and expiration < time.time():
+                return None
+            # Re-insert it as the most recently used.
+            self._data[key] = entry
+            self.size += entry[1]
+            return value
+
+    def set(self, key, value, max_size=None, timeout=None):
+        """
+        Caches the value for the given key, and returns the number of values
+        evicted to make room for it.
+
+        max_size and timeout, if given, are used instead of the cache's own,
+        for caches whose limits are read from settings.
+        """
+        max_size = self.max_size if max_size is None else max_size
+        timeout = self.timeout if timeout is None else timeout
+        size = self._get_size(value) if self._get_size else 1
+        if size > max_size:
+            self.delete(key)
+            return 0
+
+        expiration = None if timeout is None else time.time() + timeout
+        num_evicted = 0
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (expiration, size, value)
+            self.size += size
+            while self.size > max_size:
+                __, (__, evicted_size, __) = self._data.popitem(last=False)
+                self.size -= evicted_size
+                num_evicted += 1
+        return num_evicted
+
+    def delete(self, key):
+        """
+        Removes the value cached for the given key, if any.
+        """
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        """
+        Removes all cached values.
+        """
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def _pop(self, key):
+        """
+        Removes and returns the entry of the given key, with the lock held.
+        """
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+        return entry
@@ -4,9 +4,9 @@ Tests for cache_utils.py
 from unittest import TestCase
 
 import ddt
-from mock import MagicMock
+from mock import MagicMock, patch
 
-from openedx.core.lib.cache_utils import memoize_in_request_cache
+from openedx.core.lib.cache_utils import ProcessLRUCache, memoize_in_request_cache
 
 
 @ddt.ddt
@@ -63,3 +63,61 @@ class TestMemoizeInRequestCache(TestCase):
                 func_to_memoize(*arg_list2)
 
             self.assertEquals(self.func_to_count.call_count, 2)
+
+
+class TestProcessLRUCache(TestCase):
+    """
+    Test the ProcessLRUCache class.
+    """
+    def test_least_recently_used_evicted(self):
+        cache = ProcessLRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.set('c', 3), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_size_limit(self):
+        cache = ProcessLRUCache(max_size=10, get_size=len)
+        cache.set('a', 'aaaa')
+        cache.set('b', 'bbbb')
+        self.assertEqual(cache.size, 8)
+        self.assertEqual(cache.set('c', 'cccc'), 1)
+        self.assertEqual(cache.size, 8)
+        self.assertIsNone(cache.get('a'))
+
+        # Values larger than the cache aren't cached, and replace nothing.
+        self.assertEqual(cache.set('b', 'x' * 11), 0)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 'cccc')
+        self.assertEqual(cache.size, 4)
+
+    def test_max_size_override(self):
+        cache = ProcessLRUCache(max_size=1)
+        cache.set('a', 1, max_size=2)
+        cache.set('b', 2, max_size=2)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b'), 2)
+
+    @patch('openedx.core.lib.cache_utils.time.time')
+    def test_timeout(self, mock_time):
+        mock_time.return_value = 100
+        cache = ProcessLRUCache(max_size=2, timeout=60)
+        cache.set('a', 1)
+        cache.set('b', 2, timeout=120)
+        mock_time.return_value = 161
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(cache.size, 1)
+
+    def test_delete_and_clear(self):
+        cache = ProcessLRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.delete('a')
+        self.assertIsNone(cache.get('a'))
+        cache.clear()
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.size, 0)